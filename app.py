@@ -1,12 +1,27 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for, flash, send_from_directory, make_response
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, flash, send_from_directory, make_response, Response, stream_with_context
 from utils.sitemap import SitemapGenerator
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user, AnonymousUserMixin
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import os
 from dotenv import load_dotenv
 import json
-from openai import OpenAI, RateLimitError, APIError, APIConnectionError
-from services.ai_service import TravelPlanGenerator, TripValidationError
+import math
+from openai import RateLimitError, APIError, APIConnectionError, APITimeoutError
+from services.ai_service import TravelPlanGenerator, TripValidationError, plan_requests
+from services.airport_search import airport_search, DEFAULT_LIMIT as AIRPORT_SEARCH_LIMIT, MAX_LIMIT as AIRPORT_SEARCH_MAX
+from services.openai_client import get_openai_client
+from services.page_cache import hotel_payload_cache, review_page_cache
+from services.hotel_rankings import (all_hotels, load_hotels_csv, query_hotels, HotelQueryError,
+                                     DEFAULT_PAGE_SIZE as HOTEL_PAGE_SIZE, DEFAULT_SORT as HOTEL_DEFAULT_SORT,
+                                     INDEXED_FILTERS as INDEXED_HOTEL_FILTERS)
+from services.job_queue import trip_jobs, QueueFullError
+from services.plan_cache import plan_cache
+from services.plan_parser import PlanStreamParser
+from services.plan_validator import plan_validator
+from services.points_optimizer import points_optimizer, OptimizationError
+from services.review_listing import list_reviews, parse_fields, ReviewQueryError, DEFAULT_PAGE_SIZE as REVIEW_PAGE_SIZE
+from services.review_search import search_reviews, ensure_search_index, ReviewSearchError, DEFAULT_PAGE_SIZE as REVIEW_SEARCH_PAGE_SIZE
+from services.resilience import llm_resilience, CircuitOpenError
 
 # Create Flask app
 app = Flask(__name__)
@@ -17,8 +32,9 @@ app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///travel_planner.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
 # Import models after app is created
-from models import db, User, PointsProgram
-from models.review import Review
+from models import db, User, PointsProgram, Hotel, add_missing_columns, add_missing_indexes
+from models.review import Review, SQLITE_KEYSET_INDEX
+from slugify import slugify
 
 # Initialize the database with the app
 db.init_app(app)
@@ -67,6 +83,28 @@ def validate_session():
 with app.app_context():
     # Only create tables if they don't exist
     db.create_all()
+    try:
+        added = add_missing_columns(Review)
+        if added:
+            print(f"Added review columns: {', '.join(added)}")
+        added = add_missing_indexes(Review)
+        if added:
+            print(f"Added review indexes: {', '.join(added)}")
+        if Review.add_keyset_index():
+            print(f"Added review indexes: {SQLITE_KEYSET_INDEX}")
+    except Exception as e:
+        print(f"Error updating the reviews table: {str(e)}")
+    try:
+        if ensure_search_index():
+            print("Built the review search index")
+    except Exception as e:
+        print(f"Error building the review search index: {str(e)}")
+    # Seed hotel rankings from the CSV on first run; load_hotels.py refreshes them
+    try:
+        if Hotel.query.first() is None:
+            print(f"Loaded hotel rankings: {load_hotels_csv()}")
+    except Exception as e:
+        print(f"Error seeding hotel rankings: {str(e)}")
 
 def init_db():
     """Initialize database tables. Should only be called once when setting up the app for the first time."""
@@ -441,6 +479,62 @@ def list_points_programs():
             'programs': session.get('temp_programs', [])
         })
 
+def _request_points_balances(data):
+    """Balances sent with the request, else the user's saved or session programs."""
+    programs = data.get('points_programs')
+    if programs is None:
+        if current_user.is_authenticated:
+            programs = [p.to_dict() for p in PointsProgram.query.filter_by(user_id=current_user.id).all()]
+        else:
+            programs = session.get('temp_programs', [])
+    if not isinstance(programs, list) or not all(isinstance(program, dict) for program in programs):
+        raise OptimizationError("points_programs must be a list of {program_name, points_balance} objects")
+    balances = {}
+    for program in programs:
+        name = program.get('program_name')
+        if not name:
+            continue
+        balance = program.get('points_balance') or 0
+        if isinstance(balance, str) and balance.strip().isdigit():
+            balance = int(balance)
+        if not isinstance(balance, int) or isinstance(balance, bool) or balance < 0:
+            raise OptimizationError(f"Points balance for {name} must be a whole number of points")
+        balances[name] = balances.get(name, 0) + balance
+    return balances
+
+@app.route('/api/points/optimize', methods=['POST'])
+def optimize_points():
+    """Find the flight and hotel award bundle that the user's points can fund most cheaply.
+
+    Send candidate awards as ``flights`` and ``hotels`` lists of
+    ``{"program": ..., "points": ...}``, or a parsed plan ``option`` to check.
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({'success': False, 'error': 'Request must be JSON'}), 400
+
+    objective = data.get('objective', 'points')
+    try:
+        balances = _request_points_balances(data)
+        if data.get('option'):
+            result = points_optimizer.check_option(data['option'], balances, objective)
+        else:
+            result = points_optimizer.optimize(balances, [data.get('flights') or [], data.get('hotels') or []], objective)
+    except OptimizationError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    return jsonify({'success': True, **result})
+
+@app.route('/api/airports/search')
+def search_airports():
+    """Airport autocomplete by IATA code, city or airport name."""
+    query = request.args.get('q', '').strip()
+    limit = min(max(request.args.get('limit', AIRPORT_SEARCH_LIMIT, type=int), 1), AIRPORT_SEARCH_MAX)
+    response = jsonify({'success': True, 'airports': airport_search.search(query, limit)})
+    # Results only change when the dataset does, so let browsers reuse them briefly
+    response.headers['Cache-Control'] = 'public, max-age=3600'
+    return response
+
 # Main route
 @app.route('/')
 def index():
@@ -456,6 +550,32 @@ def index():
     
     return render_template('index.html', points_programs=points_programs, today=today)
 
+def _trip_error_details(error):
+    """Map an exception raised while generating a trip to an HTTP status and user-facing message."""
+    if isinstance(error, TripValidationError):
+        print(f"Trip validation error: {str(error)}")
+        return 400, str(error)
+    if isinstance(error, CircuitOpenError):
+        return 503, f'The AI service is having problems right now. Please try again in about {max(1, round(error.retry_after))} seconds.'
+    if isinstance(error, RateLimitError):
+        return 429, 'The service is busy right now. Please wait a minute before trying again.'
+    if isinstance(error, (APITimeoutError, TimeoutError)):
+        return 504, 'The request took too long to complete. Please try again in a few moments.'
+    if isinstance(error, APIConnectionError):
+        return 502, 'Connection to the AI service failed. Please try again in a few moments.'
+    if isinstance(error, APIError):
+        return 503, 'The service is temporarily unavailable. Please try again in a few moments.'
+    print(f"Error generating travel plan: {str(error)}")
+    return 500, 'A temporary error occurred. Please try again in a few moments.'
+
+def _use_plan_cache():
+    """Whether the current trip request may be answered from the plan cache (bypass with ?nocache=1)."""
+    return request.args.get('nocache', '').lower() not in ('1', 'true', 'yes')
+
+def _sse_event(event, payload):
+    """Format a single Server-Sent Events message with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
 # Trip planning route
 @app.route('/generate_trip', methods=['POST'])
 def generate_trip():
@@ -482,7 +602,7 @@ def generate_trip():
         
         try:
             # Generate the travel plan with a timeout
-            result = travel_planner.generate_travel_plan(data)
+            result = travel_planner.generate_travel_plan(data, use_cache=_use_plan_cache())
             
             # Validate the result
             if not isinstance(result, dict):
@@ -493,44 +613,12 @@ def generate_trip():
                 
             return jsonify(result)
             
-        except TripValidationError as e:
-            print(f"Trip validation error: {str(e)}")
-            return jsonify({
-                'success': False,
-                'error': str(e)
-            }), 400
-            
-        except RateLimitError:
-            return jsonify({
-                'success': False,
-                'error': 'The service is briefly busy. Please try again in a few moments - it usually works on the second try!'
-            }), 429
-        except APIConnectionError:
-            return jsonify({
-                'success': False,
-                'error': 'Connection to the AI service failed. Please try again in a few moments.'
-            }), 502
-        except APIError:
-            return jsonify({
-                'success': False,
-                'error': 'The service is temporarily unavailable. Please try again - it usually works on the second try!'
-            }), 503
-        except APIConnectionError:
-            return jsonify({
-                'success': False,
-                'error': 'Having trouble connecting to the service. Please try again - it usually works on the second try!'
-            }), 503
-        except TimeoutError:
-            return jsonify({
-                'success': False,
-                'error': 'The request took a bit too long. Please try again - it usually works on the second try!'
-            }), 504
         except Exception as e:
-            print(f"Error generating travel plan: {str(e)}")
+            status, message = _trip_error_details(e)
             return jsonify({
                 'success': False,
-                'error': 'A temporary error occurred. Please try again - it usually works on the second try!'
-            }), 500
+                'error': message
+            }), status
         
     except Exception as e:
         print(f"Error parsing request data: {str(e)}")
@@ -539,16 +627,185 @@ def generate_trip():
             'error': 'Invalid request data format'
         }), 400
 
+@app.route('/generate_trip/stream', methods=['POST'])
+def generate_trip_stream():
+    """Stream trip ideas to the client as Server-Sent Events while the model writes them."""
+    if not request.is_json:
+        return jsonify({
+            'success': False,
+            'error': 'Request must be JSON'
+        }), 400
+
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({
+            'success': False,
+            'error': 'No data provided'
+        }), 400
+
+    try:
+        travel_planner = TravelPlanGenerator()
+        chunks = travel_planner.stream_travel_plan(data, use_cache=_use_plan_cache())
+    except Exception as e:
+        status, message = _trip_error_details(e)
+        return jsonify({
+            'success': False,
+            'error': message
+        }), status
+
+    def event_stream():
+        parser = PlanStreamParser()
+        received_content = False
+        try:
+            for chunk in chunks:
+                received_content = True
+                yield _sse_event('token', {'text': chunk})
+                # Send each destination as structured JSON as soon as the next one starts
+                for destination in parser.feed(chunk):
+                    yield _sse_event('destination', destination)
+        except Exception as e:
+            _, message = _trip_error_details(e)
+            yield _sse_event('error', {'success': False, 'error': message})
+            return
+
+        if not received_content:
+            yield _sse_event('error', {
+                'success': False,
+                'error': 'No trip recommendations were received. Please try again in a few moments.'
+            })
+            return
+        for destination in parser.close():
+            yield _sse_event('destination', destination)
+        try:
+            # The streamed text is the raw model output; send the validated plan that replaces it
+            result = chunks.finish() or {}
+        except Exception as e:
+            _, message = _trip_error_details(e)
+            yield _sse_event('error', {'success': False, 'error': message})
+            return
+        yield _sse_event('done', {
+            'success': True,
+            'result': result.get('result'),
+            'plan': result.get('plan', parser.plan),
+            'validation': result.get('validation')
+        })
+
+    response = Response(stream_with_context(event_stream()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Stop proxies from buffering the event stream
+    return response
+
+@app.route('/generate_trip/jobs', methods=['POST'])
+def submit_trip_job():
+    """Queue a trip generation in the background and return a job id to poll."""
+    if not request.is_json:
+        return jsonify({
+            'success': False,
+            'error': 'Request must be JSON'
+        }), 400
+
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({
+            'success': False,
+            'error': 'No data provided'
+        }), 400
+
+    try:
+        travel_planner = TravelPlanGenerator()
+        # Balances depend on the logged-in user, so resolve them while the request is still available
+        points_balances = travel_planner.get_points_balances(data)
+    except Exception as e:
+        status, message = _trip_error_details(e)
+        return jsonify({
+            'success': False,
+            'error': message
+        }), status
+
+    use_cache = _use_plan_cache()
+
+    def run_job():
+        with app.app_context():
+            return travel_planner.generate_travel_plan(data, use_cache=use_cache, points_balances=points_balances)
+
+    try:
+        job_id = trip_jobs.submit(run_job, describe_error=_trip_error_details)
+    except QueueFullError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 503
+
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': url_for('get_trip_job', job_id=job_id)
+    }), 202
+
+@app.route('/generate_trip/jobs/<job_id>', methods=['GET'])
+def get_trip_job(job_id):
+    """Return the status of a queued trip generation, or its result once finished."""
+    job = trip_jobs.get(job_id)
+    if not job:
+        return jsonify({
+            'success': False,
+            'error': 'Trip request not found. It may have expired - please try again.'
+        }), 404
+
+    if job['status'] == 'failed':
+        return jsonify({
+            'success': False,
+            'job_id': job_id,
+            'status': job['status'],
+            'error': job['error']
+        }), job['error_status'] or 500
+
+    response = {
+        'success': True,
+        'job_id': job_id,
+        'status': job['status']
+    }
+    if job['status'] == 'succeeded':
+        response.update(job['result'])
+    return jsonify(response)
+
+@app.route('/admin/llm/health', methods=['GET'])
+@login_required
+def llm_health():
+    """Report this worker's retry, circuit breaker and hedging counters for the AI service."""
+    # Only allow admin users
+    if not hasattr(current_user, 'is_admin') or not current_user.is_admin:
+        return redirect(url_for('index'))
+
+    return jsonify(llm_resilience.stats())
+
+@app.route('/admin/trip-jobs/metrics', methods=['GET'])
+@login_required
+def trip_job_metrics():
+    """Report trip job queue depth and wait-time metrics."""
+    # Only allow admin users
+    if not hasattr(current_user, 'is_admin') or not current_user.is_admin:
+        return redirect(url_for('index'))
+
+    return jsonify(trip_jobs.metrics())
+
+@app.route('/admin/plan-validation/stats', methods=['GET'])
+@login_required
+def plan_validation_stats():
+    """Report how often generated plans were valid, repaired locally or partly regenerated."""
+    # Only allow admin users
+    if not hasattr(current_user, 'is_admin') or not current_user.is_admin:
+        return redirect(url_for('index'))
+
+    return jsonify(plan_validator.stats())
+
 # Test OpenAI API connection
 @app.route('/test_openai', methods=['GET'])
 def test_openai():
     try:
-        # Get OpenAI client
-        api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
-            raise ValueError("OpenAI API key not found")
-        
-        client = OpenAI(api_key=api_key)
+        # Get the shared OpenAI client
+        client = get_openai_client()
         
         # Try a simple chat completion as a test
         response = client.chat.completions.create(
@@ -566,6 +823,18 @@ def test_openai():
             'error': str(e)
         }), 500
 
+@app.route('/admin/plan-cache/stats', methods=['GET'])
+@login_required
+def plan_cache_stats():
+    """Report trip plan cache hit/miss counters shared across workers plus this worker's coalescing counters."""
+    # Only allow admin users
+    if not hasattr(current_user, 'is_admin') or not current_user.is_admin:
+        return redirect(url_for('index'))
+
+    stats = plan_cache.stats()
+    stats['single_flight'] = plan_requests.stats()
+    return jsonify(stats)
+
 @app.route('/test_static')
 def test_static():
     """Test endpoint to verify static files are being served correctly"""
@@ -610,7 +879,7 @@ def sitemap():
     # Add blog review pages
     with app.app_context():
         try:
-            reviews = Review.get_all_published()
+            reviews = Review.published_page(columns=('slug',))
             for review in reviews:
                 sitemap.add_url(f'/reviews/{review.slug}', priority=0.8, changefreq='weekly')
         except Exception as e:
@@ -662,61 +931,144 @@ def get_travel_guides():
 def hotel_rankings():
     return render_template('hotel-rankings.html')
 
+HOTEL_QUERY_PARAMS = ('country', 'city', 'category', 'price_range', 'exclude_country', 'stayed',
+                      'min_rating', 'sort', 'limit', 'cursor')
+
+def _flag_arg(name, error):
+    """A yes/no query parameter, or None when absent; raises ``error`` for anything else."""
+    if name not in request.args:
+        return None
+    value = request.args[name].strip().lower()
+    if value in ('1', 'true', 'yes', 'y'):
+        return True
+    if value in ('0', 'false', 'no', 'n'):
+        return False
+    raise error(f"{name} must be yes or no")
+
+def _number_arg(name, default, error, kind=int):
+    """A numeric query parameter, or ``default`` when absent; raises ``error`` when it is not a number."""
+    value = request.args.get(name, '').strip()
+    if not value:
+        return default
+    try:
+        number = kind(value)
+    except ValueError:
+        number = None
+    if number is None or not math.isfinite(number):
+        raise error(f"{name} must be a {'whole number' if kind is int else 'number'}")
+    return number
+
 @app.route('/api/hotel-rankings')
 def get_hotel_rankings():
-    import csv
-    import os
-    
-    hotels = []
-    csv_file = os.path.join(app.root_path, 'data', 'Hotel Reviews.csv')
-    
-    with open(csv_file, 'r') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            hotels.append({
-                'name': row['Hotel Name'],
-                'city': row['City'],
-                'country': row['Country'],
-                'category': row['Category'],
-                'priceRange': row['Price Range'],
-                'airportDistance': row['Distance from\nAirport'],
-                'hasStayed': row['Have I \nStayed? (Y/N)'].strip().upper() == 'Y',
-                'rating': float(row['My Rating']),
-                'notes': row['Notes'],
-                'website': ''  # We'll need to add this to the CSV
-            })
-    
-    return jsonify(hotels)
+    """All hotels, or a filtered, sorted page of them when any query parameter is given.
+
+    Filters (repeat a parameter to accept several values): country, city,
+    category, price_range, exclude_country, stayed, min_rating. Paging:
+    sort (rating, name, price, price_desc, country), limit and the
+    next_cursor returned by the previous page.
+    """
+    # Responses are serialized once per query and table version, then served with their ETag
+    query_key = '&'.join(sorted(f"{name}={value}" for name in HOTEL_QUERY_PARAMS
+                                for value in request.args.getlist(name))) or 'all'
+    version = Hotel.table_version()
+    page = hotel_payload_cache.get(query_key, 'json', version)
+    if page is None:
+        if query_key == 'all':
+            body = json.dumps(all_hotels(), separators=(',', ':'))
+        else:
+            try:
+                result = query_hotels(
+                    filters={field: request.args.getlist(field) for field in INDEXED_HOTEL_FILTERS if request.args.getlist(field)},
+                    exclude_countries=request.args.getlist('exclude_country'),
+                    stayed=_flag_arg('stayed', HotelQueryError),
+                    min_rating=_number_arg('min_rating', None, HotelQueryError, kind=float),
+                    sort=request.args.get('sort', HOTEL_DEFAULT_SORT),
+                    limit=_number_arg('limit', HOTEL_PAGE_SIZE, HotelQueryError),
+                    cursor=request.args.get('cursor')
+                )
+            except HotelQueryError as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
+            body = json.dumps({'success': True, **result}, separators=(',', ':'))
+        page = hotel_payload_cache.set(query_key, 'json', version, body)
+
+    if request.if_none_match.contains(page.etag):
+        response = Response(status=304)
+    else:
+        response = Response(page.body, mimetype='application/json')
+    response.set_etag(page.etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 # Review routes
+def _review_not_found():
+    return render_template('error.html', 
+                          error_title="Review Not Found",
+                          error_message="The review you're looking for doesn't exist or has been removed.",
+                          back_link=url_for('travel_guides'),
+                          back_text="Back to Travel Guides")
+
 @app.route('/reviews/<slug>')
 def view_review(slug):
-    review = Review.get_by_slug(slug)
-    if not review:
-        return render_template('error.html', 
-                              error_title="Review Not Found",
-                              error_message="The review you're looking for doesn't exist or has been removed.",
-                              back_link=url_for('travel_guides'),
-                              back_text="Back to Travel Guides")
-    
-    return render_template('review.html', review=review)
+    found, last_modified, version = Review.get_last_modified(slug)
+    if not found:
+        return _review_not_found()
+
+    # The nav shows the signed-in user's email, so each user gets their own copy
+    variant = f"user:{current_user.id}" if current_user.is_authenticated else 'anonymous'
+    page = review_page_cache.get(slug, variant, version)
+    if page is None:
+        review = Review.get_by_slug(slug)
+        if not review:
+            return _review_not_found()
+        page = review_page_cache.set(slug, variant, version, render_template('review.html', review=review),
+                                     last_modified)
+
+    if request.if_none_match:
+        not_modified = request.if_none_match.contains(page.etag)
+    elif request.if_modified_since and page.last_modified:
+        not_modified = page.last_modified.replace(microsecond=0, tzinfo=timezone.utc) <= request.if_modified_since
+    else:
+        not_modified = False
+    response = Response(status=304) if not_modified else make_response(page.body)
+    response.set_etag(page.etag)
+    if page.last_modified:
+        response.last_modified = page.last_modified.replace(tzinfo=timezone.utc)
+    response.headers['Cache-Control'] = 'private, no-cache' if current_user.is_authenticated else 'public, no-cache'
+    response.vary.add('Cookie')
+    return response
 
 @app.route('/api/reviews')
 def get_reviews():
-    reviews = Review.get_all_published()
-    result = []
-    for review in reviews:
-        result.append({
-            "title": review.title,
-            "slug": review.slug,
-            "location": review.location,
-            "summary": review.summary,
-            "author": review.author,
-            "image": review.image,
-            "created_at": review.created_at.strftime('%Y-%m-%d'),
-            "url": url_for('view_review', slug=review.slug)
-        })
-    return jsonify({"reviews": result})
+    """A page of published reviews, newest first.
+
+    ``fields`` picks a comma-separated subset of the review fields, and
+    ``cursor`` is the next_cursor returned with the previous page.
+    """
+    try:
+        result = list_reviews(
+            parse_fields(request.args.get('fields')),
+            lambda slug: url_for('view_review', slug=slug),
+            limit=_number_arg('limit', REVIEW_PAGE_SIZE, ReviewQueryError),
+            cursor=request.args.get('cursor')
+        )
+    except ReviewQueryError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    return jsonify(result)
+
+@app.route('/api/reviews/search')
+def search_reviews_api():
+    """Published reviews matching ``q``, best match first, with highlighted snippets."""
+    try:
+        result = search_reviews(
+            request.args.get('q', ''),
+            limit=_number_arg('limit', REVIEW_SEARCH_PAGE_SIZE, ReviewSearchError),
+            page=_number_arg('page', 1, ReviewSearchError)
+        )
+    except ReviewSearchError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    for review in result['results']:
+        review['url'] = url_for('view_review', slug=review['slug'])
+    return jsonify({'success': True, **result})
 
 @app.route('/admin/reviews', methods=['GET'])
 @login_required
@@ -725,7 +1077,7 @@ def admin_reviews():
     if not hasattr(current_user, 'is_admin') or not current_user.is_admin:
         return redirect(url_for('index'))
         
-    reviews = Review.query.order_by(Review.created_at.desc()).all()
+    reviews = Review.listing_query().all()
     return render_template('admin/reviews.html', reviews=reviews)
 
 @app.route('/admin/reviews/new', methods=['GET', 'POST'])
@@ -772,6 +1124,7 @@ def edit_review(id):
         return redirect(url_for('admin_reviews'))
     
     if request.method == 'POST':
+        old_slug = review.slug
         review.title = request.form.get('title')
         review.location = request.form.get('location')
         review.summary = request.form.get('summary')
@@ -781,6 +1134,8 @@ def edit_review(id):
         review.slug = slugify(review.title)
         
         db.session.commit()
+        review_page_cache.invalidate(old_slug)
+        review_page_cache.invalidate(review.slug)
         
         return redirect(url_for('admin_reviews'))
         
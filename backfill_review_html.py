@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Backfill Review HTML Script
+
+Renders and stores the sanitized HTML for reviews saved before HTML was
+stored with each review, or whose stored copy no longer matches their
+content or the current renderer version. Reviews saved through the app or
+the import scripts are rendered automatically; this only catches up the rest.
+
+Usage:
+  python3 backfill_review_html.py           # render missing or stale HTML
+  python3 backfill_review_html.py --force   # re-render every review
+"""
+
+import argparse
+
+from app import app, db
+from models.review import Review
+
+BATCH_SIZE = 50
+
+
+def backfill_review_html(force=False):
+    """Render stale reviews in batches; returns how many were rendered."""
+    rendered = 0
+    checked = 0
+    with app.app_context():
+        last_id = 0
+        while True:
+            batch = Review.query.filter(Review.id > last_id).order_by(Review.id).limit(BATCH_SIZE).all()
+            if not batch:
+                break
+            for review in batch:
+                checked += 1
+                if force or review.needs_render:
+                    review.render()
+                    rendered += 1
+            db.session.commit()
+            last_id = batch[-1].id
+    print(f"Rendered HTML for {rendered} of {checked} reviews.")
+    return rendered
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Store rendered HTML for reviews.")
+    parser.add_argument('--force', action='store_true', help="Re-render every review")
+    args = parser.parse_args()
+    backfill_review_html(force=args.force)
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Load Test Script
+
+This script measures throughput, latency percentiles and error rates for the
+main routes of the app. By default it starts app:app under gunicorn with the
+settings from gunicorn_config.py (gevent workers) and the fake LLM backend,
+drives a weighted mix of requests from concurrent virtual users, and prints a
+report per scenario.
+
+Results can be saved as baselines and later runs compared against them, so
+regressions show up between commits.
+
+Usage:
+  python3 benchmarks/load_test.py
+  python3 benchmarks/load_test.py --duration 60 --users 50
+  python3 benchmarks/load_test.py --save-baseline
+  python3 benchmarks/load_test.py --compare
+  python3 benchmarks/load_test.py --url http://localhost:5041   (use a server that is already running)
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+TRIP_REQUESTS = [
+    {
+        'airports': ['JFK'],
+        'trip_types': ['Beach', 'Relaxation'],
+        'travel_months': 'June',
+        'trip_length': 7,
+        'max_flight_length': 8,
+        'direct_flights': False,
+        'preferences': '',
+        'points_programs': [
+            {'program_name': 'Chase Ultimate Rewards', 'points_balance': 150000},
+            {'program_name': 'World of Hyatt', 'points_balance': 60000}
+        ]
+    },
+    {
+        'airports': ['SFO', 'OAK'],
+        'trip_types': ['Culture', 'Food'],
+        'travel_months': 'October',
+        'trip_length': 10,
+        'max_flight_length': 14,
+        'direct_flights': True,
+        'preferences': 'Somewhere in Asia',
+        'points_programs': [
+            {'program_name': 'Amex Membership Rewards', 'points_balance': 220000},
+            {'program_name': 'Marriott Bonvoy', 'points_balance': 90000}
+        ]
+    }
+]
+
+
+def _generate_trip(session, base_url, state):
+    # Bypass the plan cache so every request exercises the (fake) model call
+    return session.post(f"{base_url}/generate_trip?nocache=1", json=random.choice(TRIP_REQUESTS), timeout=150)
+
+
+def _generate_trip_cached(session, base_url, state):
+    return session.post(f"{base_url}/generate_trip", json=random.choice(TRIP_REQUESTS), timeout=150)
+
+
+def _hotel_rankings(session, base_url, state):
+    return session.get(f"{base_url}/api/hotel-rankings", timeout=30)
+
+
+def _reviews_api(session, base_url, state):
+    return session.get(f"{base_url}/api/reviews", timeout=30)
+
+
+def _review_page(session, base_url, state):
+    return session.get(f"{base_url}/reviews/{random.choice(state['review_slugs'])}", timeout=30)
+
+
+def _sitemap(session, base_url, state):
+    return session.get(f"{base_url}/sitemap.xml", timeout=30)
+
+
+def _points_add(session, base_url, state):
+    return session.post(f"{base_url}/points/add", json={
+        'program_type': 'airline',
+        'program_name': 'United MileagePlus',
+        'points_balance': random.randint(1000, 200000)
+    }, timeout=30)
+
+
+def _points_list(session, base_url, state):
+    return session.get(f"{base_url}/points/list", timeout=30)
+
+
+def _points_delete(session, base_url, state):
+    return session.post(f"{base_url}/points/delete", json={'id': 1}, timeout=30)
+
+
+# name -> (request function, relative weight, whether it needs review slugs)
+SCENARIOS = {
+    'generate_trip': (_generate_trip, 2, False),
+    'generate_trip_cached': (_generate_trip_cached, 2, False),
+    'hotel_rankings': (_hotel_rankings, 10, False),
+    'reviews_api': (_reviews_api, 10, False),
+    'review_page': (_review_page, 10, True),
+    'sitemap': (_sitemap, 3, False),
+    'points_add': (_points_add, 4, False),
+    'points_list': (_points_list, 6, False),
+    'points_delete': (_points_delete, 2, False),
+}
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers=None, llm_latency='lognormal:0.6,0.4', tokens_per_second=400):
+    """Start gunicorn with gunicorn_config.py and the fake LLM backend; returns (process, base_url)."""
+    port = _free_port()
+    state_dir = tempfile.mkdtemp(prefix='bench-')
+    env = dict(os.environ)
+    env.update({
+        'LLM_PROVIDER': 'fake',
+        'FAKE_LLM_FIRST_TOKEN_LATENCY': llm_latency,
+        'FAKE_LLM_TOKENS_PER_SECOND': str(tokens_per_second),
+        'FAKE_LLM_SEED': '42',
+        # Keep benchmark plans and jobs out of the development cache
+        'PLAN_CACHE_PATH': os.path.join(state_dir, 'plan_cache.db'),
+        'TRIP_JOB_PATH': os.path.join(state_dir, 'trip_jobs.db'),
+    })
+    command = [
+        sys.executable, '-m', 'gunicorn',
+        '-c', os.path.join(ROOT_DIR, 'gunicorn_config.py'),
+        '--bind', f'127.0.0.1:{port}',
+        '--access-logfile', '/dev/null',
+        '--log-level', 'warning',
+    ]
+    if workers:
+        command += ['--workers', str(workers)]
+    command.append('app:app')
+
+    process = subprocess.Popen(command, cwd=ROOT_DIR, env=env)
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {process.returncode}")
+        try:
+            if requests.get(f'{base_url}/robots.txt', timeout=2).status_code == 200:
+                return process, base_url
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError("gunicorn did not become ready within 60 seconds")
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def discover_review_slugs(base_url):
+    try:
+        reviews = requests.get(f'{base_url}/api/reviews', timeout=30).json().get('reviews', [])
+        return [review['slug'] for review in reviews]
+    except (requests.RequestException, ValueError):
+        return []
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def run_load(base_url, scenarios, duration, users, warmup):
+    """Drive the weighted scenario mix for ``duration`` seconds and collect per-request samples."""
+    state = {'review_slugs': discover_review_slugs(base_url)}
+    active = {
+        name: spec for name, spec in scenarios.items()
+        if not spec[2] or state['review_slugs']
+    }
+    skipped = sorted(set(scenarios) - set(active))
+    names = list(active)
+    weights = [active[name][1] for name in names]
+
+    samples = {name: [] for name in names}
+    lock = threading.Lock()
+    start = time.time()
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+
+    def virtual_user():
+        session = requests.Session()
+        while True:
+            now = time.time()
+            if now >= stop_at:
+                return
+            name = random.choices(names, weights)[0]
+            request_started = time.perf_counter()
+            try:
+                status = active[name][0](session, base_url, state).status_code
+            except requests.RequestException:
+                status = 0
+            elapsed = time.perf_counter() - request_started
+            if now >= measure_from:
+                with lock:
+                    samples[name].append((elapsed, status))
+
+    with ThreadPoolExecutor(max_workers=users) as executor:
+        for _ in range(users):
+            executor.submit(virtual_user)
+
+    return samples, skipped
+
+
+def summarize(samples, duration):
+    report = {}
+    for name, entries in sorted(samples.items()):
+        if not entries:
+            continue
+        latencies = sorted(elapsed for elapsed, _ in entries)
+        errors = sum(1 for _, status in entries if status == 0 or status >= 500)
+        report[name] = {
+            'requests': len(entries),
+            'throughput_rps': round(len(entries) / duration, 2),
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+            'error_rate': round(errors / len(entries), 4)
+        }
+    total = sum(entry['requests'] for entry in report.values())
+    report['_total'] = {
+        'requests': total,
+        'throughput_rps': round(total / duration, 2)
+    }
+    return report
+
+
+def print_report(report, skipped):
+    print(f"\n{'scenario':<22}{'reqs':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>9}")
+    for name, entry in report.items():
+        if name.startswith('_'):
+            continue
+        print(f"{name:<22}{entry['requests']:>8}{entry['throughput_rps']:>10}{entry['p50_ms']:>10}"
+              f"{entry['p95_ms']:>10}{entry['p99_ms']:>10}{entry['error_rate']:>9.2%}")
+    print(f"{'total':<22}{report['_total']['requests']:>8}{report['_total']['throughput_rps']:>10}")
+    if skipped:
+        print(f"\nSkipped (no published reviews to request): {', '.join(skipped)}")
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_baselines():
+    if not os.path.exists(BASELINES_PATH):
+        return {}
+    with open(BASELINES_PATH, 'r') as f:
+        return json.load(f)
+
+
+def save_baseline(profile, report, settings):
+    baselines = load_baselines()
+    baselines[profile] = {
+        'commit': _git_commit(),
+        'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'settings': settings,
+        'scenarios': report
+    }
+    with open(BASELINES_PATH, 'w') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write('\n')
+    print(f"\nSaved baseline '{profile}' to {os.path.relpath(BASELINES_PATH, ROOT_DIR)}")
+
+
+def compare_to_baseline(profile, report, tolerance):
+    """Print changes against the stored baseline; returns False if any scenario regressed."""
+    baseline = load_baselines().get(profile)
+    if not baseline:
+        print(f"\nNo baseline named '{profile}' to compare against.")
+        return True
+
+    print(f"\nCompared with baseline '{profile}' (commit {baseline.get('commit')}, tolerance {tolerance:.0%}):")
+    ok = True
+    for name, entry in report.items():
+        previous = baseline['scenarios'].get(name)
+        if name.startswith('_') or not previous:
+            continue
+        problems = []
+        if entry['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            problems.append(f"p95 {previous['p95_ms']} -> {entry['p95_ms']} ms")
+        if entry['throughput_rps'] < previous['throughput_rps'] * (1 - tolerance):
+            problems.append(f"throughput {previous['throughput_rps']} -> {entry['throughput_rps']} rps")
+        if entry['error_rate'] > previous['error_rate'] + 0.01:
+            problems.append(f"errors {previous['error_rate']:.2%} -> {entry['error_rate']:.2%}")
+        if problems:
+            ok = False
+            print(f"  REGRESSION {name}: {'; '.join(problems)}")
+        else:
+            print(f"  ok         {name}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the travel planner routes.")
+    parser.add_argument('--url', help="Target an already running server instead of starting gunicorn")
+    parser.add_argument('--duration', type=float, default=30, help="Measured seconds (default 30)")
+    parser.add_argument('--warmup', type=float, default=5, help="Unmeasured warm-up seconds (default 5)")
+    parser.add_argument('--users', type=int, default=25, help="Concurrent virtual users (default 25)")
+    parser.add_argument('--workers', type=int, help="Override the gunicorn worker count")
+    parser.add_argument('--scenarios', help="Comma-separated subset of: " + ', '.join(SCENARIOS))
+    parser.add_argument('--llm-latency', default='lognormal:0.6,0.4',
+                        help="Fake LLM time-to-first-token distribution (default lognormal:0.6,0.4)")
+    parser.add_argument('--tokens-per-second', type=float, default=400,
+                        help="Fake LLM generation speed (default 400)")
+    parser.add_argument('--profile', default='default', help="Baseline name to save or compare (default 'default')")
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the baseline")
+    parser.add_argument('--compare', action='store_true', help="Compare with the stored baseline; exit 1 on regression")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed relative regression (default 0.2)")
+    parser.add_argument('--output', help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    scenarios = SCENARIOS
+    if args.scenarios:
+        wanted = [name.strip() for name in args.scenarios.split(',')]
+        unknown = set(wanted) - set(SCENARIOS)
+        if unknown:
+            parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        scenarios = {name: SCENARIOS[name] for name in wanted}
+
+    process = None
+    base_url = args.url
+    if not base_url:
+        print("Starting gunicorn with gunicorn_config.py and the fake LLM backend...")
+        process, base_url = start_server(args.workers, args.llm_latency, args.tokens_per_second)
+
+    try:
+        print(f"Running {args.users} virtual users for {args.duration:g}s (+{args.warmup:g}s warm-up) against {base_url}")
+        samples, skipped = run_load(base_url, scenarios, args.duration, args.users, args.warmup)
+    finally:
+        if process:
+            stop_server(process)
+
+    report = summarize(samples, args.duration)
+    print_report(report, skipped)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    settings = {
+        'duration': args.duration,
+        'users': args.users,
+        'workers': args.workers,
+        'scenarios': sorted(scenarios),
+        'llm_latency': args.llm_latency,
+        'tokens_per_second': args.tokens_per_second
+    }
+    ok = True
+    if args.compare:
+        ok = compare_to_baseline(args.profile, report, args.tolerance)
+    if args.save_baseline:
+        save_baseline(args.profile, report, settings)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Build Airports Script
+
+Compiles the canonical airport list (data/airports.json) into the minified
+artifact the app loads for airport search and flight distances
+(static/data/airports.min.json), and optionally upserts it into the
+airports table.
+
+Records are validated (IATA code, name, city, country, coordinates and
+region), deduplicated by code and sorted. Any invalid or conflicting record
+stops the build without writing anything.
+
+Usage:
+  python3 build_airports.py            # validate and write the artifact
+  python3 build_airports.py --check    # validate only
+  python3 build_airports.py --db       # also upsert the airports table
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from services.airport_data import ARTIFACT_PATH, SOURCE_PATH, AirportDataError, build_artifact, compile_airports
+
+
+def build_airports(source=SOURCE_PATH, artifact=ARTIFACT_PATH, check_only=False, update_db=False):
+    """Compile the source list; returns the compiled airports."""
+    with open(source, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+
+    airports, errors, warnings = compile_airports(records)
+    for warning in warnings:
+        print(f"Warning: {warning}")
+    if errors:
+        for error in errors:
+            print(f"Error: {error}")
+        raise AirportDataError(f"{len(errors)} invalid airport record(s) in {source}")
+    print(f"Validated {len(airports)} airports from {len(records)} records.")
+
+    if check_only:
+        return airports
+
+    content = build_artifact(airports)
+    os.makedirs(os.path.dirname(artifact), exist_ok=True)
+    # Write then rename so running workers never read a half-written file
+    temp_path = f"{artifact}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(temp_path, artifact)
+    print(f"Wrote {artifact} ({len(content.encode('utf-8')):,} bytes).")
+
+    if update_db:
+        from app import app, db
+        from models.airport import Airport
+
+        with app.app_context():
+            db.create_all()
+            count = Airport.bulk_upsert(airports)
+            db.session.commit()
+            print(f"Upserted {count} airports.")
+    return airports
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile the airport dataset.")
+    parser.add_argument('--source', default=SOURCE_PATH, help="Canonical airport list")
+    parser.add_argument('--output', default=ARTIFACT_PATH, help="Where to write the minified artifact")
+    parser.add_argument('--check', action='store_true', help="Validate the source without writing anything")
+    parser.add_argument('--db', action='store_true', help="Also upsert the airports table")
+    args = parser.parse_args()
+
+    try:
+        build_airports(args.source, args.output, check_only=args.check, update_db=args.db)
+    except AirportDataError as e:
+        print(str(e))
+        sys.exit(1)
@@ -5,74 +5,50 @@ Import Reviews Script
 This script imports reviews from a JSON file into the database.
 It can be run on the production server to import reviews exported from the local database.
 
+The file is read as a stream and reviews are upserted by slug in batches,
+so large exports import in seconds without being loaded into memory.
+Existing reviews are updated; everything is committed in one transaction.
+
 Usage:
   python3 import_reviews.py
+  python3 import_reviews.py path/to/reviews.json --batch-size 1000
+  python3 import_reviews.py --no-render    # then run backfill_review_html.py
 """
 
-import json
+import argparse
 import os
-from app import app, db
-from models.review import Review
+import sys
+
+from app import app
+from services.review_import import DEFAULT_BATCH_SIZE, ReviewImportError, import_reviews_file
 
-def import_reviews():
+def import_reviews(path='reviews_export.json', batch_size=DEFAULT_BATCH_SIZE, render=True):
     """Import reviews from a JSON file"""
     
     # Check if the file exists
-    if not os.path.exists('reviews_export.json'):
-        print("reviews_export.json file not found.")
-        return
+    if not os.path.exists(path):
+        print(f"{path} file not found.")
+        return False
     
-    # Load the reviews data
-    with open('reviews_export.json', 'r') as f:
-        reviews_data = json.load(f)
+    with app.app_context():
+        try:
+            counts = import_reviews_file(path, batch_size=batch_size, render=render)
+        except (OSError, ReviewImportError) as e:
+            print(f"Error importing reviews: {str(e)}")
+            return False
     
-    if not reviews_data:
+    if not counts['read']:
         print("No reviews found in the JSON file.")
-        return
-    
-    print(f"Found {len(reviews_data)} reviews to import.")
-    
-    with app.app_context():
-        # Check for existing reviews to avoid duplicates
-        existing_slugs = [r.slug for r in Review.query.all()]
-        
-        reviews_added = 0
-        reviews_updated = 0
-        
-        # Add each review
-        for review_data in reviews_data:
-            # Check if the review already exists
-            if review_data['slug'] in existing_slugs:
-                # Update existing review
-                existing = Review.query.filter_by(slug=review_data['slug']).first()
-                existing.title = review_data['title']
-                existing.location = review_data['location']
-                existing.summary = review_data['summary']
-                existing.content = review_data['content']
-                existing.image = review_data['image']
-                existing.author = review_data.get('author', 'Go Ask Marshall')
-                existing.is_published = review_data.get('is_published', True)
-                reviews_updated += 1
-                print(f"Updated review: {review_data['title']}")
-            else:
-                # Create a new review
-                review = Review(
-                    title=review_data['title'],
-                    slug=review_data['slug'],
-                    location=review_data['location'],
-                    summary=review_data['summary'],
-                    content=review_data['content'],
-                    image=review_data['image'],
-                    author=review_data.get('author', 'Go Ask Marshall'),
-                    is_published=review_data.get('is_published', True)
-                )
-                db.session.add(review)
-                reviews_added += 1
-                print(f"Added review: {review_data['title']}")
-        
-        # Commit all changes
-        db.session.commit()
-        print(f"Successfully imported reviews: {reviews_added} added, {reviews_updated} updated")
+        return False
+    print(f"Successfully imported {counts['read']} reviews in {counts['seconds']}s: "
+          f"{counts['added']} added, {counts['updated']} updated")
+    return True
 
 if __name__ == "__main__":
-    import_reviews()
+    parser = argparse.ArgumentParser(description="Import reviews from a JSON export.")
+    parser.add_argument('path', nargs='?', default='reviews_export.json', help="Reviews JSON file")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Reviews per upsert statement")
+    parser.add_argument('--no-render', action='store_true',
+                        help="Skip rendering HTML; run backfill_review_html.py afterwards")
+    args = parser.parse_args()
+    sys.exit(0 if import_reviews(args.path, args.batch_size, not args.no_render) else 1)
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Load Hotels Script
+
+Loads the hotel rankings CSV (data/Hotel Reviews.csv) into the hotels table.
+Every row is upserted by hotel name and city in a single statement and
+committed in one transaction, so a bad file leaves the table unchanged.
+
+Usage:
+  python3 load_hotels.py                  # upsert from the default CSV
+  python3 load_hotels.py path/to/file.csv
+  python3 load_hotels.py --prune          # also delete hotels no longer in the CSV
+"""
+
+import argparse
+import sys
+
+from app import app
+from services.hotel_rankings import DEFAULT_CSV_PATH, load_hotels_csv
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load hotel rankings into the database.")
+    parser.add_argument('path', nargs='?', default=DEFAULT_CSV_PATH, help="Hotel rankings CSV")
+    parser.add_argument('--prune', action='store_true', help="Delete hotels that are no longer in the CSV")
+    args = parser.parse_args()
+
+    with app.app_context():
+        try:
+            result = load_hotels_csv(args.path, prune=args.prune)
+        except (OSError, ValueError) as e:
+            print(f"Error loading hotels: {str(e)}")
+            sys.exit(1)
+    print(f"Upserted {result['upserted']} hotels, removed {result['removed']}.")
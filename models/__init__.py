@@ -8,7 +8,47 @@ db = SQLAlchemy()
 from models.user import User
 from models.points_program import PointsProgram
 from models.review import Review
+from models.airport import Airport
+from models.hotel import Hotel
 
 def init_app(app):
     """Initialize the SQLAlchemy app"""
     db.init_app(app)
+
+def add_missing_columns(model):
+    """Add nullable columns that exist on the model but not yet in its table.
+
+    create_all() only creates missing tables, so new optional columns on an
+    existing table are added here with ALTER TABLE. Returns the names added.
+    """
+    from sqlalchemy import inspect, text
+
+    table = model.__table__
+    inspector = inspect(db.engine)
+    if not inspector.has_table(table.name):
+        return []
+    existing = {column['name'] for column in inspector.get_columns(table.name)}
+    added = []
+    with db.engine.begin() as connection:
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+            added.append(column.name)
+    return added
+
+def add_missing_indexes(model):
+    """Create indexes declared on the model that an existing table does not have yet."""
+    from sqlalchemy import inspect
+
+    inspector = inspect(db.engine)
+    if not inspector.has_table(model.__tablename__):
+        return []
+    existing = {index['name'] for index in inspector.get_indexes(model.__tablename__)}
+    created = []
+    for index in model.__table__.indexes:
+        if index.name not in existing:
+            index.create(bind=db.engine, checkfirst=True)
+            created.append(index.name)
+    return created
@@ -0,0 +1,42 @@
+from sqlalchemy.sql import func
+from models import db
+from services.airport_data import AIRPORT_FIELDS
+
+class Airport(db.Model):
+    __tablename__ = 'airports'
+
+    code = db.Column(db.String(3), primary_key=True)
+    name = db.Column(db.String(200), nullable=False)
+    city = db.Column(db.String(100), nullable=False)
+    country = db.Column(db.String(100), nullable=False)
+    lat = db.Column(db.Float, nullable=False)
+    lon = db.Column(db.Float, nullable=False)
+    region = db.Column(db.String(50), nullable=False)
+    updated_at = db.Column(db.DateTime, default=func.now(), onupdate=func.now())
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in AIRPORT_FIELDS}
+
+    @classmethod
+    def bulk_upsert(cls, airports):
+        """Insert or update every airport in one INSERT ... ON CONFLICT statement.
+
+        Works on SQLite and PostgreSQL. The caller commits.
+        """
+        if not airports:
+            return 0
+        if db.engine.dialect.name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        statement = insert(cls.__table__).values([
+            {field: airport[field] for field in AIRPORT_FIELDS} for airport in airports
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=['code'],
+            set_={**{field: statement.excluded[field] for field in AIRPORT_FIELDS if field != 'code'},
+                  'updated_at': func.now()}
+        )
+        db.session.execute(statement)
+        return len(airports)
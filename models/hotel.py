@@ -0,0 +1,138 @@
+from datetime import datetime, timezone
+from sqlalchemy import and_, or_
+from sqlalchemy.sql import func
+from models import db
+
+HOTEL_FIELDS = ('name', 'city', 'country', 'category', 'price_range', 'price_level',
+                'airport_distance', 'has_stayed', 'rating', 'notes', 'website')
+
+class Hotel(db.Model):
+    __tablename__ = 'hotels'
+    __table_args__ = (
+        db.UniqueConstraint('name', 'city', name='uq_hotels_name_city'),
+        db.Index('ix_hotels_rating', 'rating', 'name'),
+        db.Index('ix_hotels_price_level', 'price_level', 'rating'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), nullable=False)
+    city = db.Column(db.String(100), nullable=False)
+    country = db.Column(db.String(100), nullable=False)
+    category = db.Column(db.String(50), nullable=False, default='')
+    price_range = db.Column(db.String(20), nullable=False, default='')
+    # Dollar signs in price_range, averaged for ranges like '$$-$$$', for sorting
+    price_level = db.Column(db.Float, nullable=False, default=0)
+    airport_distance = db.Column(db.String(50), nullable=False, default='')
+    has_stayed = db.Column(db.Boolean, nullable=False, default=False)
+    rating = db.Column(db.Float, nullable=False)
+    notes = db.Column(db.Text, nullable=False, default='')
+    website = db.Column(db.String(500), nullable=False, default='')
+    review_id = db.Column(db.Integer, db.ForeignKey('reviews.id'), nullable=True, index=True)
+    created_at = db.Column(db.DateTime, default=func.now())
+    updated_at = db.Column(db.DateTime, default=func.now(), onupdate=func.now())
+
+    review = db.relationship('Review', backref=db.backref('hotels', lazy='dynamic'))
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'city': self.city,
+            'country': self.country,
+            'category': self.category,
+            'priceRange': self.price_range,
+            'airportDistance': self.airport_distance,
+            'hasStayed': self.has_stayed,
+            'rating': self.rating,
+            'notes': self.notes,
+            'website': self.website
+        }
+
+    @classmethod
+    def bulk_upsert(cls, hotels):
+        """Insert or update hotels, matched on name and city, in one INSERT ... ON CONFLICT statement.
+
+        Works on SQLite and PostgreSQL. The caller commits.
+        """
+        if not hotels:
+            return 0
+        if db.engine.dialect.name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        # Set here rather than by func.now(), which SQLite stores to the second, so
+        # two loads within one second still change the table version readers cache on
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        statement = insert(cls.__table__).values([
+            {**{field: hotel[field] for field in HOTEL_FIELDS}, 'updated_at': now} for hotel in hotels
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=['name', 'city'],
+            set_={**{field: statement.excluded[field] for field in HOTEL_FIELDS if field not in ('name', 'city')},
+                  'updated_at': now}
+        )
+        db.session.execute(statement)
+        return len(hotels)
+
+    @staticmethod
+    def table_version():
+        """Changes whenever hotels are loaded, updated or removed"""
+        count, updated_at = db.session.query(func.count(Hotel.id), func.max(Hotel.updated_at)).one()
+        return f"{count}:{updated_at.isoformat() if updated_at else ''}"
+
+    @staticmethod
+    def sort_columns(sort):
+        """(column, descending) pairs for a named sort; the id makes every ordering total."""
+        columns = {
+            'rating': [(Hotel.rating, True), (Hotel.name, False)],
+            'name': [(Hotel.name, False), (Hotel.city, False)],
+            'price': [(Hotel.price_level, False), (Hotel.rating, True)],
+            'price_desc': [(Hotel.price_level, True), (Hotel.rating, True)],
+            'country': [(Hotel.country, False), (Hotel.rating, True)],
+        }.get(sort)
+        return columns + [(Hotel.id, False)] if columns else None
+
+    @staticmethod
+    def search(filters=None, exclude_countries=None, stayed=None, min_rating=None):
+        """Filtered and ordered query; ``filters`` maps country, city, category or price_range to accepted values."""
+        query = Hotel.query
+        for field, values in (filters or {}).items():
+            column = getattr(Hotel, field)
+            if field == 'price_range':
+                query = query.filter(column.in_(values))
+            else:
+                query = query.filter(func.lower(column).in_([value.lower() for value in values]))
+        if exclude_countries:
+            query = query.filter(func.lower(Hotel.country).notin_([country.lower() for country in exclude_countries]))
+        if stayed is not None:
+            query = query.filter(Hotel.has_stayed == stayed)
+        if min_rating is not None:
+            query = query.filter(Hotel.rating >= min_rating)
+        return query
+
+    @staticmethod
+    def after(query, sort, key):
+        """Keyset condition: rows that sort strictly after ``key`` in ``sort`` order."""
+        columns = Hotel.sort_columns(sort)
+        clauses = []
+        for position, (column, descending) in enumerate(columns):
+            tie = [columns[i][0] == key[i] for i in range(position)]
+            step = column < key[position] if descending else column > key[position]
+            clauses.append(and_(*tie, step))
+        return query.filter(or_(*clauses))
+
+    def sort_key(self, sort):
+        """This row's values for the sort columns, as stored in a cursor."""
+        values = {
+            'rating': [self.rating, self.name],
+            'name': [self.name, self.city],
+            'price': [self.price_level, self.rating],
+            'price_desc': [self.price_level, self.rating],
+            'country': [self.country, self.rating],
+        }[sort]
+        return values + [self.id]
+
+# Case-insensitive filters compare lower(column), so index those expressions
+db.Index('ix_hotels_country_lower', func.lower(Hotel.country))
+db.Index('ix_hotels_category_lower', func.lower(Hotel.category))
+db.Index('ix_hotels_city_lower', func.lower(Hotel.city))
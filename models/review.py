@@ -1,12 +1,73 @@
 from datetime import datetime
+from functools import lru_cache
+from sqlalchemy import and_, case, event, literal_column, or_
+from sqlalchemy.orm import load_only
 from sqlalchemy.sql import func
 from models import db
 from slugify import slugify
+import hashlib
+import json
 import markdown
 import bleach
 
+# Bump when the markdown extensions or the allow-lists change so stored HTML is re-rendered
+RENDER_VERSION = 1
+# Reviews rendered on the fly per worker while their stored HTML is missing or stale
+RENDER_CACHE_SIZE = 64
+
+ALLOWED_TAGS = [
+    'a', 'abbr', 'acronym', 'b', 'blockquote', 'code', 'em', 'i', 'li', 'ol', 
+    'p', 'strong', 'ul', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'img', 'br', 'hr',
+    'div', 'span', 'pre'
+]
+ALLOWED_ATTRS = {
+    '*': ['class', 'id'],
+    'a': ['href', 'rel', 'target'],
+    'img': ['src', 'alt', 'title', 'width', 'height']
+}
+
+# Columns written by bulk imports; slug identifies the review
+IMPORT_FIELDS = ('title', 'slug', 'location', 'summary', 'content', 'image', 'author', 'is_published',
+                 'rendered_html', 'content_hash', 'created_at', 'updated_at')
+
+# Imported columns whose change counts as a new revision of the review
+REVISION_FIELDS = ('title', 'location', 'summary', 'content', 'image', 'author', 'is_published')
+
+# Columns list views need; everything except the large content and rendered_html
+LISTING_COLUMNS = ('id', 'title', 'slug', 'location', 'summary', 'author', 'image',
+                   'created_at', 'updated_at', 'is_published')
+
+# Columns that together identify the version of a rendered review page
+PAGE_VERSION_COLUMNS = ('updated_at', 'created_at', 'content_hash', 'title', 'location', 'summary',
+                        'image', 'author')
+
+# SQLite stores created_at as text with microseconds when Python sets it but
+# without them when func.now() does, so keyset pages compare this fixed format
+SQLITE_TIME_FORMAT = '%Y-%m-%d %H:%M:%f'
+# SQLite only uses an index on an expression when the query repeats it exactly,
+# with the format as a literal rather than a bound parameter
+SQLITE_CREATED_KEY = f"strftime('{SQLITE_TIME_FORMAT}', created_at)"
+SQLITE_KEYSET_INDEX = 'ix_reviews_published_created_key'
+
+def render_markdown(content):
+    """Convert markdown content to HTML with sanitization"""
+    html = markdown.markdown(content or '', extensions=['extra'])
+    return bleach.clean(html, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRS)
+
+def content_hash(content):
+    """Hash of the markdown source and renderer version that stored HTML was made from"""
+    return hashlib.sha256(f"{RENDER_VERSION}:{content or ''}".encode('utf-8')).hexdigest()
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render_cached(digest, content):
+    return render_markdown(content)
+
 class Review(db.Model):
     __tablename__ = 'reviews'
+    __table_args__ = (
+        # Serves the newest-first published listing and its keyset pagination
+        db.Index('ix_reviews_published_created', 'is_published', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -19,6 +80,9 @@ class Review(db.Model):
     created_at = db.Column(db.DateTime, default=func.now())
     updated_at = db.Column(db.DateTime, default=func.now(), onupdate=func.now())
     is_published = db.Column(db.Boolean, default=True)
+    # Sanitized HTML rendered when the review is saved, and the content_hash it was rendered from
+    rendered_html = db.Column(db.Text)
+    content_hash = db.Column(db.String(64))
     
     def __init__(self, title, location, summary, content, image=None, author="Go Ask Marshall"):
         self.title = title
@@ -29,21 +93,69 @@ class Review(db.Model):
         self.author = author
         self.slug = slugify(title)
     
+    def render(self):
+        """Render and store the HTML for the current content"""
+        self.rendered_html = render_markdown(self.content)
+        self.content_hash = content_hash(self.content)
+
+    @property
+    def needs_render(self):
+        return not self.rendered_html or self.content_hash != content_hash(self.content)
+
     @property
     def html_content(self):
-        """Convert markdown content to HTML with sanitization"""
-        allowed_tags = [
-            'a', 'abbr', 'acronym', 'b', 'blockquote', 'code', 'em', 'i', 'li', 'ol', 
-            'p', 'strong', 'ul', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'img', 'br', 'hr',
-            'div', 'span', 'pre'
-        ]
-        allowed_attrs = {
-            '*': ['class', 'id'],
-            'a': ['href', 'rel', 'target'],
-            'img': ['src', 'alt', 'title', 'width', 'height']
-        }
-        html = markdown.markdown(self.content, extensions=['extra'])
-        return bleach.clean(html, tags=allowed_tags, attributes=allowed_attrs)
+        """Sanitized HTML for the content, from the stored copy when it is current"""
+        digest = content_hash(self.content)
+        if self.rendered_html and self.content_hash == digest:
+            return self.rendered_html
+        return _render_cached(digest, self.content)
+    
+    @classmethod
+    def bulk_upsert(cls, reviews, update=True):
+        """Insert reviews in one INSERT ... ON CONFLICT (slug) statement.
+
+        Existing reviews are updated, keeping their created_at, or left alone
+        when ``update`` is False. An update whose content_hash matches the
+        stored one keeps the stored HTML, so unchanged reviews can be sent
+        without rendering them, and one that changes none of the shown fields
+        keeps its updated_at, so its Last-Modified, ETag and cached page stay
+        valid. Each dict needs every IMPORT_FIELDS key.
+        Works on SQLite and PostgreSQL. The caller commits.
+        """
+        if not reviews:
+            return 0
+        if db.engine.dialect.name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        statement = insert(cls.__table__).values([
+            {field: review[field] for field in IMPORT_FIELDS} for review in reviews
+        ])
+        if update:
+            table = cls.__table__
+            set_ = {field: statement.excluded[field] for field in IMPORT_FIELDS if field not in ('slug', 'created_at')}
+            set_['rendered_html'] = case(
+                (table.c.content_hash == statement.excluded.content_hash, table.c.rendered_html),
+                else_=statement.excluded.rendered_html
+            )
+            # content is compared itself since imports that defer rendering send no content_hash
+            unchanged = and_(*[table.c[field].is_not_distinct_from(statement.excluded[field])
+                               for field in REVISION_FIELDS])
+            set_['updated_at'] = case((unchanged, table.c.updated_at), else_=statement.excluded.updated_at)
+            statement = statement.on_conflict_do_update(index_elements=['slug'], set_=set_)
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=['slug'])
+        db.session.execute(statement)
+        return len(reviews)
+
+    @staticmethod
+    def content_hashes(slugs):
+        """{slug: content_hash} for those of ``slugs`` already in the table, in one query"""
+        if not slugs:
+            return {}
+        rows = db.session.query(Review.slug, Review.content_hash).filter(Review.slug.in_(list(slugs)))
+        return {row.slug: row.content_hash for row in rows}
     
     @staticmethod
     def get_all_published():
@@ -57,6 +169,65 @@ class Review(db.Model):
             return None
         return Review.query.filter_by(slug=slug, is_published=True).first()
     
+    @staticmethod
+    def listing_query():
+        """All reviews newest first, loading only the listing columns"""
+        return Review.query.options(load_only(*[getattr(Review, column) for column in LISTING_COLUMNS])) \
+            .order_by(Review.created_at.desc(), Review.id.desc())
+
+    @staticmethod
+    def created_key():
+        """created_at in a form that sorts and compares the same for every stored row"""
+        if db.engine.dialect.name == 'sqlite':
+            return func.strftime(literal_column(f"'{SQLITE_TIME_FORMAT}'"), Review.created_at)
+        return Review.created_at
+
+    @staticmethod
+    def add_keyset_index():
+        """Index published_page's SQLite sort expression on an existing table; returns True when added"""
+        if db.engine.dialect.name != 'sqlite':
+            return False
+        with db.engine.begin() as connection:
+            exists = connection.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (SQLITE_KEYSET_INDEX,)
+            ).first() is not None
+            if not exists:
+                _create_keyset_index(Review.__table__, connection)
+        return not exists
+
+    @staticmethod
+    def published_page(columns=LISTING_COLUMNS, limit=None, after=None):
+        """Published reviews newest first as rows of ``columns`` plus ``created_key``
+
+        ``after`` is the (created_key, id) of the last row of the previous page.
+        """
+        created_key = Review.created_key()
+        query = db.session.query(*[getattr(Review, column) for column in columns], created_key.label('created_key')) \
+            .filter(Review.is_published == True)
+        if after:
+            key, review_id = after
+            query = query.filter(or_(created_key < key, and_(created_key == key, Review.id < review_id)))
+        query = query.order_by(created_key.desc(), Review.id.desc())
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+    
+    @staticmethod
+    def get_last_modified(slug):
+        """(found, last modified time, version) for a published review, without loading its content
+
+        updated_at only has second precision, so the version also covers the
+        content_hash and the other fields the review page shows.
+        """
+        if not slug:
+            return False, None, None
+        row = db.session.query(*[getattr(Review, column) for column in PAGE_VERSION_COLUMNS]) \
+            .filter_by(slug=slug, is_published=True).first()
+        if row is None:
+            return False, None, None
+        fingerprint = json.dumps(list(row), default=str)
+        return True, row.updated_at or row.created_at, hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[:32]
+    
     @staticmethod
     def get_by_id(id):
         """Get a review by its ID with error handling"""
@@ -66,3 +237,18 @@ class Review(db.Model):
             # Log the error but don't crash
             print(f"Error retrieving review with ID {id}: {str(e)}")
             return None
+
+@event.listens_for(Review.__table__, 'after_create')
+def _create_keyset_index(table, connection, **kw):
+    """The (is_published, created_key, id) index; the column index serves other databases"""
+    if connection.dialect.name == 'sqlite':
+        connection.exec_driver_sql(
+            f"CREATE INDEX IF NOT EXISTS {SQLITE_KEYSET_INDEX} ON reviews (is_published, {SQLITE_CREATED_KEY}, id)"
+        )
+
+@event.listens_for(Review, 'before_insert')
+@event.listens_for(Review, 'before_update')
+def _render_on_save(mapper, connection, review):
+    """Keep the stored HTML in step with the content on every write path"""
+    if review.needs_render:
+        review.render()
@@ -1,7 +1,7 @@
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
 import os
 import re
-from openai import OpenAI
 from dotenv import load_dotenv
 
 class TripValidationError(Exception):
@@ -11,21 +11,91 @@ class TripValidationError(Exception):
 from flask_login import current_user
 from models import PointsProgram
 from flask import current_app
+from services.llm_providers import LLMProvider, get_llm_provider
+from services.plan_cache import plan_cache, make_cache_key
+from services.plan_parser import parse_travel_plan
+from services.plan_validator import plan_validator
+from services.resilience import llm_resilience, EmptyCompletionError
+from services.scenario_sweep import format_candidates, format_reachable, parse_travel_months, scenario_sweep
+from services.single_flight import SingleFlight
+from services.transfer_graph import transfer_graph
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Longer than the model timeout so a lease outlives the call it guards
+PLAN_LEASE_SECONDS = 150
+
+# Coalesces identical trip requests that are in flight in this worker
+plan_requests = SingleFlight()
+
+# Fan-out mode: one concurrent, shorter completion per destination
+FAN_OUT_ENABLED = os.getenv('TRIP_FAN_OUT', 'false').lower() in ('1', 'true', 'yes')
+FAN_OUT_DESTINATIONS = 2
+FAN_OUT_MAX_TOKENS = 2000
+DESTINATION_HEADER_RE = re.compile(r'DESTINATION\s+\d+\s*-')
+
+# Candidate sweep: destinations pre-ranked against the balances before prompting
+CANDIDATE_SWEEP_ENABLED = os.getenv('TRIP_CANDIDATE_SWEEP', 'true').lower() in ('1', 'true', 'yes')
+CANDIDATE_COUNT = int(os.getenv('TRIP_CANDIDATE_COUNT', 6))
+
+def is_cacheable(result: Dict) -> bool:
+    """Whether a plan may be served again: complete, and not left invalid by validation.
+
+    Resubmitting is the user's remedy for a bad plan, so a plan that still
+    has unresolved problems must not come back as a cache hit.
+    """
+    if result.get('partial'):
+        return False
+    return result.get('validation', {}).get('status') != 'invalid'
+
+class PlanStream:
+    """Text chunks of a streamed plan.
+
+    Once the chunks have been read, ``finish()`` validates the full text
+    and returns the plan in the same shape generate_travel_plan returns.
+    """
+
+    def __init__(self, chunks: Iterator[str], finish=None, result: Optional[Dict] = None):
+        self._chunks = chunks
+        self._finish = finish
+        self._parts = []
+        self.result = result
+
+    def __iter__(self) -> Iterator[str]:
+        for chunk in self._chunks:
+            self._parts.append(chunk)
+            yield chunk
+
+    def finish(self) -> Optional[Dict]:
+        if self._finish:
+            self.result = self._finish(''.join(self._parts).strip())
+            self._finish = None
+        return self.result
+
+def parse_points_balance(name: str, balance) -> int:
+    """A balance sent by the client as a whole number of points; raises TripValidationError otherwise."""
+    if balance is None or balance == '':
+        return 0
+    if isinstance(balance, str) and balance.strip().isdigit():
+        return int(balance)
+    if isinstance(balance, int) and not isinstance(balance, bool) and balance >= 0:
+        return balance
+    raise TripValidationError(f"Points balance for {name} must be a whole number of points")
+
 class TravelPlanGenerator:
-    def __init__(self):
-        # Initialize OpenAI client
-        api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
-            raise ValueError("OpenAI API key not found in environment variables")
-        self.client = OpenAI(api_key=api_key)
+    def __init__(self, fan_out: Optional[bool] = None, provider: Optional[LLMProvider] = None):
+        # Completion backend chosen by LLM_PROVIDER; the OpenAI one reuses the worker's pooled client
+        self.provider = provider or get_llm_provider()
+        # Fan-out mode requests each destination concurrently instead of in one long completion
+        self.fan_out = FAN_OUT_ENABLED if fan_out is None else fan_out
         
-    def _get_system_prompt(self, trip_data: Dict) -> str:
-        """Construct the system prompt for the GPT model."""
-        # Format must be exact for frontend parsing
+    def get_points_balances(self, trip_data: Dict) -> Dict:
+        """Resolve the points balances to plan against for the current user.
+
+        Reads current_user, so callers that plan outside the request (such as
+        background jobs) resolve the balances first and pass them in.
+        """
         points_balances = {}
         
         # Get points balances from database for authenticated users
@@ -40,14 +110,119 @@ class TravelPlanGenerator:
                 points_balances = {}
         # Get points balances from trip data for anonymous users
         else:
-            try:
-                points_balances = {
-                    program['program_name']: program['points_balance']
-                    for program in trip_data.get('points_programs', [])
-                }
-            except Exception as e:
-                print(f"Error getting points from trip data: {e}")
-                points_balances = {}
+            programs = trip_data.get('points_programs') or []
+            if not isinstance(programs, list) or not all(isinstance(program, dict) for program in programs):
+                raise TripValidationError("Points programs must be a list of program names and balances")
+            for program in programs:
+                name = program.get('program_name')
+                if name:
+                    points_balances[name] = parse_points_balance(name, program.get('points_balance'))
+        return points_balances
+
+    def _get_fan_out_hint(self, trip_data: Dict, destination_index: int) -> str:
+        """Steer each concurrent single-destination request away from the other's pick."""
+        try:
+            split_hours = float(trip_data.get('max_flight_length')) / 2
+        except (TypeError, ValueError):
+            split_hours = None
+
+        if destination_index == 1:
+            scope = (f"reachable in {split_hours:g} hours of flying or less"
+                     if split_hours else "relatively close to the departure airport(s)")
+            other = "longer flights"
+        else:
+            scope = (f"that needs more than {split_hours:g} hours of flying"
+                     if split_hours else "farther away, in a different region")
+            other = "shorter flights"
+        return f"""
+PLANNER COORDINATION:
+Another planner is preparing the other destination for this traveler at the same time and covers {other}.
+Choose the best-matching destination {scope}. If the special requests make that impossible, choose the
+best match that is still in a different country from the most obvious choice.
+"""
+
+    def _get_repair_note(self, name: Optional[str], problems: List[Dict], other_names: List[str]) -> str:
+        """Tell a single-destination request what was wrong with the version it replaces."""
+        problem_lines = "\n".join(f"- {problem['message']}" for problem in problems)
+        keep = (f"Keep {name} if it can satisfy every requirement; otherwise choose a different destination."
+                if name else "Choose a destination that satisfies every requirement.")
+        avoid = f"\nDo not choose {', '.join(other_names)}, which is already in the plan." if other_names else ""
+        return f"""
+PLAN REPAIR:
+A previous version of this destination was rejected for these problems:
+{problem_lines}
+{keep}{avoid}
+"""
+
+    def _get_flight_limits(self, trip_data: Dict) -> Dict:
+        """Departure airports and maximum flight length in hours, when the request sets one."""
+        try:
+            max_flight_hours = float(trip_data.get('max_flight_length') or 0) or None
+        except (TypeError, ValueError):
+            max_flight_hours = None
+        return {'origins': trip_data.get('airports', []), 'max_flight_hours': max_flight_hours}
+
+    def _get_reachable_section(self, trip_data: Dict) -> str:
+        """Prompt section listing known destinations within the maximum flight length."""
+        limits = self._get_flight_limits(trip_data)
+        max_flight_hours = limits['max_flight_hours']
+        if not max_flight_hours:
+            return ""
+        destinations = scenario_sweep.within(limits['origins'], max_flight_hours)
+        if not destinations:
+            return ""
+        return f"""
+DESTINATIONS WITHIN {max_flight_hours:g} HOURS OF THE DEPARTURE AIRPORTS (great-circle estimate; do not suggest anywhere farther):
+{format_reachable(destinations)}
+"""
+
+    def _get_candidate_section(self, trip_data: Dict, points_balances: Dict) -> str:
+        """Prompt section listing destinations the sweep estimates the balances can fund."""
+        if not CANDIDATE_SWEEP_ENABLED or not points_balances:
+            return ""
+        limits = self._get_flight_limits(trip_data)
+        try:
+            nights = max(int(trip_data.get('trip_length') or 7) - 1, 1)
+            candidates = scenario_sweep.top_candidates(
+                limits['origins'],
+                points_balances,
+                months=parse_travel_months(trip_data.get('travel_months')),
+                trip_types=trip_data.get('trip_types', []),
+                nights=nights,
+                max_flight_hours=limits['max_flight_hours'],
+                limit=CANDIDATE_COUNT
+            )
+        except Exception as e:
+            print(f"Candidate sweep failed: {str(e)}")
+            return ""
+        if not candidates:
+            return ""
+        return f"""
+PRE-RANKED CANDIDATES (estimated to fit the balances, flight limit and travel months; prefer these unless the special requests rule them out):
+{format_candidates(candidates)}
+"""
+
+    def _get_system_prompt(self, trip_data: Dict, points_balances: Optional[Dict] = None,
+                           destination_index: Optional[int] = None, repair_note: Optional[str] = None) -> str:
+        """Construct the system prompt for the GPT model.
+
+        With ``destination_index`` the prompt asks for that single destination
+        only, for use by fan-out mode and by plan repair (``repair_note``).
+        """
+        # Format must be exact for frontend parsing
+        if points_balances is None:
+            points_balances = self.get_points_balances(trip_data)
+
+        if destination_index is None:
+            first_index = 1
+            destination_rule = "5. Show exactly 2 destinations that match all special requests"
+            repeat_instruction = "[Repeat exact format for DESTINATION 2]"
+            fan_out_hint = ""
+        else:
+            first_index = destination_index
+            destination_rule = "5. Show exactly 1 destination that matches all special requests"
+            repeat_instruction = ""
+            fan_out_hint = repair_note or self._get_fan_out_hint(trip_data, destination_index)
                 
         special_requests = trip_data.get('preferences', 'None specified').strip()
         special_requests_emphasis = f"""
@@ -65,7 +240,7 @@ These special requests must be followed for all destination suggestions:
 AVAILABLE POINTS:
 {self._format_points_balances(points_balances)}
 
-{special_requests_emphasis}
+{special_requests_emphasis}{fan_out_hint}
 
 TRIP REQUIREMENTS:
 - Departure Airport(s): {', '.join(trip_data['airports'])}
@@ -73,13 +248,13 @@ TRIP REQUIREMENTS:
 - Preferred Travel Time: {trip_data['travel_months']} ({trip_data['trip_length']} days)
 - Maximum Flight Length: {trip_data['max_flight_length']} hours
 - Direct Flights Only: {'Yes' if trip_data.get('direct_flights') else 'No'}
-
+{self._get_reachable_section(trip_data)}
 REQUIREMENTS:
 1. All point calculations must be accurate and within available balances
 2. Economy and luxury options must be different
 3. Luxury options must include premium economy, business or first class flights
 4. Fare Type must be clearly specified for all flights
-5. Show exactly 2 destinations that match all special requests
+{destination_rule}
 6. All point calculations must be for round trip flights per person
 7. Consider seasonal factors for each destination:
     - Weather patterns and best times to visit
@@ -99,30 +274,12 @@ POINTS USAGE PRIORITY (STRICT ORDER):
    - Only if options 1 and 2 not possible
    - Calculate at 2.0 cents per point value
 
-VERIFIED TRANSFER PARTNERSHIPS (STRICT - DO NOT SUGGEST OTHERS):
-Chase Ultimate Rewards:
-- Airlines: United, Southwest, Air Canada, British Airways, Air France/KLM, Virgin Atlantic, Emirates, Singapore Airlines, Iberia, Aer Lingus
-- Hotels: Hyatt, IHG, Marriott
-
-Amex Membership Rewards:
-- Airlines: Delta, Air Canada, British Airways, Air France/KLM, Emirates, JetBlue, Singapore Airlines, Virgin Atlantic, ANA, Cathay Pacific, Etihad, Hawaiian
-- Hotels: Hilton, Marriott, Choice
-
-Capital One:
-- Airlines: Air Canada, Air France/KLM, British Airways, Emirates, Singapore Airlines, Turkish Airlines, Virgin Red, TAP Air Portugal
-- Hotels: Wyndham, Choice
-
-Citi ThankYou:
-- Airlines: Air France/KLM, Emirates, Singapore Airlines, Virgin Atlantic, Turkish Airlines, Qatar Airways, Etihad, EVA Air
-- Hotels: Choice
-
-POINT VALUES (cpp):
-- Credit Cards: Chase 2.05, Amex 2.0, Capital One 1.85
-- Hotels: Hilton 0.6, Marriott 0.8, Hyatt 1.7
-- Airlines: Air Canada 1.5, Alaska 1.45, American 1.65, Delta 1.2, Flying Blue 1.3, JetBlue 1.3, Southwest 1.35, United 1.35
+VERIFIED TRANSFER OPTIONS FOR THESE BALANCES (STRICT - DO NOT SUGGEST OTHERS; RATIOS AND TOTALS ARE PRECOMPUTED):
+{transfer_graph.format_for_prompt(points_balances)}
+{self._get_candidate_section(trip_data, points_balances)}
 
 START YOUR RESPONSE WITH THE FOLLOWING FORMAT EXACTLY:
-DESTINATION 1 - [City, Country]:
+DESTINATION {first_index} - [City, Country]:
 
 DESTINATION SUMMARY:
 [2-3 sentences about why this destination is an excellent match for the requested travel time and trip style]
@@ -197,7 +354,7 @@ Value Analysis:
 - <b>Hotel</b>: [X points] ([Program name])
 - <b>Dollar Value Saved</b>: [Approx. $X]
 
-[Repeat exact format for DESTINATION 2]
+{repeat_instruction}
 
 IMPORTANT FORMATTING NOTES:
 1. Do NOT use any markdown formatting (no **, *, or other symbols)
@@ -205,7 +362,7 @@ IMPORTANT FORMATTING NOTES:
 3. Keep the exact section headers as shown
 4. ALWAYS include the full DESTINATION SUMMARY and Why We Recommend This Destination sections
 5. Always show points as "round trip per person" for flights
-6. Start IMMEDIATELY with "DESTINATION 1" - no introduction or preamble
+6. Start IMMEDIATELY with "DESTINATION {first_index}" - no introduction or preamble
 7. Make sure each destination recommendation addresses ALL user requirements"""
 
     def _format_points_balances(self, points_balances):
@@ -233,54 +390,195 @@ IMPORTANT FORMATTING NOTES:
 9. ALL point calculations must be for ROUND TRIP flights PER PERSON
 10. NEVER exceed available point balances"""
 
-    def generate_travel_plan(self, trip_data: Dict) -> Dict:
-        """Generate a travel plan based on user input."""
-        max_retries = 2
-        current_retry = 0
-        last_error = None
+    def _build_messages(self, trip_data: Dict, points_balances: Optional[Dict] = None,
+                        destination_index: Optional[int] = None, repair_note: Optional[str] = None) -> List[Dict]:
+        """Build the chat messages sent to the model for a trip request."""
+        return [
+            {"role": "system", "content": self._get_system_prompt(trip_data, points_balances, destination_index, repair_note)},
+            {"role": "user", "content": "Generate travel recommendations based on the provided parameters."}
+        ]
+
+    def generate_travel_plan(self, trip_data: Dict, use_cache: bool = True,
+                             points_balances: Optional[Dict] = None) -> Dict:
+        """Generate a travel plan based on user input, serving repeats from the plan cache.
+
+        Pass ``points_balances`` when running outside the user's request, since
+        they cannot be resolved from ``current_user`` there.
+        """
+        if points_balances is None:
+            points_balances = self.get_points_balances(trip_data)
+        cache_key = self._lookup_cache_key(trip_data, points_balances, use_cache)
+        if cache_key:
+            cached = plan_cache.get(cache_key)
+            if cached is not None:
+                return {**cached, 'cached': True}
+
+        # Identical requests already in flight share a single model call; cache bypasses
+        # only coalesce with each other so cacheable requests still populate the cache
+        flight_key = cache_key or 'fresh:' + make_cache_key(trip_data, points_balances)
+        result, shared = plan_requests.do(
+            flight_key, lambda: self._generate_uncached(trip_data, points_balances, cache_key)
+        )
+        return {**result, 'coalesced': True} if shared else result
+
+    def _generate_uncached(self, trip_data: Dict, points_balances: Dict, cache_key: Optional[str]) -> Dict:
+        """Generate a plan, letting only one worker on the host call the model for a given cache key."""
+        if not cache_key:
+            return self._request_travel_plan(trip_data, points_balances)
+
+        lease = plan_cache.acquire_lease(cache_key, ttl=PLAN_LEASE_SECONDS)
+        if lease is None:
+            # Another worker is generating this exact plan; wait for it to land in the cache
+            cached = plan_cache.wait_for(cache_key, timeout=PLAN_LEASE_SECONDS)
+            if cached is not None:
+                return {**cached, 'cached': True}
+
+        try:
+            result = self._request_travel_plan(trip_data, points_balances)
+            # A partial or still-invalid plan is returned but not cached
+            if is_cacheable(result):
+                plan_cache.set(cache_key, result)
+            return result
+        finally:
+            plan_cache.release_lease(cache_key, lease)
+
+    def _lookup_cache_key(self, trip_data: Dict, points_balances: Dict, use_cache: bool) -> Optional[str]:
+        """Return the cache key for a request, or None when the cache should be skipped."""
+        if not plan_cache.enabled:
+            return None
+        if not use_cache:
+            plan_cache.record_bypass()
+            return None
+        return make_cache_key(trip_data, points_balances)
+
+    def _request_travel_plan(self, trip_data: Dict, points_balances: Dict) -> Dict:
+        """Request a travel plan from the model, one completion per destination in fan-out mode."""
+        if self.fan_out:
+            return self._request_fan_out_plan(trip_data, points_balances)
+
+        content = self._request_completion(self._build_messages(trip_data, points_balances), max_tokens=4000)
+        return self._validate_plan({
+            'success': True,
+            'result': content,
+            'plan': parse_travel_plan(content)
+        }, trip_data, points_balances)
+
+    def _request_fan_out_plan(self, trip_data: Dict, points_balances: Dict) -> Dict:
+        """Request each destination concurrently and merge them into the usual response shape.
+
+        If one destination fails the others are still returned, flagged as partial.
+        """
+        with ThreadPoolExecutor(max_workers=FAN_OUT_DESTINATIONS) as executor:
+            futures = [
+                executor.submit(
+                    self._request_completion,
+                    self._build_messages(trip_data, points_balances, destination_index),
+                    FAN_OUT_MAX_TOKENS
+                )
+                for destination_index in range(1, FAN_OUT_DESTINATIONS + 1)
+            ]
 
-        while current_retry < max_retries:
+        sections = []
+        errors = []
+        last_error = None
+        for destination_index, future in enumerate(futures, start=1):
             try:
-                # Set a timeout for the API call
-                response = self.client.chat.completions.create(
-                    model="gpt-4o-mini",  # Use the mini model for faster responses while maintaining quality
-                    messages=[
-                        {"role": "system", "content": self._get_system_prompt(trip_data)},
-                        {"role": "user", "content": "Generate travel recommendations based on the provided parameters."}
-                    ],
-                    temperature=0.7,  # Slightly higher temperature for more diverse suggestions
-                    max_tokens=4000,
-                    timeout=120  # 2 minute timeout
-                )
-            
-                try:
-                    content = response.choices[0].message.content.strip()
-                    
-                    # Basic validation of the response format
-                    if not content:
-                        raise ValueError("Empty response received")
-                        
-                    return {
-                        'success': True,
-                        'result': content
-                    }
-                    
-                except (AttributeError, IndexError) as e:
-                    print(f"Error parsing AI response: {str(e)}")
-                    raise ValueError("Error parsing AI response")
-                    
+                sections.append(future.result())
             except Exception as e:
+                print(f"Destination {destination_index} generation failed: {str(e)}")
+                errors.append({'destination': destination_index, 'error': str(e)})
                 last_error = e
-                current_retry += 1
-                print(f"Attempt {current_retry} failed: {str(e)}")
-                if current_retry < max_retries:
-                    print(f"Retrying... ({current_retry}/{max_retries})")
-                    continue
-                
-                # If we've exhausted all retries, raise the last error
-                if isinstance(last_error, TimeoutError):
-                    raise TimeoutError("The request is taking longer than expected. Please try again.")
-                elif isinstance(last_error, ValueError):
-                    raise ValueError(str(last_error))
-                else:
-                    raise Exception("A temporary error occurred. Please try again.")
+
+        if not sections:
+            raise last_error
+
+        # Number the surviving destinations in order so the response reads like a normal plan
+        content = "\n\n".join(
+            DESTINATION_HEADER_RE.sub(f"DESTINATION {position} -", section, count=1)
+            for position, section in enumerate(sections, start=1)
+        )
+        result = {
+            'success': True,
+            'result': content,
+            'plan': parse_travel_plan(content)
+        }
+        if errors:
+            result['partial'] = True
+            result['errors'] = errors
+        return self._validate_plan(result, trip_data, points_balances)
+
+    def _validate_plan(self, result: Dict, trip_data: Dict, points_balances: Dict) -> Dict:
+        """Repair a generated plan locally, regenerating only destinations that cannot be fixed."""
+        if not plan_validator.enabled:
+            return result
+
+        def regenerate(position, name, problems, other_names):
+            messages = self._build_messages(trip_data, points_balances, position,
+                                            self._get_repair_note(name, problems, other_names))
+            return self._request_completion(messages, FAN_OUT_MAX_TOKENS)
+
+        review = plan_validator.review(result['result'], points_balances, regenerate,
+                                       **self._get_flight_limits(trip_data))
+        if not review['text']:
+            return {**result, 'validation': review['validation']}
+        validated = {**result, 'result': review['text'], 'plan': review['plan'], 'validation': review['validation']}
+        # A destination lost in fan-out mode and regenerated here completes the plan
+        if validated.get('partial') and len(review['plan']['destinations']) >= FAN_OUT_DESTINATIONS:
+            validated.pop('partial')
+            validated.pop('errors', None)
+        return validated
+
+    def _request_completion(self, messages: List[Dict], max_tokens: int) -> str:
+        """Request a single completion and return its text.
+
+        Retries, backoff and fail-fast behaviour during provider incidents come
+        from the shared resilience layer.
+        """
+        def create_completion():
+            content = self.provider.complete(messages, max_tokens=max_tokens, temperature=0.7, timeout=120)
+            # Basic validation of the response format
+            if not content:
+                raise EmptyCompletionError("Empty response received")
+            return content
+
+        return llm_resilience.call(create_completion)
+
+    def stream_travel_plan(self, trip_data: Dict, use_cache: bool = True) -> 'PlanStream':
+        """Start a streamed completion and return its text chunks as a PlanStream.
+
+        The request is issued eagerly so connection and rate limit errors are
+        raised here, before the caller has committed to a streaming response.
+        A cached plan is returned as a single chunk.
+        """
+        points_balances = self.get_points_balances(trip_data)
+        cache_key = self._lookup_cache_key(trip_data, points_balances, use_cache)
+        if cache_key:
+            cached = plan_cache.get(cache_key)
+            if cached is not None:
+                return PlanStream(iter([cached['result']]), result={**cached, 'cached': True})
+
+        messages = self._build_messages(trip_data, points_balances)
+        # Retry only opening the stream; once tokens reach the client a retry would duplicate them
+        stream = llm_resilience.call(
+            lambda: self.provider.stream(messages, max_tokens=4000, temperature=0.7, timeout=120),
+            hedge=False
+        )
+        return PlanStream(stream, finish=lambda content: self._finish_stream(content, trip_data, points_balances, cache_key))
+
+    def _finish_stream(self, content: str, trip_data: Dict, points_balances: Dict,
+                       cache_key: Optional[str]) -> Optional[Dict]:
+        """Validate a fully streamed plan as a buffered one would be, regenerating what cannot be repaired.
+
+        The client has only seen the raw text, so it replaces it with the
+        returned result. The result is cached unless it is still invalid.
+        """
+        if not content:
+            return None
+        result = self._validate_plan({
+            'success': True,
+            'result': content,
+            'plan': parse_travel_plan(content)
+        }, trip_data, points_balances)
+        if cache_key and is_cacheable(result):
+            plan_cache.set(cache_key, result)
+        return result
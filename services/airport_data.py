@@ -0,0 +1,96 @@
+from typing import Dict, List, Tuple
+import json
+import os
+import re
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Hand-edited canonical list, and the compiled artifact the app loads
+SOURCE_PATH = os.path.join(ROOT_DIR, 'data', 'airports.json')
+ARTIFACT_PATH = os.path.join(ROOT_DIR, 'static', 'data', 'airports.min.json')
+
+AIRPORT_FIELDS = ('code', 'name', 'city', 'country', 'lat', 'lon', 'region')
+TEXT_FIELDS = ('name', 'city', 'country')
+REGIONS = {
+    'north_america', 'hawaii', 'mexico_central_america', 'caribbean', 'south_america', 'europe',
+    'middle_east', 'africa', 'south_asia', 'north_asia', 'southeast_asia', 'oceania'
+}
+CODE_RE = re.compile(r'^[A-Z]{3}$')
+# Coordinates are kept to about 100 m, plenty for flight time estimates
+COORDINATE_PLACES = 3
+
+
+class AirportDataError(ValueError):
+    """Raised when the airport source has records that cannot be compiled."""
+    pass
+
+
+def validate_airport(record: Dict) -> Tuple[Dict, List[str]]:
+    """Normalize one source record; returns (airport, problems)."""
+    problems = []
+    airport = {}
+    code = str(record.get('code') or '').strip().upper()
+    if not CODE_RE.match(code):
+        problems.append(f"invalid IATA code {record.get('code')!r}")
+    airport['code'] = code
+
+    for field in TEXT_FIELDS:
+        value = ' '.join(str(record.get(field) or '').split())
+        if not value:
+            problems.append(f"missing {field}")
+        airport[field] = value
+
+    for field, limit in (('lat', 90), ('lon', 180)):
+        try:
+            value = round(float(record.get(field)), COORDINATE_PLACES)
+        except (TypeError, ValueError):
+            problems.append(f"missing {field}")
+            continue
+        if not -limit <= value <= limit:
+            problems.append(f"{field} {value} out of range")
+        airport[field] = value
+
+    airport['region'] = str(record.get('region') or '').strip().lower()
+    if airport['region'] not in REGIONS:
+        problems.append(f"unknown region {record.get('region')!r}")
+    return airport, problems
+
+
+def compile_airports(records: List[Dict]) -> Tuple[List[Dict], List[str], List[str]]:
+    """Validate, dedupe by code and sort the source records.
+
+    Returns (airports, errors, warnings). Exact duplicates are dropped with
+    a warning; conflicting duplicates and invalid records are errors.
+    """
+    airports = {}
+    errors = []
+    warnings = []
+    for position, record in enumerate(records, start=1):
+        airport, problems = validate_airport(record)
+        label = airport['code'] or f"record {position}"
+        if problems:
+            errors.append(f"{label}: {'; '.join(problems)}")
+            continue
+        existing = airports.get(airport['code'])
+        if existing is None:
+            airports[airport['code']] = airport
+        elif existing == airport:
+            warnings.append(f"{label}: duplicate record {position} dropped")
+        else:
+            errors.append(f"{label}: record {position} conflicts with an earlier entry")
+    return [airports[code] for code in sorted(airports)], errors, warnings
+
+
+def build_artifact(airports: List[Dict]) -> str:
+    """Minified column-oriented JSON: field names once, then one array per airport."""
+    return json.dumps({
+        'fields': list(AIRPORT_FIELDS),
+        'airports': [[airport[field] for field in AIRPORT_FIELDS] for airport in airports]
+    }, separators=(',', ':'), ensure_ascii=False)
+
+
+def load_airports(path: str = ARTIFACT_PATH) -> List[Dict]:
+    """Read the compiled artifact back into one dict per airport."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    fields = data['fields']
+    return [dict(zip(fields, row)) for row in data['airports']]
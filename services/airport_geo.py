@@ -0,0 +1,106 @@
+from typing import Dict, Iterable, List, Optional
+import os
+
+import numpy as np
+
+from services.airport_data import ARTIFACT_PATH, ROOT_DIR, load_airports
+
+DATA_DIR = os.path.join(ROOT_DIR, 'data')
+
+EARTH_RADIUS_KM = 6371.0
+# Block time estimate: cruise over the great-circle distance plus taxi, climb and descent
+CRUISE_SPEED_KMH = 800
+TAXI_HOURS = 0.5
+
+
+def great_circle_km(lat1, lon1, lat2, lon2):
+    """Haversine distance in km; broadcasts over NumPy arrays."""
+    lat1, lon1, lat2, lon2 = (np.radians(value) for value in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def flight_hours(distance_km):
+    """Estimated nonstop flight time for a great-circle distance."""
+    return np.asarray(distance_km, dtype=float) / CRUISE_SPEED_KMH + TAXI_HOURS
+
+
+def _normalize(text: str) -> str:
+    return ' '.join((text or '').lower().replace('.', '').split())
+
+
+class AirportGeo:
+    """Airport coordinates with a precomputed all-pairs distance matrix.
+
+    Distances are stored as whole kilometres in ``uint16`` (the longest
+    great-circle route is about 20,000 km), a quarter of the memory of a
+    float64 matrix, so a few thousand airports still fit comfortably in
+    every worker. Lookups for a set of departure airports are a row slice
+    and a column-wise minimum.
+    """
+
+    def __init__(self, airports: List[Dict]):
+        self.airports = sorted(airports, key=lambda airport: airport['code'])
+        self.codes = [airport['code'] for airport in self.airports]
+        self.index = {code: i for i, code in enumerate(self.codes)}
+        self.lat = np.array([airport['lat'] for airport in self.airports], dtype=float)
+        self.lon = np.array([airport['lon'] for airport in self.airports], dtype=float)
+        self.distance_km = np.rint(great_circle_km(
+            self.lat[:, None], self.lon[:, None], self.lat[None, :], self.lon[None, :]
+        )).astype(np.uint16)
+
+        self.by_city = {}
+        for i, airport in enumerate(self.airports):
+            self.by_city.setdefault(_normalize(airport['city']), []).append(i)
+
+    @classmethod
+    def from_file(cls, path: str = ARTIFACT_PATH) -> 'AirportGeo':
+        return cls(load_airports(path))
+
+    def get(self, code: str) -> Optional[Dict]:
+        i = self.index.get((code or '').strip().upper())
+        return self.airports[i] if i is not None else None
+
+    def indexes(self, codes: Iterable[str]) -> List[int]:
+        """Matrix rows for the known codes, in order; unknown codes are skipped."""
+        rows = []
+        for code in codes:
+            i = self.index.get((code or '').strip().upper())
+            if i is not None:
+                rows.append(i)
+        return rows
+
+    def locate(self, city: str, country: Optional[str] = None) -> List[int]:
+        """Airports serving a city, narrowed to the country when one is given."""
+        rows = self.by_city.get(_normalize(city), [])
+        if country:
+            matching = [i for i in rows if _normalize(self.airports[i]['country']) == _normalize(country)]
+            rows = matching or rows
+        return rows
+
+    def hours_from(self, origins: Iterable[str]) -> Optional[np.ndarray]:
+        """Shortest estimated flight time to every airport from any of the origins."""
+        rows = self.indexes(origins)
+        if not rows:
+            return None
+        return flight_hours(self.distance_km[rows].min(axis=0))
+
+    def reachable(self, origins: Iterable[str], max_hours: float, codes: Optional[Iterable[str]] = None) -> List[str]:
+        """Airport codes (optionally only among ``codes``) within ``max_hours`` of any origin."""
+        hours = self.hours_from(origins)
+        if hours is None:
+            return []
+        candidates = self.indexes(codes) if codes is not None else range(len(self.codes))
+        return [self.codes[i] for i in candidates if hours[i] <= max_hours]
+
+    def city_flight_hours(self, origins: Iterable[str], city: str, country: Optional[str] = None) -> Optional[float]:
+        """Shortest estimated flight time from the origins to a city, or None if either is unknown."""
+        rows = self.locate(city, country)
+        hours = self.hours_from(origins) if rows else None
+        if hours is None:
+            return None
+        return round(float(hours[rows].min()), 1)
+
+
+# Built once per worker from the compiled airport dataset (see build_airports.py)
+airport_geo = AirportGeo.from_file()
@@ -0,0 +1,132 @@
+from typing import Dict, List
+import re
+
+from services.airport_geo import airport_geo
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+NGRAM = 3
+# Share of the query's trigrams an airport must contain to count as a fuzzy match,
+# and the shortest token worth matching fuzzily
+MIN_NGRAM_OVERLAP = 0.5
+MIN_FUZZY_LENGTH = 4
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 25
+
+# Ranking weights by how a query token matched, strongest first
+EXACT_CODE = 100
+CODE_PREFIX = 80
+CITY_PREFIX = 60
+CITY_WORD_PREFIX = 50
+NAME_WORD_PREFIX = 40
+NGRAM_MATCH = 30
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall((text or '').lower().replace('.', ''))
+
+
+def ngrams(text: str) -> set:
+    padded = f" {text} "
+    return {padded[i:i + NGRAM] for i in range(len(padded) - NGRAM + 1)}
+
+
+class PrefixTrie:
+    """Character trie where every node keeps the best weight of each airport below it."""
+
+    def __init__(self):
+        self.root = {'ids': {}, 'children': {}}
+
+    def insert(self, token: str, airport_id: int, weight: int):
+        node = self.root
+        for char in token:
+            node = node['children'].setdefault(char, {'ids': {}, 'children': {}})
+            if node['ids'].get(airport_id, 0) < weight:
+                node['ids'][airport_id] = weight
+
+    def search(self, prefix: str) -> Dict[int, int]:
+        node = self.root
+        for char in prefix:
+            node = node['children'].get(char)
+            if node is None:
+                return {}
+        return node['ids']
+
+
+class AirportSearchIndex:
+    """In-memory airport autocomplete over IATA code, city and airport name.
+
+    Every query token is matched as a prefix through the trie, falling back
+    to trigram overlap for typos and mid-word fragments; an airport must
+    match every token. Results are ranked by the strength of each match
+    (exact code, code prefix, city, then name) and then alphabetically.
+    """
+
+    def __init__(self, airports: List[Dict]):
+        self.airports = airports
+        self.trie = PrefixTrie()
+        self.ngram_index = {}
+        self.exact_codes = {}
+
+        for airport_id, airport in enumerate(airports):
+            code = airport['code'].lower()
+            self.exact_codes[code] = airport_id
+            self.trie.insert(code, airport_id, CODE_PREFIX)
+            city = ''.join(tokenize(airport['city']))
+            self.trie.insert(city, airport_id, CITY_PREFIX)
+            for word in tokenize(airport['city']):
+                self.trie.insert(word, airport_id, CITY_WORD_PREFIX)
+            for word in tokenize(airport['name']):
+                self.trie.insert(word, airport_id, NAME_WORD_PREFIX)
+            for word in set(tokenize(f"{airport['city']} {airport['name']}")):
+                for gram in ngrams(word):
+                    self.ngram_index.setdefault(gram, set()).add(airport_id)
+
+    def _match_token(self, token: str) -> Dict[int, float]:
+        """Score of every airport matching one query token."""
+        scores = dict(self.trie.search(token))
+        if token in self.exact_codes:
+            scores[self.exact_codes[token]] = EXACT_CODE
+        if len(token) >= MIN_FUZZY_LENGTH:
+            grams = ngrams(token)
+            counts = {}
+            for gram in grams:
+                for airport_id in self.ngram_index.get(gram, ()):
+                    counts[airport_id] = counts.get(airport_id, 0) + 1
+            for airport_id, count in counts.items():
+                overlap = count / len(grams)
+                if overlap >= MIN_NGRAM_OVERLAP and airport_id not in scores:
+                    scores[airport_id] = NGRAM_MATCH * overlap
+        return scores
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> List[Dict]:
+        """Best matching airports for the query, at most ``limit`` of them."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        # Concatenated tokens also match multi-word cities typed with spaces ("new york")
+        scores = self._match_token(''.join(tokens)) if len(tokens) > 1 else {}
+        combined = None
+        for token in tokens:
+            token_scores = self._match_token(token)
+            if combined is None:
+                combined = token_scores
+            else:
+                combined = {airport_id: score + token_scores[airport_id]
+                            for airport_id, score in combined.items() if airport_id in token_scores}
+        for airport_id, score in combined.items():
+            scores[airport_id] = max(scores.get(airport_id, 0), score / len(tokens))
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self.airports[item[0]]['code']))
+        return [self._result(self.airports[airport_id]) for airport_id, _ in ranked[:limit]]
+
+    def _result(self, airport: Dict) -> Dict:
+        return {
+            'code': airport['code'],
+            'name': airport['name'],
+            'city': airport['city'],
+            'country': airport['country']
+        }
+
+
+# Built once per worker from the compiled airport dataset (see build_airports.py)
+airport_search = AirportSearchIndex(airport_geo.airports)
@@ -0,0 +1,167 @@
+from typing import Dict, List, Optional
+import base64
+import binascii
+import csv
+import io
+import json
+import math
+import os
+
+from models import db, Hotel
+
+DEFAULT_CSV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'Hotel Reviews.csv')
+
+# CSV headers with their line breaks and padding collapsed, mapped to Hotel columns
+COLUMNS = {
+    'Hotel Name': 'name',
+    'City': 'city',
+    'Country': 'country',
+    'Category': 'category',
+    'Price Range': 'price_range',
+    'Distance from Airport': 'airport_distance',
+    'Have I Stayed? (Y/N)': 'has_stayed',
+    'My Rating': 'rating',
+    'Notes': 'notes',
+}
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Filters that match one of several values: query parameter -> Hotel column
+INDEXED_FILTERS = {
+    'country': 'country',
+    'city': 'city',
+    'category': 'category',
+    'price_range': 'price_range',
+}
+
+SORTS = ('rating', 'name', 'price', 'price_desc', 'country')
+DEFAULT_SORT = 'rating'
+
+
+class HotelQueryError(ValueError):
+    """Raised for filter, sort or cursor parameters that cannot be applied."""
+    pass
+
+
+def price_level(price_range: str) -> float:
+    """Number of dollar signs, averaged for ranges such as '$$-$$$'."""
+    levels = [part.count('$') for part in (price_range or '').split('-') if part.count('$')]
+    return sum(levels) / len(levels) if levels else 0.0
+
+
+def encode_cursor(sort: str, key: List) -> str:
+    raw = json.dumps([sort, key], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, sort: str) -> List:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_sort, key = json.loads(raw)
+    except (binascii.Error, ValueError, TypeError):
+        raise HotelQueryError("Invalid cursor")
+    columns = Hotel.sort_columns(sort)
+    if cursor_sort != sort or not isinstance(key, list) or len(key) != len(columns):
+        raise HotelQueryError("Cursor does not match the requested sort")
+    if not all(_matches_column(value, column) for value, (column, _) in zip(key, columns)):
+        raise HotelQueryError("Invalid cursor")
+    return key
+
+
+def _matches_column(value, column) -> bool:
+    """Whether a cursor value has the type of the sort column it is compared with."""
+    if isinstance(value, bool):
+        return False
+    python_type = column.type.python_type
+    if python_type is float:
+        return isinstance(value, (int, float)) and math.isfinite(value)
+    return isinstance(value, python_type)
+
+
+def _header(name: str) -> str:
+    return ' '.join((name or '').split())
+
+
+def parse_hotels(content: str) -> List[Dict]:
+    """Parse the rankings CSV into Hotel column values, tolerating line breaks in its headers."""
+    reader = csv.reader(io.StringIO(content))
+    headers = [_header(name) for name in next(reader, [])]
+    missing = [name for name in COLUMNS if name not in headers]
+    if missing:
+        raise ValueError(f"Hotel rankings CSV is missing columns: {', '.join(missing)}")
+    positions = {COLUMNS[name]: headers.index(name) for name in COLUMNS}
+
+    hotels = {}
+    for line, row in enumerate(reader, start=2):
+        if not any(cell.strip() for cell in row):
+            continue
+        hotel = {field: row[index].strip() if index < len(row) else '' for field, index in positions.items()}
+        if not hotel['name'] or not hotel['city']:
+            raise ValueError(f"Row {line} needs a hotel name and city")
+        try:
+            hotel['rating'] = float(hotel['rating'])
+        except ValueError:
+            raise ValueError(f"Row {line} has an invalid rating '{hotel['rating']}'")
+        hotel['has_stayed'] = hotel['has_stayed'].upper() == 'Y'
+        hotel['price_level'] = price_level(hotel['price_range'])
+        hotel['website'] = ''
+        # A repeated name and city keeps the last row, as the upsert would
+        hotels[(hotel['name'], hotel['city'])] = hotel
+    return list(hotels.values())
+
+
+def load_hotels_csv(path: str = DEFAULT_CSV_PATH, prune: bool = False) -> Dict:
+    """Upsert every hotel in the CSV in one transaction; with ``prune`` also delete hotels no longer listed.
+
+    Must run inside an app context.
+    """
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        hotels = parse_hotels(f.read())
+    removed = 0
+    try:
+        upserted = Hotel.bulk_upsert(hotels)
+        if prune:
+            keep = {(hotel['name'], hotel['city']) for hotel in hotels}
+            stale = [hotel for hotel in Hotel.query.all() if (hotel.name, hotel.city) not in keep]
+            for hotel in stale:
+                db.session.delete(hotel)
+            removed = len(stale)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return {'upserted': upserted, 'removed': removed}
+
+
+def query_hotels(filters: Optional[Dict[str, List[str]]] = None, exclude_countries: Optional[List[str]] = None,
+                 stayed: Optional[bool] = None, min_rating: Optional[float] = None, sort: str = DEFAULT_SORT,
+                 limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> Dict:
+    """Filter, sort and page the hotels in the database.
+
+    ``filters`` maps a field in INDEXED_FILTERS to accepted values
+    (case-insensitive except price_range). ``cursor`` is the keyset cursor
+    returned with the previous page.
+    """
+    if sort not in SORTS:
+        raise HotelQueryError(f"Unknown sort '{sort}'; use one of {', '.join(SORTS)}")
+    limit = min(max(int(limit), 1), MAX_PAGE_SIZE)
+
+    query = Hotel.search(filters, exclude_countries, stayed, min_rating)
+    total = query.count()
+    if cursor:
+        query = Hotel.after(query, sort, decode_cursor(cursor, sort))
+    order = [column.desc() if descending else column.asc() for column, descending in Hotel.sort_columns(sort)]
+    # One extra row tells whether another page follows
+    rows = query.order_by(*order).limit(limit + 1).all()
+    page = rows[:limit]
+    return {
+        'hotels': [hotel.to_dict() for hotel in page],
+        'total': total,
+        'next_cursor': encode_cursor(sort, page[-1].sort_key(sort)) if len(rows) > limit else None
+    }
+
+
+def all_hotels() -> List[Dict]:
+    """Every hotel in the order first loaded, for the unfiltered endpoint."""
+    return [hotel.to_dict() for hotel in Hotel.query.order_by(Hotel.id).all()]
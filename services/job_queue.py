@@ -0,0 +1,274 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+DEFAULT_JOBS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'trip_jobs.db'
+)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+INTERRUPTED_ERROR = 'The trip request was interrupted. Please try again.'
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue already holds the maximum number of pending jobs."""
+    pass
+
+
+def _percentile(values, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(fraction * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+class TripJobQueue:
+    """Bounded background pool for long-running trip generations.
+
+    Jobs run on a thread pool inside the worker that accepted them, while job
+    state lives in a SQLite file so a poll landing on any gunicorn worker can
+    answer it. Under gevent the pool's threads are greenlets, so ``max_workers``
+    bounds concurrent model calls rather than OS threads.
+
+    Each process renews a lease on its unfinished jobs every ``lease / 6``
+    seconds; a job whose lease runs out lost its worker (recycled by
+    max_requests or killed) and is reported as failed. Pids are not used for
+    this since the OS reuses them.
+    """
+
+    def __init__(self, path: str = DEFAULT_JOBS_PATH, max_workers: int = 4,
+                 max_pending: int = 100, retention: int = 60 * 60, lease: int = 60):
+        self.path = path
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.retention = retention
+        self.lease = lease
+        self._executor = None
+        self._executor_pid = None
+        self._owner = None
+        self._executor_lock = threading.Lock()
+        self._schema_ready = False
+
+    @classmethod
+    def from_env(cls) -> 'TripJobQueue':
+        """Create a queue configured from TRIP_JOB_* environment variables."""
+        return cls(
+            path=os.getenv('TRIP_JOB_PATH', DEFAULT_JOBS_PATH),
+            max_workers=int(os.getenv('TRIP_JOB_WORKERS', 4)),
+            max_pending=int(os.getenv('TRIP_JOB_MAX_PENDING', 100)),
+            retention=int(os.getenv('TRIP_JOB_RETENTION', 60 * 60)),
+            lease=int(os.getenv('TRIP_JOB_LEASE', 60))
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, creating the schema on first use in this process."""
+        directory = os.path.dirname(self.path)
+        if directory and not self._schema_ready:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.row_factory = sqlite3.Row
+        if not self._schema_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS trip_jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    error_status INTEGER,
+                    owner_pid INTEGER NOT NULL,
+                    submitted_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    owner TEXT,
+                    heartbeat_at REAL
+                )
+            """)
+            # Job files created before leases were added
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(trip_jobs)")}
+            for column, column_type in (('owner', 'TEXT'), ('heartbeat_at', 'REAL')):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE trip_jobs ADD COLUMN {column} {column_type}")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_trip_jobs_status ON trip_jobs (status)")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_trip_jobs_submitted_at ON trip_jobs (submitted_at)")
+            conn.commit()
+            self._schema_ready = True
+        return conn
+
+    def _get_executor(self) -> Tuple[ThreadPoolExecutor, str]:
+        """Return this process's pool and owner id, creating them lazily so forked workers get their own."""
+        pid = os.getpid()
+        if self._executor is None or self._executor_pid != pid:
+            with self._executor_lock:
+                if self._executor is None or self._executor_pid != pid:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix='trip-job'
+                    )
+                    self._owner = uuid.uuid4().hex
+                    self._executor_pid = pid
+                    threading.Thread(target=self._renew_leases, args=(self._owner,),
+                                     name='trip-job-lease', daemon=True).start()
+        return self._executor, self._owner
+
+    def _renew_leases(self, owner: str):
+        """Keep renewing the lease on this process's queued and running jobs while it lives."""
+        interval = max(self.lease / 6, 1)
+        while True:
+            time.sleep(interval)
+            conn = None
+            try:
+                conn = self._connect()
+                conn.execute(
+                    "UPDATE trip_jobs SET heartbeat_at = ? WHERE owner = ? AND status IN (?, ?)",
+                    (time.time(), owner, QUEUED, RUNNING)
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Error renewing trip job leases: {e}")
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def submit(self, fn: Callable[[], Dict],
+               describe_error: Optional[Callable[[Exception], Tuple[int, str]]] = None) -> str:
+        """Queue ``fn`` for background execution and return the new job id.
+
+        ``describe_error`` maps an exception raised by ``fn`` to the HTTP status
+        and user-facing message stored on the failed job.
+        """
+        executor, owner = self._get_executor()
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "DELETE FROM trip_jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (now - self.retention,)
+            )
+            # Jobs whose worker died no longer count against the limit
+            conn.execute(
+                "UPDATE trip_jobs SET status = ?, error = ?, error_status = 503, finished_at = ? "
+                "WHERE status IN (?, ?) AND COALESCE(heartbeat_at, submitted_at) < ?",
+                (FAILED, INTERRUPTED_ERROR, now, QUEUED, RUNNING, now - self.lease)
+            )
+            pending = conn.execute(
+                "SELECT COUNT(*) FROM trip_jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)
+            ).fetchone()[0]
+            if pending >= self.max_pending:
+                conn.rollback()
+                raise QueueFullError("Too many trip requests are waiting. Please try again shortly.")
+            conn.execute(
+                "INSERT INTO trip_jobs (id, status, owner_pid, submitted_at, owner, heartbeat_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, os.getpid(), now, owner, now)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        executor.submit(self._run, job_id, fn, describe_error)
+        return job_id
+
+    def _run(self, job_id: str, fn: Callable[[], Dict], describe_error):
+        now = time.time()
+        self._update(job_id, status=RUNNING, started_at=now, heartbeat_at=now)
+        try:
+            result = fn()
+        except Exception as e:
+            if describe_error:
+                error_status, message = describe_error(e)
+            else:
+                error_status, message = 500, str(e)
+            self._update(job_id, status=FAILED, error=message, error_status=error_status,
+                         finished_at=time.time())
+            return
+        self._update(job_id, status=SUCCEEDED, result=json.dumps(result), finished_at=time.time())
+
+    def _update(self, job_id: str, **fields):
+        columns = ', '.join(f"{name} = ?" for name in fields)
+        conn = self._connect()
+        try:
+            conn.execute(f"UPDATE trip_jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"Error updating trip job {job_id}: {e}")
+        finally:
+            conn.close()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return the state of a job, or None if it is unknown or has been purged."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM trip_jobs WHERE id = ?", (job_id,)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+
+        job = dict(row)
+        # A worker recycled by max_requests takes its unfinished jobs with it and stops renewing their lease
+        lease_renewed_at = job['heartbeat_at'] or job['submitted_at']
+        if job['status'] in (QUEUED, RUNNING) and lease_renewed_at < time.time() - self.lease:
+            job.update(status=FAILED, error_status=503, error=INTERRUPTED_ERROR)
+            self._update(job_id, status=FAILED, error=job['error'],
+                         error_status=job['error_status'], finished_at=time.time())
+
+        if job['result']:
+            job['result'] = json.loads(job['result'])
+        return job
+
+    def metrics(self, sample_size: int = 200) -> Dict:
+        """Queue depth plus wait and run time percentiles over the most recent jobs."""
+        conn = self._connect()
+        try:
+            counts = dict(conn.execute(
+                "SELECT status, COUNT(*) FROM trip_jobs GROUP BY status"
+            ).fetchall())
+            oldest_queued = conn.execute(
+                "SELECT MIN(submitted_at) FROM trip_jobs WHERE status = ?", (QUEUED,)
+            ).fetchone()[0]
+            recent = conn.execute(
+                "SELECT submitted_at, started_at, finished_at FROM trip_jobs "
+                "WHERE started_at IS NOT NULL ORDER BY started_at DESC LIMIT ?",
+                (sample_size,)
+            ).fetchall()
+        finally:
+            conn.close()
+
+        waits = sorted(row['started_at'] - row['submitted_at'] for row in recent)
+        runs = sorted(row['finished_at'] - row['started_at'] for row in recent if row['finished_at'])
+        return {
+            'depth': counts.get(QUEUED, 0),
+            'running': counts.get(RUNNING, 0),
+            'succeeded': counts.get(SUCCEEDED, 0),
+            'failed': counts.get(FAILED, 0),
+            'max_pending': self.max_pending,
+            'workers_per_process': self.max_workers,
+            'oldest_queued_age_seconds': round(time.time() - oldest_queued, 3) if oldest_queued else 0.0,
+            'wait_seconds': {
+                'p50': round(_percentile(waits, 0.5), 3),
+                'p95': round(_percentile(waits, 0.95), 3),
+                'max': round(waits[-1], 3) if waits else 0.0
+            },
+            'run_seconds': {
+                'p50': round(_percentile(runs, 0.5), 3),
+                'p95': round(_percentile(runs, 0.95), 3),
+                'max': round(runs[-1], 3) if runs else 0.0
+            },
+            'sample_size': len(recent)
+        }
+
+
+# Shared queue used by the job endpoints
+trip_jobs = TripJobQueue.from_env()
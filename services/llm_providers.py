@@ -0,0 +1,332 @@
+from typing import Dict, Iterator, List, Optional
+import hashlib
+import math
+import os
+import random
+import re
+import threading
+import time
+import httpx
+from openai import APIConnectionError, APITimeoutError, RateLimitError
+from services.openai_client import get_openai_client
+
+DEFAULT_MODEL = 'gpt-4o-mini'
+
+
+class LLMProvider:
+    """Chat completion backend used by TravelPlanGenerator.
+
+    ``stream`` must open the request before returning so connection and rate
+    limit errors surface to the caller rather than mid-iteration.
+    """
+
+    name = 'base'
+
+    def complete(self, messages: List[Dict], max_tokens: int, temperature: float = 0.7,
+                 timeout: float = 120) -> str:
+        raise NotImplementedError
+
+    def stream(self, messages: List[Dict], max_tokens: int, temperature: float = 0.7,
+               timeout: float = 120) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class OpenAIProvider(LLMProvider):
+    """Completions from the OpenAI API through the worker's pooled client."""
+
+    name = 'openai'
+
+    def __init__(self, model: str = DEFAULT_MODEL):
+        self.model = model
+        # Fail at construction, as before, when no API key is configured
+        get_openai_client()
+
+    @property
+    def client(self):
+        # Looked up per call so a provider created before fork still uses the worker's own pool
+        return get_openai_client()
+
+    def complete(self, messages, max_tokens, temperature=0.7, timeout=120) -> str:
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout
+        )
+        try:
+            return (response.choices[0].message.content or '').strip()
+        except (AttributeError, IndexError) as e:
+            print(f"Error parsing AI response: {str(e)}")
+            raise ValueError("Error parsing AI response")
+
+    def stream(self, messages, max_tokens, temperature=0.7, timeout=120) -> Iterator[str]:
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout,
+            stream=True
+        )
+        return self._iter_deltas(stream)
+
+    def _iter_deltas(self, stream) -> Iterator[str]:
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+        finally:
+            stream.close()
+
+
+def parse_distribution(spec: str):
+    """Build a sampler from "fixed:1.5", "uniform:0.5,2" or "lognormal:0.8,0.5" (median seconds, sigma)."""
+    kind, _, params = spec.partition(':')
+    values = [float(value) for value in params.split(',') if value.strip()]
+    kind = kind.strip().lower()
+    if kind == 'fixed':
+        return lambda rng: values[0]
+    if kind == 'uniform':
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == 'lognormal':
+        median, sigma = values
+        mu = math.log(median) if median > 0 else 0.0
+        return lambda rng: rng.lognormvariate(mu, sigma)
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+# Destinations the fake backend draws from: (city, country, airport, airline, airline program,
+# economy points, premium cabin, premium points, hotel, hotel program, points per night,
+# luxury hotel, luxury program, luxury points per night)
+FAKE_DESTINATIONS = [
+    ('Lisbon', 'Portugal', 'LIS', 'TAP Air Portugal', 'United MileagePlus', 60000, 'Business', 120000,
+     'Hyatt Regency Lisbon', 'World of Hyatt', 15000, 'Four Seasons Hotel Ritz Lisbon', 'Marriott Bonvoy', 85000),
+    ('Tokyo', 'Japan', 'HND', 'ANA', 'Virgin Atlantic Flying Club', 55000, 'Business', 95000,
+     'Hyatt Regency Tokyo', 'World of Hyatt', 18000, 'Park Hyatt Tokyo', 'World of Hyatt', 35000),
+    ('Cancun', 'Mexico', 'CUN', 'Delta', 'Delta SkyMiles', 30000, 'First', 65000,
+     'Hyatt Ziva Cancun', 'World of Hyatt', 25000, 'Kempinski Hotel Cancun', 'Marriott Bonvoy', 60000),
+    ('Paris', 'France', 'CDG', 'Air France', 'Flying Blue', 50000, 'Business', 110000,
+     'Hyatt Paris Madeleine', 'World of Hyatt', 25000, 'Park Hyatt Paris-Vendome', 'World of Hyatt', 40000),
+    ('Reykjavik', 'Iceland', 'KEF', 'Icelandair', 'Alaska Mileage Plan', 40000, 'Premium Economy', 70000,
+     'Reykjavik EDITION', 'Marriott Bonvoy', 50000, 'The Retreat at Blue Lagoon', 'Marriott Bonvoy', 85000),
+    ('Honolulu', 'United States', 'HNL', 'Hawaiian Airlines', 'Hawaiian Miles', 40000, 'First', 80000,
+     'Hyatt Regency Waikiki', 'World of Hyatt', 20000, 'Halekulani', 'Marriott Bonvoy', 90000),
+    ('Rome', 'Italy', 'FCO', 'ITA Airways', 'Flying Blue', 50000, 'Business', 100000,
+     'Hilton Rome Airport', 'Hilton Honors', 40000, 'Rome EDITION', 'Marriott Bonvoy', 85000),
+    ('Cape Town', 'South Africa', 'CPT', 'United', 'United MileagePlus', 80000, 'Business', 160000,
+     'Hyatt Regency Cape Town', 'World of Hyatt', 12000, 'Cape Grace', 'Marriott Bonvoy', 70000),
+]
+
+
+def _format_destination(index: int, destination, origin: str, nights: int) -> str:
+    (city, country, code, airline, airline_program, economy_points, cabin, premium_points,
+     hotel, hotel_program, nightly, luxury_hotel, luxury_program, luxury_nightly) = destination
+    hotel_total = nightly * nights
+    luxury_total = luxury_nightly * nights
+    return f"""DESTINATION {index} - {city}, {country}:
+
+DESTINATION SUMMARY:
+{city} is an excellent match for the requested travel time and trip style, with great seasonal weather and strong award availability.
+
+Why We Recommend This Destination:
+
+1. Requirements Match:
+
+✓ Trip Style: {city} offers a wide range of matching experiences
+
+✓ Flight Length: Reachable from {origin} within the requested flight time
+
+✓ Points Fit: Bookable with the available points balances
+
+
+2. Seasonal Analysis:
+   🌤️ Weather Conditions:
+      • Pleasant temperatures for the season
+      • Low chance of disruptive weather
+
+   🎉 Local Highlights:
+      • Seasonal food and music festivals
+      • Outdoor activities at their best
+
+
+
+<br><br>
+3. Points Optimization:
+   🎯 Award Availability:
+      • Saver space is typically open 60-90 days out
+      • Midweek departures price lowest
+
+   💰 Value Opportunities:
+      • Transfer bonuses to {airline_program} appear several times a year
+      • Fifth-night-free style stays stretch hotel points
+
+OPTION A - ECONOMY EXPERIENCE
+Flight Details:
+- Route: {origin} to {code}
+- Airline: {airline}
+- Points Program: {airline_program}
+- <b>Points Used</b>: {economy_points:,} points RT
+- <b>Fare Class</b>: Economy (Main Cabin)
+Hotel Option:
+- Property: {hotel}
+- Points Program: {hotel_program}
+- Total Points Needed: {hotel_total:,} points ({nightly:,} points per night)
+- Property Details: Comfortable, well-located property close to the main sights
+
+Value Analysis:
+- <b>Total Points Used</b>: {economy_points + hotel_total:,}
+- <b>Airline</b>: {economy_points:,} points ({airline_program})
+- <b>Hotel</b>: {hotel_total:,} points ({hotel_program})
+- <b>Dollar Value Saved</b>: Approx. ${round((economy_points + hotel_total) * 0.015):,}
+
+OPTION B - LUXURY EXPERIENCE
+Flight Details:
+- Route: {origin} to {code}
+- Airline: {airline}
+- Points Program: {airline_program}
+- <b>Points Used</b>: {premium_points:,} points RT
+- <b>Fare Class</b>: {cabin}
+Hotel Option:
+- Property: {luxury_hotel}
+- Points Program: {luxury_program}
+- Total Points Needed: {luxury_total:,} points ({luxury_nightly:,} points per night)
+- Property Details: Landmark luxury property with standout service
+
+Value Analysis:
+- <b>Total Points Used</b>: {premium_points + luxury_total:,}
+- <b>Airline</b>: {premium_points:,} points ({airline_program})
+- <b>Hotel</b>: {luxury_total:,} points ({luxury_program})
+- <b>Dollar Value Saved</b>: Approx. ${round((premium_points + luxury_total) * 0.02):,}"""
+
+
+class FakeLLMProvider(LLMProvider):
+    """Deterministic local backend that returns format-correct plans without network access.
+
+    Latency is modelled as a time-to-first-token drawn from a configurable
+    distribution plus generated tokens at ``tokens_per_second``. Rate limit,
+    timeout and connection errors are injected at the configured rates using
+    the same exception types the OpenAI SDK raises, so retries, the circuit
+    breaker and error responses behave as they would in production.
+    """
+
+    name = 'fake'
+
+    def __init__(self, first_token_latency: str = 'lognormal:0.6,0.4', tokens_per_second: float = 80,
+                 rate_limit_rate: float = 0.0, timeout_rate: float = 0.0,
+                 connection_error_rate: float = 0.0, seed: Optional[int] = None):
+        self.first_token_latency = parse_distribution(first_token_latency)
+        self.tokens_per_second = tokens_per_second
+        self.rate_limit_rate = rate_limit_rate
+        self.timeout_rate = timeout_rate
+        self.connection_error_rate = connection_error_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'FakeLLMProvider':
+        """Create a fake backend configured from FAKE_LLM_* environment variables."""
+        seed = os.getenv('FAKE_LLM_SEED')
+        return cls(
+            first_token_latency=os.getenv('FAKE_LLM_FIRST_TOKEN_LATENCY', 'lognormal:0.6,0.4'),
+            tokens_per_second=float(os.getenv('FAKE_LLM_TOKENS_PER_SECOND', 80)),
+            rate_limit_rate=float(os.getenv('FAKE_LLM_RATE_LIMIT_RATE', 0)),
+            timeout_rate=float(os.getenv('FAKE_LLM_TIMEOUT_RATE', 0)),
+            connection_error_rate=float(os.getenv('FAKE_LLM_CONNECTION_ERROR_RATE', 0)),
+            seed=int(seed) if seed else None
+        )
+
+    def _random(self) -> float:
+        with self._rng_lock:
+            return self._rng.random()
+
+    def _sample_first_token_latency(self) -> float:
+        with self._rng_lock:
+            return self.first_token_latency(self._rng)
+
+    def _maybe_fail(self, timeout: float):
+        """Raise an injected provider error according to the configured rates."""
+        request = httpx.Request('POST', 'https://fake-llm.local/v1/chat/completions')
+        roll = self._random()
+        if roll < self.rate_limit_rate:
+            response = httpx.Response(429, request=request, headers={'retry-after': '1'})
+            raise RateLimitError('Injected rate limit', response=response, body=None)
+        roll -= self.rate_limit_rate
+        if roll < self.timeout_rate:
+            # A real timeout costs the caller the full timeout before failing
+            time.sleep(min(timeout, 120))
+            raise APITimeoutError(request=request)
+        roll -= self.timeout_rate
+        if roll < self.connection_error_rate:
+            raise APIConnectionError(request=request)
+
+    def _render_plan(self, messages: List[Dict], max_tokens: int) -> str:
+        """Build a plan in the exact prompt format, chosen deterministically from the prompt."""
+        system_prompt = messages[0]['content'] if messages else ''
+        # Key on the trip requirements only, so fan-out requests for one trip pick distinct destinations
+        requirements = re.findall(r'^- (?:Departure Airport|Trip Style|Preferred Travel Time).*$', system_prompt, re.MULTILINE)
+        digest = int(hashlib.sha256('\n'.join(requirements).encode('utf-8')).hexdigest(), 16)
+
+        airports = re.search(r'Departure Airport\(s\): ([A-Z]{3})', system_prompt)
+        origin = airports.group(1) if airports else 'JFK'
+        days = re.search(r'\((\d+) days\)', system_prompt)
+        nights = max(1, int(days.group(1)) - 1) if days else 6
+
+        # Single-destination prompts (fan-out mode) name the destination to write
+        first = re.search(r'DESTINATION (\d+) - \[City, Country\]', system_prompt)
+        first_index = int(first.group(1)) if first else 1
+        count = 1 if 'Show exactly 1 destination' in system_prompt else 2
+
+        sections = []
+        for offset in range(count):
+            index = first_index + offset
+            destination = FAKE_DESTINATIONS[(digest + index * 3) % len(FAKE_DESTINATIONS)]
+            sections.append(_format_destination(index, destination, origin, nights))
+        text = "\n\n".join(sections)
+
+        # Roughly four characters per token, like the real tokenizer
+        return text[:max_tokens * 4]
+
+    def complete(self, messages, max_tokens, temperature=0.7, timeout=120) -> str:
+        self._maybe_fail(timeout)
+        text = self._render_plan(messages, max_tokens)
+        tokens = max(1, len(text) // 4)
+        time.sleep(self._sample_first_token_latency() + tokens / self.tokens_per_second)
+        return text
+
+    def stream(self, messages, max_tokens, temperature=0.7, timeout=120) -> Iterator[str]:
+        self._maybe_fail(timeout)
+        text = self._render_plan(messages, max_tokens)
+        time.sleep(self._sample_first_token_latency())
+        return self._iter_tokens(text)
+
+    def _iter_tokens(self, text: str) -> Iterator[str]:
+        delay = 1.0 / self.tokens_per_second
+        for start in range(0, len(text), 4):
+            time.sleep(delay)
+            yield text[start:start + 4]
+
+
+PROVIDERS = {
+    'openai': lambda: OpenAIProvider(model=os.getenv('LLM_MODEL', DEFAULT_MODEL)),
+    'fake': FakeLLMProvider.from_env,
+}
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_llm_provider() -> LLMProvider:
+    """Return this process's provider, selected by the LLM_PROVIDER environment variable."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                name = os.getenv('LLM_PROVIDER', 'openai').lower()
+                if name not in PROVIDERS:
+                    raise ValueError(f"Unknown LLM provider '{name}'. Choose one of: {', '.join(PROVIDERS)}")
+                _provider = PROVIDERS[name]()
+    return _provider
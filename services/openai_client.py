@@ -0,0 +1,56 @@
+import os
+import threading
+import httpx
+from openai import OpenAI
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def _build_client() -> OpenAI:
+    """Create an OpenAI client backed by a keep-alive connection pool."""
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        raise ValueError("OpenAI API key not found in environment variables")
+
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=int(os.getenv('OPENAI_MAX_CONNECTIONS', 100)),
+            max_keepalive_connections=int(os.getenv('OPENAI_MAX_KEEPALIVE_CONNECTIONS', 20)),
+            keepalive_expiry=float(os.getenv('OPENAI_KEEPALIVE_EXPIRY', 30))
+        ),
+        timeout=httpx.Timeout(
+            float(os.getenv('OPENAI_TIMEOUT', 120)),
+            connect=float(os.getenv('OPENAI_CONNECT_TIMEOUT', 10))
+        )
+    )
+    return OpenAI(
+        api_key=api_key,
+        organization=os.getenv('OPENAI_ORG_ID') or None,
+        http_client=http_client,
+        # Retries are owned by services/resilience.py so they back off and respect the circuit breaker
+        max_retries=int(os.getenv('OPENAI_MAX_RETRIES', 0))
+    )
+
+
+def get_openai_client() -> OpenAI:
+    """Return this process's shared OpenAI client, creating it on first use.
+
+    The client is keyed on the process id, so a worker forked from a process
+    that already held a client builds its own pool instead of sharing sockets
+    with its parent.
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        with _client_lock:
+            if _client is None or _client_pid != pid:
+                _client = _build_client()
+                _client_pid = pid
+    return _client
+
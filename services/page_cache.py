@@ -0,0 +1,87 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional
+import hashlib
+import os
+import threading
+
+
+class CachedPage:
+    """A rendered page body with the validators sent alongside it."""
+
+    __slots__ = ('version', 'body', 'etag', 'last_modified')
+
+    def __init__(self, version: str, body: str, last_modified: Optional[datetime]):
+        self.version = version
+        self.body = body
+        self.etag = hashlib.sha1(body.encode('utf-8')).hexdigest()[:16]
+        self.last_modified = last_modified
+
+
+class PageCache:
+    """Per-worker LRU of rendered pages.
+
+    Entries are keyed by (key, variant): the variant keeps pages that render
+    differently per viewer (anonymous or a particular user) apart. Each entry
+    records the version it was rendered from, such as the row's updated_at,
+    and is ignored once the caller sees a newer version. That check keeps
+    workers correct after an edit made in another process; ``invalidate``
+    also drops entries in this worker right away.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {
+            'hits': 0,
+            'misses': 0,
+            'stale': 0,
+            'invalidations': 0
+        }
+
+    @classmethod
+    def from_env(cls, prefix: str) -> 'PageCache':
+        return cls(max_entries=int(os.getenv(f'{prefix}_MAX_ENTRIES', 256)))
+
+    def get(self, key: str, variant: str, version: str) -> Optional[CachedPage]:
+        with self._lock:
+            page = self._entries.get((key, variant))
+            if page is None:
+                self.counters['misses'] += 1
+                return None
+            if page.version != version:
+                del self._entries[(key, variant)]
+                self.counters['stale'] += 1
+                return None
+            self._entries.move_to_end((key, variant))
+            self.counters['hits'] += 1
+            return page
+
+    def set(self, key: str, variant: str, version: str, body: str,
+            last_modified: Optional[datetime] = None) -> CachedPage:
+        page = CachedPage(version, body, last_modified)
+        with self._lock:
+            self._entries[(key, variant)] = page
+            self._entries.move_to_end((key, variant))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return page
+
+    def invalidate(self, key: str):
+        """Drop every variant of a page."""
+        with self._lock:
+            for entry in [entry for entry in self._entries if entry[0] == key]:
+                del self._entries[entry]
+            self.counters['invalidations'] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self.counters, 'entries': len(self._entries), 'max_entries': self.max_entries}
+
+
+# Rendered /reviews/<slug> pages in this worker
+review_page_cache = PageCache.from_env('REVIEW_PAGE_CACHE')
+
+# Serialized /api/hotel-rankings responses in this worker, keyed by query
+hotel_payload_cache = PageCache.from_env('HOTEL_PAYLOAD_CACHE')
@@ -0,0 +1,322 @@
+from typing import Dict, Optional
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import uuid
+
+# Bump when the prompt or response shape changes so stale plans are not served
+CACHE_KEY_VERSION = 5
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'plan_cache.db'
+)
+
+
+def _normalize_list(values, transform) -> list:
+    """Return a sorted, de-duplicated list of transformed, non-empty values."""
+    if values is None:
+        return []
+    if isinstance(values, str):
+        values = values.split(',')
+    return sorted({transform(str(value).strip()) for value in values if str(value).strip()})
+
+
+def _normalize_text(value) -> str:
+    """Collapse whitespace and case so cosmetic differences share a cache entry."""
+    if value is None:
+        return ''
+    return ' '.join(str(value).split()).lower()
+
+
+def normalize_trip_request(trip_data: Dict, points_balances: Dict) -> Dict:
+    """Reduce a trip request and its resolved balances to the fields that affect the plan."""
+    return {
+        'version': CACHE_KEY_VERSION,
+        'airports': _normalize_list(trip_data.get('airports'), str.upper),
+        'trip_types': _normalize_list(trip_data.get('trip_types'), str.lower),
+        'travel_months': _normalize_text(trip_data.get('travel_months')),
+        'trip_length': _normalize_text(trip_data.get('trip_length')),
+        'max_flight_length': _normalize_text(trip_data.get('max_flight_length')),
+        'direct_flights': bool(trip_data.get('direct_flights')),
+        'preferences': _normalize_text(trip_data.get('preferences')),
+        'points_balances': sorted(
+            (_normalize_text(program), int(balance or 0))
+            for program, balance in (points_balances or {}).items()
+        )
+    }
+
+
+def make_cache_key(trip_data: Dict, points_balances: Dict) -> str:
+    """Build the canonical cache key for a trip request."""
+    normalized = normalize_trip_request(trip_data, points_balances)
+    payload = json.dumps(normalized, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class PlanCache:
+    """SQLite-backed cache of generated travel plans shared by every worker on the host.
+
+    Entries expire after ``ttl`` seconds and the least recently used entries are
+    evicted once the cache holds more than ``max_entries`` plans. Hit, miss and
+    bypass counters live in the same database so they aggregate across workers.
+
+    The database also holds short-lived generation leases, which let one worker
+    claim an uncached key while workers receiving the same request wait for the
+    result to appear instead of calling the model again.
+    """
+
+    COUNTERS = ('hits', 'misses', 'bypasses', 'stores', 'evictions', 'lease_waits', 'lease_wait_hits')
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: int = 6 * 60 * 60,
+                 max_entries: int = 500, enabled: bool = True):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._schema_ready = False
+
+    @classmethod
+    def from_env(cls) -> 'PlanCache':
+        """Create a cache configured from PLAN_CACHE_* environment variables."""
+        return cls(
+            path=os.getenv('PLAN_CACHE_PATH', DEFAULT_CACHE_PATH),
+            ttl=int(os.getenv('PLAN_CACHE_TTL', 6 * 60 * 60)),
+            max_entries=int(os.getenv('PLAN_CACHE_MAX_ENTRIES', 500)),
+            enabled=os.getenv('PLAN_CACHE_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, creating the schema on first use in this process."""
+        directory = os.path.dirname(self.path)
+        if directory and not self._schema_ready:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5)
+        if not self._schema_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS plan_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_plan_cache_accessed_at ON plan_cache (accessed_at)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS plan_cache_leases (
+                    cache_key TEXT PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS plan_cache_stats (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            conn.executemany(
+                "INSERT OR IGNORE INTO plan_cache_stats (name, value) VALUES (?, 0)",
+                [(name,) for name in self.COUNTERS]
+            )
+            conn.commit()
+            self._schema_ready = True
+        return conn
+
+    def _increment(self, conn: sqlite3.Connection, name: str, amount: int = 1):
+        conn.execute("UPDATE plan_cache_stats SET value = value + ? WHERE name = ?", (amount, name))
+
+    def get(self, key: str, record: bool = True) -> Optional[Dict]:
+        """Return the cached plan for ``key`` or None, counting the hit or miss when ``record`` is set."""
+        conn = None
+        try:
+            conn = self._connect()
+            now = time.time()
+            row = conn.execute(
+                "SELECT value FROM plan_cache WHERE cache_key = ? AND expires_at > ?",
+                (key, now)
+            ).fetchone()
+            if row is None:
+                if record:
+                    self._increment(conn, 'misses')
+                    conn.commit()
+                return None
+            conn.execute("UPDATE plan_cache SET accessed_at = ? WHERE cache_key = ?", (now, key))
+            if record:
+                self._increment(conn, 'hits')
+            conn.commit()
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Plan cache read failed: {e}")
+            return None
+        finally:
+            if conn:
+                conn.close()
+
+    def set(self, key: str, value: Dict):
+        """Store a plan and evict expired and least recently used entries."""
+        conn = None
+        try:
+            conn = self._connect()
+            now = time.time()
+            payload = json.dumps(value)
+            conn.execute(
+                "INSERT OR REPLACE INTO plan_cache (cache_key, value, size, created_at, accessed_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now, now + self.ttl)
+            )
+            self._increment(conn, 'stores')
+            evicted = conn.execute("DELETE FROM plan_cache WHERE expires_at <= ?", (now,)).rowcount
+            evicted += conn.execute(
+                "DELETE FROM plan_cache WHERE cache_key IN ("
+                "SELECT cache_key FROM plan_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            ).rowcount
+            if evicted:
+                self._increment(conn, 'evictions', evicted)
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"Plan cache write failed: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    def acquire_lease(self, key: str, ttl: float = 150) -> Optional[str]:
+        """Claim the right to generate ``key``; returns a lease token, or None if another worker holds it."""
+        conn = None
+        try:
+            conn = self._connect()
+            now = time.time()
+            token = f"{os.getpid()}:{uuid.uuid4().hex}"
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM plan_cache_leases WHERE cache_key = ? AND expires_at <= ?", (key, now))
+            acquired = conn.execute(
+                "INSERT OR IGNORE INTO plan_cache_leases (cache_key, owner, expires_at) VALUES (?, ?, ?)",
+                (key, token, now + ttl)
+            ).rowcount == 1
+            conn.commit()
+            return token if acquired else None
+        except sqlite3.Error as e:
+            # Without the shared store each worker simply generates its own plan
+            print(f"Plan cache lease acquire failed: {e}")
+            return f"{os.getpid()}:unleased"
+        finally:
+            if conn:
+                conn.close()
+
+    def release_lease(self, key: str, token: Optional[str]):
+        """Release a lease previously returned by :meth:`acquire_lease`."""
+        if not token:
+            return
+        conn = None
+        try:
+            conn = self._connect()
+            conn.execute("DELETE FROM plan_cache_leases WHERE cache_key = ? AND owner = ?", (key, token))
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"Plan cache lease release failed: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    def _lease_active(self, key: str) -> bool:
+        conn = None
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT 1 FROM plan_cache_leases WHERE cache_key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+            return row is not None
+        except sqlite3.Error:
+            return False
+        finally:
+            if conn:
+                conn.close()
+
+    def wait_for(self, key: str, timeout: float = 150, poll_interval: float = 0.25) -> Optional[Dict]:
+        """Wait for another worker's leased generation of ``key`` to land in the cache.
+
+        Returns None if the lease is released without a result (the other
+        worker failed) or the timeout passes, so the caller can generate itself.
+        """
+        self._record('lease_waits')
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            value = self.get(key, record=False)
+            if value is not None:
+                self._record('lease_wait_hits')
+                return value
+            if not self._lease_active(key):
+                # The lease may have been released just after the result was written
+                value = self.get(key, record=False)
+                if value is not None:
+                    self._record('lease_wait_hits')
+                return value
+            time.sleep(poll_interval)
+        return None
+
+    def _record(self, name: str):
+        conn = None
+        try:
+            conn = self._connect()
+            self._increment(conn, name)
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"Plan cache stats update failed: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    def record_bypass(self):
+        """Count a request that skipped the cache on purpose."""
+        self._record('bypasses')
+
+    def stats(self) -> Dict:
+        """Return the shared counters along with the current size of the cache."""
+        conn = None
+        try:
+            conn = self._connect()
+            stats = dict(conn.execute("SELECT name, value FROM plan_cache_stats").fetchall())
+            entries, total_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM plan_cache WHERE expires_at > ?",
+                (time.time(),)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Plan cache stats read failed: {e}")
+            stats, entries, total_bytes = {}, 0, 0
+        finally:
+            if conn:
+                conn.close()
+
+        lookups = stats.get('hits', 0) + stats.get('misses', 0)
+        stats.update({
+            'enabled': self.enabled,
+            'entries': entries,
+            'bytes': total_bytes,
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl,
+            'hit_rate': round(stats.get('hits', 0) / lookups, 4) if lookups else 0.0
+        })
+        return stats
+
+    def clear(self):
+        """Remove every cached plan and reset the counters."""
+        conn = None
+        try:
+            conn = self._connect()
+            conn.execute("DELETE FROM plan_cache")
+            conn.execute("DELETE FROM plan_cache_leases")
+            conn.execute("UPDATE plan_cache_stats SET value = 0")
+            conn.commit()
+        finally:
+            if conn:
+                conn.close()
+
+
+# Shared instance used by the trip planner
+plan_cache = PlanCache.from_env()
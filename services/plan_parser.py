@@ -0,0 +1,278 @@
+from typing import Dict, List, Optional
+import re
+
+# Matches the section layout required by TravelPlanGenerator._get_system_prompt
+DESTINATION_RE = re.compile(r'^DESTINATION\s+(\d+)\s*[-–—:]\s*(.*?)\s*:?\s*$', re.IGNORECASE)
+OPTION_RE = re.compile(r'^OPTION\s+([A-Z])\s*[-–—:]\s*(.*?)\s*:?\s*$', re.IGNORECASE)
+FIELD_RE = re.compile(r'^[-•*]?\s*([A-Za-z][A-Za-z /]*?)\s*:\s*(.*)$')
+CHECK_RE = re.compile(r'^[✓✔]\s*(.*?)\s*:\s*(.*)$')
+BULLET_RE = re.compile(r'^[•●▪-]\s*(.+)$')
+NUMBER_RE = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*([kKmM])?')
+FORMATTING_RE = re.compile(r'\*\*|</?b>|<br\s*/?>', re.IGNORECASE)
+
+# Section headers inside a destination, mapped to the keys they populate
+DESTINATION_SECTIONS = [
+    (re.compile(r'^DESTINATION SUMMARY', re.IGNORECASE), 'summary'),
+    (re.compile(r'^Why We Recommend', re.IGNORECASE), None),
+    (re.compile(r'^\d\.\s*Requirements Match', re.IGNORECASE), 'requirements'),
+    (re.compile(r'^\d\.\s*Seasonal Analysis', re.IGNORECASE), 'seasonal_analysis'),
+    (re.compile(r'^\d\.\s*Points Optimization', re.IGNORECASE), 'points_optimization'),
+]
+
+# Emoji-led sub-headers within the seasonal and points sections
+SUBSECTIONS = [
+    (re.compile(r'Weather Conditions', re.IGNORECASE), 'weather'),
+    (re.compile(r'Local Highlights', re.IGNORECASE), 'highlights'),
+    (re.compile(r'Award Availability', re.IGNORECASE), 'award_availability'),
+    (re.compile(r'Value Opportunities', re.IGNORECASE), 'value_opportunities'),
+]
+
+OPTION_SECTIONS = [
+    (re.compile(r'^Flight Details', re.IGNORECASE), 'flight'),
+    (re.compile(r'^Hotel Option', re.IGNORECASE), 'hotel'),
+    (re.compile(r'^Value Analysis', re.IGNORECASE), 'value'),
+]
+
+
+def parse_points(text: Optional[str]) -> Optional[int]:
+    """Return the first points figure in ``text`` ("60,000 points RT", "60k") as an int."""
+    if not text:
+        return None
+    match = NUMBER_RE.search(text)
+    if not match:
+        return None
+    value = float(match.group(1).replace(',', ''))
+    suffix = (match.group(2) or '').lower()
+    if suffix == 'k':
+        value *= 1000
+    elif suffix == 'm':
+        value *= 1000000
+    return int(round(value))
+
+
+def parse_dollars(text: Optional[str]) -> Optional[float]:
+    """Return the dollar amount in ``text`` ("Approx. $1,250") as a float."""
+    if not text:
+        return None
+    match = re.search(r'\$\s*(\d[\d,]*(?:\.\d+)?)', text) or NUMBER_RE.search(text)
+    if not match:
+        return None
+    return float(match.group(1).replace(',', ''))
+
+
+def _clean(line: str) -> str:
+    """Strip the bold markers and line breaks the model mixes into plain-text output."""
+    return FORMATTING_RE.sub('', line).strip()
+
+
+def _split_program(text: str):
+    """Split "40,000 points (World of Hyatt)" into its points and program name."""
+    match = re.search(r'\(([^)]*)\)\s*$', text)
+    program = match.group(1).strip() if match else None
+    return parse_points(text), program
+
+
+def _new_destination(index: int, name: str) -> Dict:
+    city, _, country = name.partition(',')
+    return {
+        'index': index,
+        'name': name,
+        'city': city.strip(),
+        'country': country.strip() or None,
+        'summary': '',
+        'requirements': [],
+        'seasonal_analysis': {'weather': [], 'highlights': []},
+        'points_optimization': {'award_availability': [], 'value_opportunities': []},
+        'options': []
+    }
+
+
+def _new_option(key: str, title: str) -> Dict:
+    upper_title = title.upper()
+    if 'ECONOMY' in upper_title:
+        tier = 'economy'
+    elif 'LUXURY' in upper_title:
+        tier = 'luxury'
+    else:
+        tier = title.split()[0].lower() if title else None
+    return {
+        'key': key.upper(),
+        'title': title,
+        'tier': tier,
+        'flight': {},
+        'hotel': {},
+        'value': {}
+    }
+
+
+def _apply_flight_field(flight: Dict, label: str, value: str):
+    if label == 'route':
+        flight['route'] = value
+    elif label == 'airline':
+        flight['airline'] = value
+    elif label == 'points program':
+        flight['points_program'] = value
+    elif label == 'points used':
+        flight['points_used_text'] = value
+        flight['points_used'] = parse_points(value)
+    elif label in ('fare class', 'fare type'):
+        flight['fare_class'] = value
+
+
+def _apply_hotel_field(hotel: Dict, label: str, value: str):
+    if label in ('property', 'hotel'):
+        hotel['property'] = value
+    elif label == 'points program':
+        hotel['points_program'] = value
+    elif label == 'total points needed':
+        hotel['total_points_text'] = value
+        hotel['total_points'] = parse_points(value)
+        per_night = re.search(r'(\d[\d,]*(?:\.\d+)?\s*[kK]?)\s*points?\s*per\s*night', value, re.IGNORECASE)
+        hotel['points_per_night'] = parse_points(per_night.group(1)) if per_night else None
+    elif label == 'property details':
+        hotel['details'] = value
+
+
+def _apply_value_field(value_analysis: Dict, label: str, value: str):
+    if label == 'total points used':
+        value_analysis['total_points_text'] = value
+        value_analysis['total_points'] = parse_points(value)
+    elif label == 'airline':
+        value_analysis['airline_points'], value_analysis['airline_program'] = _split_program(value)
+    elif label == 'hotel':
+        value_analysis['hotel_points'], value_analysis['hotel_program'] = _split_program(value)
+    elif label == 'dollar value saved':
+        value_analysis['dollar_value_text'] = value
+        value_analysis['dollar_value'] = parse_dollars(value)
+
+
+class PlanStreamParser:
+    """Incrementally parse the plan text format into structured destinations.
+
+    Feed text as it arrives from a streamed completion; each call returns the
+    destinations completed since the previous call (a destination completes
+    when the next one starts, or when the stream is closed).
+    """
+
+    def __init__(self):
+        self.destinations: List[Dict] = []
+        self._buffer = ''
+        self._destination = None
+        self._option = None
+        self._section = None
+        self._subsection = None
+        self._emitted = 0
+
+    @property
+    def plan(self) -> Dict:
+        """The plan parsed so far, including any destination still being written."""
+        return {'destinations': list(self.destinations)}
+
+    def feed(self, text: str) -> List[Dict]:
+        """Consume a chunk of model output and return newly completed destinations."""
+        self._buffer += text
+        *lines, self._buffer = self._buffer.split('\n')
+        for line in lines:
+            self._parse_line(line)
+        return self._take_completed(include_current=False)
+
+    def close(self) -> List[Dict]:
+        """Flush any buffered text and return the destinations not yet returned."""
+        if self._buffer:
+            self._parse_line(self._buffer)
+            self._buffer = ''
+        return self._take_completed(include_current=True)
+
+    def _take_completed(self, include_current: bool) -> List[Dict]:
+        completed = len(self.destinations) if include_current else max(0, len(self.destinations) - 1)
+        new_destinations = self.destinations[self._emitted:completed]
+        self._emitted = max(self._emitted, completed)
+        return new_destinations
+
+    def _parse_line(self, raw_line: str):
+        line = _clean(raw_line)
+        if not line:
+            return
+
+        match = DESTINATION_RE.match(line)
+        if match:
+            self._destination = _new_destination(int(match.group(1)), match.group(2).strip())
+            self.destinations.append(self._destination)
+            self._option = None
+            self._section = None
+            self._subsection = None
+            return
+
+        if self._destination is None:
+            # Ignore any preamble before the first destination
+            return
+
+        match = OPTION_RE.match(line)
+        if match:
+            self._option = _new_option(match.group(1), match.group(2).strip())
+            self._destination['options'].append(self._option)
+            self._section = None
+            return
+
+        if self._option is not None:
+            self._parse_option_line(line)
+            return
+
+        for pattern, section in DESTINATION_SECTIONS:
+            if pattern.match(line):
+                self._section = section
+                self._subsection = None
+                # The summary header may carry text on the same line
+                remainder = line.split(':', 1)[1].strip() if ':' in line else ''
+                if section == 'summary' and remainder:
+                    self._destination['summary'] = remainder
+                return
+
+        self._parse_destination_line(line)
+
+    def _parse_destination_line(self, line: str):
+        destination = self._destination
+        if self._section == 'summary':
+            destination['summary'] = f"{destination['summary']} {line}".strip()
+        elif self._section == 'requirements':
+            match = CHECK_RE.match(line)
+            if match:
+                destination['requirements'].append({'label': match.group(1), 'detail': match.group(2)})
+            elif destination['requirements']:
+                last = destination['requirements'][-1]
+                last['detail'] = f"{last['detail']} {line}".strip()
+        elif self._section in ('seasonal_analysis', 'points_optimization'):
+            for pattern, subsection in SUBSECTIONS:
+                if pattern.search(line):
+                    self._subsection = subsection
+                    return
+            match = BULLET_RE.match(line)
+            section = destination[self._section]
+            if match and self._subsection in section:
+                section[self._subsection].append(match.group(1).strip())
+
+    def _parse_option_line(self, line: str):
+        for pattern, section in OPTION_SECTIONS:
+            if pattern.match(line):
+                self._section = section
+                return
+
+        match = FIELD_RE.match(line)
+        if not match or self._section is None:
+            return
+        label = match.group(1).strip().lower()
+        value = match.group(2).strip()
+        if self._section == 'flight':
+            _apply_flight_field(self._option['flight'], label, value)
+        elif self._section == 'hotel':
+            _apply_hotel_field(self._option['hotel'], label, value)
+        elif self._section == 'value':
+            _apply_value_field(self._option['value'], label, value)
+
+
+def parse_travel_plan(text: str) -> Dict:
+    """Parse a complete plan into ``{'destinations': [...]}``."""
+    parser = PlanStreamParser()
+    parser.feed(text or '')
+    parser.close()
+    return parser.plan
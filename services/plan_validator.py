@@ -0,0 +1,321 @@
+from typing import Callable, Dict, List, Optional, Tuple
+import os
+import re
+import threading
+
+from services.airport_geo import airport_geo
+from services.plan_parser import parse_travel_plan
+from services.points_optimizer import points_optimizer
+
+# Loose forms of the headers the frontend splits on, and their exact spelling
+LOOSE_DESTINATION_RE = re.compile(r'^[\W_]*destination\s*#?\s*(\d+)\s*[-–—:.)]\s*(.+?)\s*:?\s*$', re.IGNORECASE)
+LOOSE_OPTION_RE = re.compile(r'^[\W_]*option\s+([AB])\b.*$', re.IGNORECASE)
+LOOSE_SUMMARY_RE = re.compile(r'^[\W_]*destination\s+summary\s*:?\s*(.*)$', re.IGNORECASE)
+OPTION_HEADERS = {
+    'A': 'OPTION A - ECONOMY EXPERIENCE',
+    'B': 'OPTION B - LUXURY EXPERIENCE',
+}
+MARKDOWN_RE = re.compile(r'\*\*|__')
+LABEL_RE = re.compile(r'^(.*?(total points used|airline|hotel)\s*(?:</b>)?)\s*:\s*(.*)$', re.IGNORECASE)
+PREMIUM_CABIN_RE = re.compile(r'premium|business|first', re.IGNORECASE)
+
+EXPECTED_DESTINATIONS = 2
+# Slack over the great-circle estimate before a destination counts as too far
+FLIGHT_LENGTH_TOLERANCE = 1.1
+
+# Issues fixed by rewriting the text, and issues that need the section regenerated
+LOCAL = 'local'
+REGENERATE = 'regenerate'
+
+
+def _issue(code: str, fix: str, message: str, destination: Optional[int] = None, option: Optional[str] = None) -> Dict:
+    return {'code': code, 'fix': fix, 'message': message, 'destination': destination, 'option': option}
+
+
+def split_sections(text: str) -> Tuple[str, List[str]]:
+    """Split plan text into the preamble and one block per DESTINATION header."""
+    preamble = []
+    sections = []
+    for line in text.split('\n'):
+        if LOOSE_DESTINATION_RE.match(line.strip()):
+            sections.append([line])
+        elif sections:
+            sections[-1].append(line)
+        else:
+            preamble.append(line)
+    return '\n'.join(preamble).strip(), ['\n'.join(section).strip() for section in sections]
+
+
+def normalize_section(section: str, position: int) -> Tuple[str, List[Dict]]:
+    """Rewrite headers to the exact spelling the frontend expects and strip markdown."""
+    repairs = []
+    lines = section.split('\n')
+
+    if MARKDOWN_RE.search(section):
+        lines = [MARKDOWN_RE.sub('', line) for line in lines]
+        repairs.append(_issue('markdown', LOCAL, "Removed markdown formatting", position))
+
+    match = LOOSE_DESTINATION_RE.match(lines[0].strip())
+    header = f"DESTINATION {position} - {match.group(2).rstrip(':').strip()}:"
+    if lines[0] != header:
+        if lines[0].strip() != header:
+            repairs.append(_issue('destination_header', LOCAL, f"Rewrote header as '{header}'", position))
+        lines[0] = header
+
+    for index, line in enumerate(lines[1:], start=1):
+        stripped = line.strip()
+        option = LOOSE_OPTION_RE.match(stripped)
+        if option:
+            expected = OPTION_HEADERS[option.group(1).upper()]
+            if stripped != expected:
+                lines[index] = expected
+                repairs.append(_issue('option_header', LOCAL, f"Rewrote header as '{expected}'", position,
+                                      option.group(1).upper()))
+            continue
+        summary = LOOSE_SUMMARY_RE.match(stripped)
+        if summary and stripped != 'DESTINATION SUMMARY:':
+            lines[index] = 'DESTINATION SUMMARY:' + (f"\n{summary.group(1)}" if summary.group(1) else '')
+            repairs.append(_issue('summary_header', LOCAL, "Rewrote header as 'DESTINATION SUMMARY:'", position))
+    return '\n'.join(lines), repairs
+
+
+def recompute_totals(section: str, destination: Dict) -> Tuple[str, List[Dict]]:
+    """Make each option's Value Analysis agree with its flight and hotel points."""
+    repairs = []
+    options = {option['key']: option for option in destination['options']}
+    lines = section.split('\n')
+    current = None
+    in_value = False
+    for index, line in enumerate(lines):
+        stripped = line.strip()
+        option = LOOSE_OPTION_RE.match(stripped)
+        if option:
+            current = options.get(option.group(1).upper())
+            in_value = False
+            continue
+        if stripped.lower().startswith('value analysis'):
+            in_value = True
+            continue
+        if current is None or not in_value:
+            continue
+        match = LABEL_RE.match(line)
+        if not match:
+            continue
+
+        flight_points = current['flight'].get('points_used')
+        hotel_points = current['hotel'].get('total_points')
+        label = match.group(2).lower()
+        value = current['value']
+        if label == 'total points used' and flight_points is not None and hotel_points is not None:
+            expected, actual, text = flight_points + hotel_points, value.get('total_points'), f"{flight_points + hotel_points:,} points"
+        elif label == 'airline' and flight_points is not None:
+            program = current['flight'].get('points_program') or value.get('airline_program')
+            expected, actual, text = flight_points, value.get('airline_points'), f"{flight_points:,} points ({program})"
+        elif label == 'hotel' and hotel_points is not None:
+            program = current['hotel'].get('points_program') or value.get('hotel_program')
+            expected, actual, text = hotel_points, value.get('hotel_points'), f"{hotel_points:,} points ({program})"
+        else:
+            continue
+        if actual != expected:
+            lines[index] = f"{match.group(1)}: {text}"
+            repairs.append(_issue('value_' + label.replace(' ', '_'), LOCAL,
+                                  f"Recomputed {match.group(2)} as {expected:,} (was {actual})",
+                                  destination['index'], current['key']))
+    return '\n'.join(lines), repairs
+
+
+def check_destination(destination: Dict, balances: Optional[Dict]) -> List[Dict]:
+    """Problems in a parsed destination that only regenerating it can fix."""
+    position = destination['index']
+    problems = []
+    options = {option['key']: option for option in destination['options']}
+    for key in OPTION_HEADERS:
+        option = options.get(key)
+        if option is None:
+            problems.append(_issue('missing_option', REGENERATE, f"Option {key} is missing", position, key))
+            continue
+        if option['flight'].get('points_used') is None or option['hotel'].get('total_points') is None:
+            problems.append(_issue('missing_points', REGENERATE,
+                                   f"Option {key} does not state both flight and hotel points", position, key))
+            continue
+        fare_class = option['flight'].get('fare_class') or ''
+        if key == 'B' and not PREMIUM_CABIN_RE.search(fare_class):
+            problems.append(_issue('luxury_cabin', REGENERATE,
+                                   "Option B must fly premium economy, business or first", position, key))
+        if balances:
+            check = points_optimizer.check_option(option, balances)
+            if check.get('checked') and not check.get('feasible'):
+                problems.append(_issue('exceeds_balances', REGENERATE,
+                                       f"Option {key} needs more points than the available balances allow",
+                                       position, key))
+    return problems
+
+
+def check_flight_length(destination: Dict, origins: Optional[List[str]], max_flight_hours: Optional[float]) -> List[Dict]:
+    """Flag a destination whose estimated flight time exceeds the trip's maximum."""
+    if not origins or not max_flight_hours:
+        return []
+    hours = airport_geo.city_flight_hours(origins, destination['city'], destination.get('country'))
+    if hours is None or hours <= max_flight_hours * FLIGHT_LENGTH_TOLERANCE:
+        return []
+    return [_issue('too_far', REGENERATE,
+                   f"{destination['name']} is about {hours:g} hours away, over the {max_flight_hours:g} hour limit",
+                   destination['index'])]
+
+
+class PlanValidator:
+    """Check generated plans against the required format and the user's balances.
+
+    Formatting slips and inconsistent totals are repaired in place. Problems
+    only the model can fix (missing sections, unaffordable options, the wrong
+    cabin) are sent back for that one destination to be regenerated, up to
+    ``max_regenerations`` per plan. Counters record how often each path is taken.
+    """
+
+    def __init__(self, enabled: bool = True, max_regenerations: int = 2):
+        self.enabled = enabled
+        self.max_regenerations = max_regenerations
+        self._lock = threading.Lock()
+        self.counters = {
+            'plans_checked': 0,
+            'valid': 0,
+            'repaired_locally': 0,
+            'sections_regenerated': 0,
+            'regenerations_failed': 0,
+            'unresolved': 0
+        }
+        self.issue_counts = {}
+
+    @classmethod
+    def from_env(cls) -> 'PlanValidator':
+        """Create a validator configured from PLAN_VALIDATION_* environment variables."""
+        return cls(
+            enabled=os.getenv('PLAN_VALIDATION_ENABLED', 'true').lower() in ('1', 'true', 'yes'),
+            max_regenerations=int(os.getenv('PLAN_VALIDATION_MAX_REGENERATIONS', 2))
+        )
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def _count_issues(self, issues: List[Dict]):
+        with self._lock:
+            for issue in issues:
+                self.issue_counts[issue['code']] = self.issue_counts.get(issue['code'], 0) + 1
+
+    def _review_section(self, section: str, position: int, balances: Optional[Dict],
+                        limits: Dict) -> Tuple[str, List[Dict], List[Dict]]:
+        """Normalize one destination block; returns (text, local repairs, remaining problems)."""
+        section, repairs = normalize_section(section, position)
+        destinations = parse_travel_plan(section)['destinations']
+        if not destinations:
+            return section, repairs, [_issue('unparseable', REGENERATE, "Destination could not be parsed", position)]
+        section, total_repairs = recompute_totals(section, destinations[0])
+        repairs += total_repairs
+        destination = parse_travel_plan(section)['destinations'][0]
+        problems = check_flight_length(destination, limits.get('origins'), limits.get('max_flight_hours'))
+        return section, repairs, problems + check_destination(destination, balances)
+
+    def review(self, text: str, balances: Optional[Dict] = None,
+               regenerate: Optional[Callable[[int, str, List[Dict], List[str]], str]] = None,
+               expected_destinations: int = EXPECTED_DESTINATIONS, origins: Optional[List[str]] = None,
+               max_flight_hours: Optional[float] = None) -> Dict:
+        """Validate and repair plan text.
+
+        ``regenerate(position, name, problems, other_names)`` returns a new
+        block for one destination; without it only local repairs are made.
+        With ``origins`` and ``max_flight_hours`` destinations beyond the
+        flight limit are treated as problems too.
+        Returns the repaired text, its parsed plan and a validation report.
+        """
+        self._count('plans_checked')
+        limits = {'origins': origins, 'max_flight_hours': max_flight_hours}
+        preamble, raw_sections = split_sections(text or '')
+        repairs = []
+        if preamble and raw_sections:
+            repairs.append(_issue('preamble', LOCAL, "Removed text before the first destination"))
+        if len(raw_sections) > expected_destinations:
+            repairs.append(_issue('extra_destination', LOCAL,
+                                  f"Dropped {len(raw_sections) - expected_destinations} extra destination(s)"))
+            raw_sections = raw_sections[:expected_destinations]
+
+        sections = []
+        problems = {}
+        for position, raw in enumerate(raw_sections, start=1):
+            section, section_repairs, section_problems = self._review_section(raw, position, balances, limits)
+            sections.append(section)
+            repairs += section_repairs
+            if section_problems:
+                problems[position] = section_problems
+        for position in range(len(sections) + 1, expected_destinations + 1):
+            sections.append('')
+            problems[position] = [_issue('missing_destination', REGENERATE, f"Destination {position} is missing", position)]
+
+        found = [issue for issues in problems.values() for issue in issues]
+        self._count_issues(repairs + found)
+
+        regenerated = []
+        if problems and regenerate:
+            for position in sorted(problems)[:self.max_regenerations]:
+                names = [self._destination_name(section) for section in sections]
+                others = [name for index, name in enumerate(names, start=1) if index != position and name]
+                try:
+                    new_text = regenerate(position, names[position - 1], problems[position], others)
+                except Exception as e:
+                    print(f"Regenerating destination {position} failed: {str(e)}")
+                    self._count('regenerations_failed')
+                    continue
+                _, new_sections = split_sections(new_text or '')
+                if not new_sections:
+                    self._count('regenerations_failed')
+                    continue
+                section, section_repairs, section_problems = self._review_section(new_sections[0], position, balances, limits)
+                # Keep whichever version has fewer problems
+                if len(section_problems) < len(problems[position]):
+                    sections[position - 1] = section
+                    repairs += section_repairs
+                    regenerated.append(position)
+                    self._count('sections_regenerated')
+                    if section_problems:
+                        problems[position] = section_problems
+                    else:
+                        del problems[position]
+                else:
+                    self._count('regenerations_failed')
+
+        content = '\n\n'.join(section for section in sections if section)
+        remaining = [issue for issues in problems.values() for issue in issues]
+        if remaining:
+            status = 'invalid'
+            self._count('unresolved')
+        elif repairs or regenerated:
+            status = 'repaired'
+        else:
+            status = 'valid'
+            self._count('valid')
+        if repairs:
+            self._count('repaired_locally')
+
+        return {
+            'text': content,
+            'plan': parse_travel_plan(content),
+            'validation': {
+                'status': status,
+                'repairs': repairs,
+                'regenerated': regenerated,
+                'issues': remaining
+            }
+        }
+
+    def _destination_name(self, section: str) -> Optional[str]:
+        match = LOOSE_DESTINATION_RE.match(section.split('\n', 1)[0].strip()) if section else None
+        return match.group(2).rstrip(':').strip() if match else None
+
+    def stats(self) -> Dict:
+        """Counters for this process, including how often each issue was seen."""
+        with self._lock:
+            return {**self.counters, 'issues': dict(self.issue_counts), 'enabled': self.enabled}
+
+
+# Shared by every trip generation in this worker
+plan_validator = PlanValidator.from_env()
@@ -0,0 +1,430 @@
+from itertools import product
+from typing import Dict, List, Optional, Tuple
+import math
+
+from services.transfer_graph import BANK, TRANSFER_INCREMENT, TransferGraph, transfer_graph
+
+OBJECTIVES = ('points', 'value')
+
+# Cartesian products of candidate awards larger than this are rejected
+MAX_BUNDLES = 400
+
+# Cap on branch-and-bound nodes per bundle; the best allocation found so far,
+# at worst the greedy one, is used past it
+MAX_BRANCH_NODES = 60
+
+# Nudges ties towards spending a program's own points before transferring
+TRANSFER_TIE_BREAK = 1e-6
+
+EPSILON = 1e-9
+
+
+def _is_points(value) -> bool:
+    """A finite, non-negative number of points (JSON allows NaN and Infinity)."""
+    return (isinstance(value, (int, float)) and not isinstance(value, bool)
+            and math.isfinite(value) and value >= 0)
+
+
+class OptimizationError(ValueError):
+    """Raised for malformed optimizer input."""
+    pass
+
+
+def _solve_max_lp(objective: List[float], rows: List[List[float]], limits: List[float]) -> Optional[Tuple[float, List[float]]]:
+    """Maximize ``objective . z`` subject to ``rows . z <= limits`` and ``z >= 0``.
+
+    ``limits`` must be non-negative so the origin is feasible. Returns the
+    optimum and the shadow price of every row (the solution of the dual
+    problem), or None if the problem is unbounded. Bland's rule keeps the
+    pivoting from cycling on degenerate inputs.
+    """
+    m, n = len(rows), len(objective)
+    tableau = [row[:] + [1.0 if i == j else 0.0 for j in range(m)] + [limits[i]] for i, row in enumerate(rows)]
+    cost = [-c for c in objective] + [0.0] * m + [0.0]
+    basis = [n + i for i in range(m)]
+
+    while True:
+        entering = next((j for j in range(n + m) if cost[j] < -EPSILON), None)
+        if entering is None:
+            break
+        leaving = None
+        best_ratio = None
+        for i in range(m):
+            coefficient = tableau[i][entering]
+            if coefficient > EPSILON:
+                ratio = tableau[i][-1] / coefficient
+                if (best_ratio is None or ratio < best_ratio - EPSILON
+                        or (abs(ratio - best_ratio) <= EPSILON and basis[i] < basis[leaving])):
+                    best_ratio = ratio
+                    leaving = i
+        if leaving is None:
+            return None
+
+        pivot_row = tableau[leaving]
+        pivot = pivot_row[entering]
+        for j in range(len(pivot_row)):
+            pivot_row[j] /= pivot
+        for i in range(m):
+            if i != leaving and abs(tableau[i][entering]) > EPSILON:
+                factor = tableau[i][entering]
+                row = tableau[i]
+                for j in range(len(row)):
+                    row[j] -= factor * pivot_row[j]
+        factor = cost[entering]
+        for j in range(len(cost)):
+            cost[j] -= factor * pivot_row[j]
+        basis[leaving] = entering
+
+    return cost[-1], [max(0.0, cost[n + i]) for i in range(m)]
+
+
+class PointsOptimizer:
+    """Choose award bundles and fund them from a points portfolio at least cost.
+
+    Every balance is a source: a program's own points fund that program at 1:1,
+    and bank points fund any transfer partner at the partner's ratio. Funding a
+    set of award costs is a small integer program (minimize points spent, or
+    value used, subject to each balance, in whole transfer increments), solved
+    by branch and bound over its linear relaxation.
+    """
+
+    def __init__(self, graph: TransferGraph = transfer_graph):
+        self.graph = graph
+
+    def _resolve_balances(self, balances: Dict[str, int]) -> Dict[str, int]:
+        resolved = {}
+        for name, points in balances.items():
+            program = self.graph.resolve(name)
+            if isinstance(points, str) and points.strip().isdigit():
+                points = int(points)
+            if points is not None and not _is_points(points):
+                raise OptimizationError(f"Invalid points balance for {name}")
+            points = int(points or 0)
+            if program is not None and points > 0:
+                resolved[program.name] = resolved.get(program.name, 0) + points
+        return resolved
+
+    def _arcs(self, balances: Dict[str, int], targets: List[str]) -> List[Dict]:
+        """Every (source, target) pair that can move points, with its ratio."""
+        arcs = []
+        for source, points in balances.items():
+            is_bank = self.graph.programs[source].kind == BANK
+            routes = self.graph.routes.get(source, {})
+            # Banks transfer in whole increments, so a remainder below one block is unusable
+            usable = points - points % TRANSFER_INCREMENT if is_bank else points
+            for index, target in enumerate(targets):
+                if source == target:
+                    arcs.append({'source': source, 'target': index, 'ratio': 1.0, 'direct': True, 'usable': points})
+                elif target in routes and usable > 0:
+                    arcs.append({'source': source, 'target': index, 'ratio': routes[target].ratio,
+                                 'direct': False, 'usable': usable})
+        return arcs
+
+    def _unit_cost(self, source: str, direct: bool, objective: str, tie_break: bool = True) -> float:
+        if objective == 'value':
+            cost = self.graph.programs[source].value_cpp
+        else:
+            cost = 1.0
+        return cost if direct or not tie_break else cost + TRANSFER_TIE_BREAK
+
+    def fund(self, balances: Dict[str, int], needs: List[Tuple[str, int]], objective: str = 'points',
+             cutoff: Optional[float] = None) -> Optional[Dict]:
+        """Cheapest way to fund every ``(program, points)`` in ``needs`` from ``balances``.
+
+        Returns None when the balances cannot cover all of the needs at once,
+        or when nothing beats ``cutoff`` (the cost of a known alternative).
+        """
+        funded = self._fund(self._resolve_balances(balances), needs, objective, cutoff)
+        return funded[0] if funded else None
+
+    def _fund(self, balances: Dict[str, int], needs: List[Tuple[str, int]], objective: str,
+              cutoff: Optional[float]) -> Optional[Tuple[Dict, float]]:
+        """fund() for resolved balances; returns the allocation and its internal score.
+
+        The internal score includes the transfer tie-break and is what
+        cutoffs compare against; the allocation reports the cost without it.
+        """
+        targets = []
+        demands = []
+        for name, points in needs:
+            program = self.graph.resolve(name)
+            if program is None:
+                return None
+            targets.append(program.name)
+            demands.append(int(points))
+
+        arcs = self._arcs(balances, targets)
+        if not arcs:
+            if any(demands):
+                return None
+            return {**self._allocation(balances, targets, demands, [], []), 'score': 0.0}, 0.0
+
+        # Greedy funding from the cheapest sources is the first incumbent: it prunes the
+        # search and is the answer if the node cap is reached before anything better
+        best = self._complete(demands, arcs, [0] * len(arcs), objective)
+        best_score = self._score(arcs, best, objective) if best is not None else None
+        if best_score is not None and cutoff is not None and best_score >= cutoff - EPSILON:
+            best, best_score = None, cutoff
+        elif best_score is None:
+            best_score = cutoff
+
+        # Branch and bound on transfers that the relaxation splits mid-increment
+        stack = [({}, {})]
+        nodes = 0
+        while stack and nodes < MAX_BRANCH_NODES:
+            lower, upper = stack.pop()
+            nodes += 1
+            solution = self._solve_relaxation(arcs, demands, objective, lower, upper)
+            if solution is None:
+                continue
+            bound, flows = solution
+            # A gap no larger than the tie-break could only reorder equal-cost sources, so stop there
+            if best_score is not None and bound >= best_score - EPSILON - TRANSFER_TIE_BREAK * abs(best_score):
+                continue
+
+            amounts = self._complete(demands, arcs, self._round_down(arcs, flows), objective)
+            if amounts is not None:
+                score = self._score(arcs, amounts, objective)
+                if best_score is None or score < best_score - EPSILON:
+                    best, best_score = amounts, score
+
+            fractional = [
+                (abs(flow / TRANSFER_INCREMENT - round(flow / TRANSFER_INCREMENT)), i)
+                for i, (arc, flow) in enumerate(zip(arcs, flows))
+                if not arc['direct'] and abs(flow / TRANSFER_INCREMENT - round(flow / TRANSFER_INCREMENT)) > 1e-6
+            ]
+            if not fractional:
+                continue
+            _, index = max(fractional)
+            blocks = math.floor(flows[index] / TRANSFER_INCREMENT)
+            stack.append(({**lower, index: (blocks + 1) * TRANSFER_INCREMENT}, upper))
+            stack.append((lower, {**upper, index: blocks * TRANSFER_INCREMENT}))
+
+        if best is None:
+            return None
+        cost = self._score(arcs, best, objective, tie_break=False)
+        # Value costs are worked out in cents; report them in dollars, like value_used
+        score = round(cost / 100 if objective == 'value' else cost, 2)
+        return {**self._allocation(balances, targets, demands, arcs, best), 'score': score}, best_score
+
+    def _solve_relaxation(self, arcs: List[Dict], demands: List[int], objective: str,
+                          lower: Dict[int, int], upper: Dict[int, int]) -> Optional[Tuple[float, List[float]]]:
+        """Solve the fractional funding problem; returns (minimum cost, points moved per arc).
+
+        The primal is: minimize sum(cost * y) subject to sum(ratio * y) >= demand
+        for each need, sum(y) <= balance for each source and any branch bounds on
+        y. Its dual starts from a feasible origin, so it is solved instead and
+        the flows are read back from the dual's shadow prices.
+        """
+        sources = sorted({arc['source'] for arc in arcs})
+        source_index = {source: i for i, source in enumerate(sources)}
+        supplies = {arc['source']: arc['usable'] for arc in arcs}
+        bounded = [(i, -1.0, -float(limit)) for i, limit in upper.items()]
+        bounded += [(i, 1.0, float(limit)) for i, limit in lower.items()]
+
+        # Dual variables: demand prices, supply prices, then one per branch bound
+        objective_row = [float(demand) for demand in demands]
+        objective_row += [-float(supplies[source]) for source in sources]
+        objective_row += [value for _, _, value in bounded]
+        offset = len(demands) + len(sources)
+        rows = []
+        limits = []
+        for i, arc in enumerate(arcs):
+            row = [0.0] * (offset + len(bounded))
+            row[arc['target']] = arc['ratio']
+            row[len(demands) + source_index[arc['source']]] = -1.0
+            for column, (bounded_arc, sign, _) in enumerate(bounded):
+                if bounded_arc == i:
+                    row[offset + column] = sign
+            rows.append(row)
+            limits.append(self._unit_cost(arc['source'], arc['direct'], objective))
+        return _solve_max_lp(objective_row, rows, limits)
+
+    def _round_down(self, arcs: List[Dict], flows: List[float]) -> List[int]:
+        amounts = []
+        for arc, flow in zip(arcs, flows):
+            step = 1 if arc['direct'] else TRANSFER_INCREMENT
+            amounts.append(math.floor(flow / step + 1e-6) * step)
+        return amounts
+
+    def _score(self, arcs: List[Dict], amounts: List[int], objective: str, tie_break: bool = True) -> float:
+        return sum(amount * self._unit_cost(arc['source'], arc['direct'], objective, tie_break)
+                   for arc, amount in zip(arcs, amounts))
+
+    def _complete(self, demands: List[int], arcs: List[Dict], amounts: List[int],
+                  objective: str) -> Optional[List[int]]:
+        """Top up short needs from the cheapest spare capacity, then drop any surplus units."""
+        used = {}
+        for arc, amount in zip(arcs, amounts):
+            used[arc['source']] = used.get(arc['source'], 0) + amount
+        if any(used[arc['source']] > arc['usable'] for arc in arcs):
+            return None
+
+        for target, demand in enumerate(demands):
+            indexes = sorted(
+                (i for i, arc in enumerate(arcs) if arc['target'] == target),
+                key=lambda i: self._unit_cost(arcs[i]['source'], arcs[i]['direct'], objective) / arcs[i]['ratio']
+            )
+            received = sum(int(amounts[i] * arcs[i]['ratio']) for i in indexes)
+            for i in indexes:
+                if received >= demand:
+                    break
+                arc = arcs[i]
+                step = 1 if arc['direct'] else TRANSFER_INCREMENT
+                spare = arc['usable'] - used[arc['source']]
+                extra = min(spare - spare % step, math.ceil((demand - received) / arc['ratio'] / step) * step)
+                if extra <= 0:
+                    continue
+                received += int((amounts[i] + extra) * arc['ratio']) - int(amounts[i] * arc['ratio'])
+                amounts[i] += extra
+                used[arc['source']] += extra
+            if received < demand:
+                return None
+
+            # Shed the most expensive units that the need no longer requires
+            for i in reversed(indexes):
+                arc = arcs[i]
+                step = 1 if arc['direct'] else TRANSFER_INCREMENT
+                surplus = received - demand
+                removable = min(amounts[i] // step, int(surplus // (arc['ratio'] * step)))
+                if removable > 0:
+                    received -= int(amounts[i] * arc['ratio']) - int((amounts[i] - removable * step) * arc['ratio'])
+                    amounts[i] -= removable * step
+        return amounts
+
+    def _allocation(self, balances: Dict[str, int], targets: List[str], demands: List[int],
+                    arcs: List[Dict], amounts: List[int]) -> Dict:
+        steps = []
+        remaining = dict(balances)
+        value_used = 0.0
+        for arc, amount in zip(arcs, amounts):
+            if amount <= 0:
+                continue
+            remaining[arc['source']] -= amount
+            value_used += amount * self.graph.programs[arc['source']].value_cpp
+            steps.append({
+                'source': arc['source'],
+                'target': targets[arc['target']],
+                'direct': arc['direct'],
+                'ratio': arc['ratio'],
+                'points': amount,
+                'received': int(amount * arc['ratio'])
+            })
+        steps.sort(key=lambda step: (targets.index(step['target']), not step['direct'], step['source']))
+        return {
+            'needs': [{'program': target, 'points': demand} for target, demand in zip(targets, demands)],
+            'steps': steps,
+            'points_spent': sum(step['points'] for step in steps),
+            'value_used': round(value_used / 100, 2),
+            'remaining_balances': remaining
+        }
+
+    def optimize(self, balances: Dict[str, int], candidate_groups: List[List[Dict]],
+                 objective: str = 'points') -> Dict:
+        """Pick one award from each group (e.g. flights, hotels) and fund the bundle at least cost.
+
+        Each candidate is ``{'program': ..., 'points': ...}`` plus any extra
+        fields, which are passed through. Returns the best bundle, or
+        ``{'feasible': False}`` when no combination fits the balances. Its
+        ``score`` is the points spent, or for the 'value' objective the
+        dollars of value used (the same unit as ``value_used``).
+        """
+        if objective not in OBJECTIVES:
+            raise OptimizationError(f"Objective must be one of: {', '.join(OBJECTIVES)}")
+        if not all(isinstance(group, list) for group in candidate_groups):
+            raise OptimizationError("Award candidates must be sent as lists")
+        groups = [group for group in candidate_groups if group]
+        if not groups:
+            raise OptimizationError("At least one award candidate is required")
+        for group in groups:
+            for candidate in group:
+                if not isinstance(candidate, dict) or not candidate.get('program') or not _is_points(candidate.get('points')):
+                    raise OptimizationError("Each candidate needs a program and a non-negative points cost")
+                if self.graph.resolve(candidate['program']) is None:
+                    raise OptimizationError(f"Unknown points program: {candidate['program']}")
+        if math.prod(len(group) for group in groups) > MAX_BUNDLES:
+            raise OptimizationError(f"Too many candidate combinations (limit {MAX_BUNDLES})")
+
+        resolved = self._resolve_balances(balances)
+        rates = self._cheapest_rates(resolved, objective)
+        # Cheapest-looking bundles first: a good incumbent early lets the rest be skipped on their bound alone
+        bundles = []
+        for bundle in product(*groups):
+            needs = self._merge_needs(bundle)
+            bound = sum(points * rates.get(name, math.inf) for name, points in needs if points)
+            if bound < math.inf:
+                bundles.append((bound, needs, bundle))
+        bundles.sort(key=lambda item: item[0])
+
+        best = None
+        best_score = None
+        evaluated = math.prod(len(group) for group in groups)
+        for bound, needs, bundle in bundles:
+            if best_score is not None and bound >= best_score - EPSILON:
+                break
+            funded = self._fund(resolved, needs, objective, cutoff=best_score)
+            if funded is None:
+                continue
+            allocation, best_score = funded
+            best = {'bundle': list(bundle), **allocation}
+
+        if best is None:
+            return {'feasible': False, 'objective': objective, 'bundles_evaluated': evaluated}
+        return {'feasible': True, 'objective': objective, 'bundles_evaluated': evaluated, **best}
+
+    def _cheapest_rates(self, balances: Dict[str, int], objective: str) -> Dict[str, float]:
+        """Lowest cost per point delivered to each program reachable from ``balances``.
+
+        Funding ``points`` of a program costs at least ``points`` times its rate,
+        whatever else the bundle needs, so this bounds a bundle from below.
+        """
+        rates = {}
+        for source in balances:
+            options = [(source, 1.0, True)]
+            options += [(target, route.ratio, False) for target, route in self.graph.routes.get(source, {}).items()]
+            for target, ratio, direct in options:
+                rate = self._unit_cost(source, direct, objective) / ratio
+                if rate < rates.get(target, math.inf):
+                    rates[target] = rate
+        return rates
+
+    def _merge_needs(self, bundle) -> List[Tuple[str, int]]:
+        """Combine awards from the same program into a single need."""
+        merged = {}
+        for candidate in bundle:
+            name = self.graph.resolve(candidate['program']).name
+            merged[name] = merged.get(name, 0) + int(math.ceil(candidate['points']))
+        return list(merged.items())
+
+    def check_option(self, option: Dict, balances: Dict[str, int], objective: str = 'points') -> Dict:
+        """Check that a parsed plan option's flight and hotel can be booked with ``balances``.
+
+        ``option`` uses the shape produced by services.plan_parser. Programs
+        the graph does not know are reported rather than guessed at.
+        """
+        if not isinstance(option, dict):
+            raise OptimizationError("The option must be an object with flight and hotel details")
+        needs = []
+        unknown = []
+        for section, points_key in (('flight', 'points_used'), ('hotel', 'total_points')):
+            details = option.get(section) or {}
+            if not isinstance(details, dict):
+                raise OptimizationError(f"The option's {section} must be an object")
+            program_name = details.get('points_program')
+            points = details.get(points_key)
+            if not program_name or points is None:
+                continue
+            program = self.graph.resolve(program_name)
+            if program is None:
+                unknown.append(program_name)
+                continue
+            needs.append({'program': program.name, 'points': points})
+
+        if unknown or not needs:
+            return {'checked': False, 'unknown_programs': unknown}
+        result = self.optimize(balances, [[need] for need in needs], objective)
+        return {'checked': True, 'unknown_programs': [], **result}
+
+
+# Stateless; shared so the transfer graph's memoized routes are reused
+points_optimizer = PointsOptimizer()
@@ -0,0 +1,318 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+import os
+import random
+import threading
+import time
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
+    RateLimitError,
+)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the provider while the circuit breaker is open."""
+
+    def __init__(self, retry_after: float):
+        self.retry_after = max(0.0, retry_after)
+        super().__init__(f"AI service circuit is open; retry in {self.retry_after:.0f}s")
+
+
+class EmptyCompletionError(ValueError):
+    """Raised when the provider returns a completion with no content."""
+    pass
+
+
+# Failures worth retrying: the same request may well succeed a moment later
+RETRYABLE_ERRORS = (
+    RateLimitError,
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
+    TimeoutError,
+    EmptyCompletionError,
+)
+
+
+class RetryPolicy:
+    """Capped exponential backoff with full jitter."""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def is_retryable(self, error: Exception) -> bool:
+        return isinstance(error, RETRYABLE_ERRORS)
+
+    def delay(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """Seconds to sleep before retry number ``attempt`` (starting at 1).
+
+        Full jitter spreads retries from many greenlets across the whole window
+        instead of having them all hit the provider again at the same moment.
+        A Retry-After header from a rate limit response sets the minimum wait.
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        delay = random.uniform(0, ceiling)
+        retry_after = _retry_after_seconds(error)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+
+def _retry_after_seconds(error: Optional[Exception]) -> Optional[float]:
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """Fail fast while the provider is unhealthy.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and calls
+    are rejected for ``recovery_timeout`` seconds. It then half-opens and lets a
+    limited number of trial calls through: a success closes it again, a failure
+    re-opens it. One breaker is shared by every greenlet in a worker process.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 half_open_max_calls: int = 1, on_transition: Optional[Callable[[str, str], None]] = None):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.on_transition = on_transition
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _transition(self, new_state: str):
+        old_state = self._state
+        if old_state == new_state:
+            return
+        self._state = new_state
+        if new_state == OPEN:
+            self._opened_at = time.monotonic()
+        if new_state == HALF_OPEN:
+            self._half_open_calls = 0
+        if new_state == CLOSED:
+            self._failures = 0
+        if self.on_transition:
+            self.on_transition(old_state, new_state)
+
+    def _refresh(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._transition(HALF_OPEN)
+
+    def before_call(self):
+        """Raise CircuitOpenError if the call should not be attempted."""
+        with self._lock:
+            self._refresh()
+            if self._state == OPEN:
+                raise CircuitOpenError(self.recovery_timeout - (time.monotonic() - self._opened_at))
+            if self._state == HALF_OPEN:
+                if self._half_open_calls >= self.half_open_max_calls:
+                    raise CircuitOpenError(1.0)
+                self._half_open_calls += 1
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            if self._state == HALF_OPEN:
+                self._transition(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._transition(OPEN)
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies."""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(fraction * len(samples)))
+        return samples[index]
+
+    def __len__(self):
+        return len(self._samples)
+
+
+class ResilientCaller:
+    """Wrap provider calls with retries, a circuit breaker and optional hedging.
+
+    Hedging starts a duplicate request once the primary has been running longer
+    than the configured latency percentile and returns whichever finishes first.
+    It trades extra provider spend for tail latency, so it is off by default.
+    """
+
+    def __init__(self, retry_policy: RetryPolicy, breaker: CircuitBreaker,
+                 hedge_enabled: bool = False, hedge_percentile: float = 0.95,
+                 hedge_min_samples: int = 20):
+        self.retry_policy = retry_policy
+        self.breaker = breaker
+        self.breaker.on_transition = self._on_transition
+        self.hedge_enabled = hedge_enabled
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.latency = LatencyTracker()
+        self._hedge_executor = None
+        self._lock = threading.Lock()
+        self.counters = {
+            'calls': 0,
+            'successes': 0,
+            'failures': 0,
+            'retries': 0,
+            'short_circuits': 0,
+            'hedges': 0,
+            'hedge_wins': 0
+        }
+        self.transitions = deque(maxlen=20)
+
+    @classmethod
+    def from_env(cls) -> 'ResilientCaller':
+        """Create a caller configured from LLM_* environment variables."""
+        return cls(
+            retry_policy=RetryPolicy(
+                max_attempts=int(os.getenv('LLM_RETRY_MAX_ATTEMPTS', 3)),
+                base_delay=float(os.getenv('LLM_RETRY_BASE_DELAY', 0.5)),
+                max_delay=float(os.getenv('LLM_RETRY_MAX_DELAY', 8))
+            ),
+            breaker=CircuitBreaker(
+                failure_threshold=int(os.getenv('LLM_BREAKER_FAILURE_THRESHOLD', 5)),
+                recovery_timeout=float(os.getenv('LLM_BREAKER_RECOVERY_SECONDS', 30))
+            ),
+            hedge_enabled=os.getenv('LLM_HEDGE_ENABLED', 'false').lower() in ('1', 'true', 'yes'),
+            hedge_percentile=float(os.getenv('LLM_HEDGE_PERCENTILE', 0.95)),
+            hedge_min_samples=int(os.getenv('LLM_HEDGE_MIN_SAMPLES', 20))
+        )
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def _on_transition(self, old_state: str, new_state: str):
+        print(f"LLM circuit breaker: {old_state} -> {new_state}")
+        self.transitions.append({'from': old_state, 'to': new_state, 'at': time.time()})
+
+    def call(self, fn: Callable[[], Any], hedge: bool = True) -> Any:
+        """Call ``fn`` under the retry, circuit breaker and hedging policies."""
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                self._count('short_circuits')
+                raise
+
+            self._count('calls')
+            started = time.monotonic()
+            try:
+                result = self._call_hedged(fn) if hedge and self.hedge_enabled else fn()
+            except Exception as e:
+                retryable = self.retry_policy.is_retryable(e)
+                # Client-side mistakes (bad request, auth) still mean the provider answered
+                if retryable:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                self._count('failures')
+                if not retryable or attempt >= self.retry_policy.max_attempts:
+                    raise
+                delay = self.retry_policy.delay(attempt, e)
+                print(f"Attempt {attempt} failed: {str(e)}; retrying in {delay:.2f}s")
+                self._count('retries')
+                time.sleep(delay)
+                continue
+
+            self.latency.record(time.monotonic() - started)
+            self.breaker.record_success()
+            self._count('successes')
+            return result
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(thread_name_prefix='llm-hedge')
+            return self._hedge_executor
+
+    def _call_hedged(self, fn: Callable[[], Any]) -> Any:
+        if len(self.latency) < self.hedge_min_samples:
+            return fn()
+        threshold = self.latency.percentile(self.hedge_percentile)
+
+        executor = self._get_hedge_executor()
+        primary = executor.submit(fn)
+        done, _ = wait([primary], timeout=threshold)
+        if done:
+            return primary.result()
+
+        self._count('hedges')
+        hedge = executor.submit(fn)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self._count('hedge_wins')
+                    # The slower request is left to finish in the background and discarded
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def stats(self) -> Dict:
+        """Counters, breaker state and recent transitions for this process."""
+        with self._lock:
+            counters = dict(self.counters)
+        p50 = self.latency.percentile(0.5)
+        hedge_threshold = self.latency.percentile(self.hedge_percentile)
+        return {
+            **counters,
+            'breaker_state': self.breaker.state,
+            'transitions': list(self.transitions),
+            'latency_seconds': {
+                'p50': round(p50, 3) if p50 is not None else None,
+                'hedge_threshold': round(hedge_threshold, 3) if hedge_threshold is not None else None,
+                'samples': len(self.latency)
+            },
+            'hedge_enabled': self.hedge_enabled
+        }
+
+
+# Shared by every trip generation in this worker
+llm_resilience = ResilientCaller.from_env()
@@ -0,0 +1,157 @@
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, TextIO
+import json
+import time
+
+from slugify import slugify
+
+from models import db
+from models.review import Review, content_hash, render_markdown
+
+DEFAULT_BATCH_SIZE = 500
+READ_SIZE = 64 * 1024
+DEFAULT_AUTHOR = "Go Ask Marshall"
+REQUIRED_FIELDS = ('title', 'location', 'summary', 'content')
+DATE_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d")
+
+
+class ReviewImportError(ValueError):
+    """Raised for an import file that is not a JSON array of valid reviews."""
+    pass
+
+
+def iter_json_array(f: TextIO, read_size: int = READ_SIZE) -> Iterator[Dict]:
+    """Yield the objects of a top-level JSON array one at a time.
+
+    Only the current object and one read's worth of text are held in
+    memory, so exports of any size stream through.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    state = 'start'
+
+    while True:
+        while position < len(buffer) and buffer[position].isspace():
+            position += 1
+        if position == len(buffer):
+            buffer, position = f.read(read_size), 0
+            if not buffer:
+                raise ReviewImportError("Unexpected end of file; the JSON array is not closed")
+            continue
+
+        char = buffer[position]
+        if state == 'start':
+            if char != '[':
+                raise ReviewImportError("Expected a JSON array of reviews")
+            position += 1
+            state = 'item'
+            continue
+        if char == ']':
+            return
+        if state == 'separator':
+            if char != ',':
+                raise ReviewImportError("Expected ',' or ']' between reviews")
+            position += 1
+            state = 'item'
+            continue
+
+        try:
+            item, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as e:
+            # Most likely the object runs past what has been read so far
+            chunk = f.read(read_size)
+            if not chunk:
+                raise ReviewImportError(f"Invalid JSON: {e.msg}")
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        if not isinstance(item, dict):
+            raise ReviewImportError("Every item in the array must be a review object")
+        yield item
+        state = 'separator'
+
+
+def _parse_date(value) -> Optional[datetime]:
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(str(value), date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def review_row(data: Dict, now: datetime) -> Dict:
+    """Column values for one exported review; its HTML is rendered when the batch is written."""
+    missing = [field for field in REQUIRED_FIELDS if not data.get(field)]
+    if missing:
+        raise ReviewImportError(f"Review '{data.get('title', '?')}' is missing {', '.join(missing)}")
+    content = data['content']
+    return {
+        'title': data['title'],
+        'slug': data.get('slug') or slugify(data['title']),
+        'location': data['location'],
+        'summary': data['summary'],
+        'content': content,
+        'image': data.get('image'),
+        'author': data.get('author') or DEFAULT_AUTHOR,
+        'is_published': bool(data.get('is_published', True)),
+        'rendered_html': None,
+        'content_hash': content_hash(content),
+        'created_at': _parse_date(data['created_at']) if data.get('created_at') else now,
+        'updated_at': _parse_date(data['updated_at']) if data.get('updated_at') else now,
+    }
+
+
+def _write_batch(rows: List[Dict], update: bool, render: bool, counts: Dict):
+    if not rows:
+        return
+    # A slug repeated within a batch keeps the last copy; one statement cannot touch a row twice
+    batch = list({row['slug']: row for row in rows}.values())
+    existing = Review.content_hashes([row['slug'] for row in batch])
+    for row in batch:
+        # Render only what will be written with new content; unchanged reviews keep their stored HTML
+        changed = row['slug'] not in existing or (update and existing[row['slug']] != row['content_hash'])
+        if changed and render:
+            row['rendered_html'] = render_markdown(row['content'])
+            counts['rendered'] += 1
+        elif changed:
+            # No stored HTML matches this content yet, which is what backfill_review_html.py looks for
+            row['content_hash'] = None
+    Review.bulk_upsert(batch, update=update)
+    counts['added'] += len(batch) - len(existing)
+    counts['updated' if update else 'skipped'] += len(existing)
+
+
+def import_reviews_file(path: str, batch_size: int = DEFAULT_BATCH_SIZE, update: bool = True,
+                        render: bool = True, progress=print) -> Dict:
+    """Stream reviews from a JSON export into the database, upserting ``batch_size`` at a time.
+
+    Existing reviews (matched by slug) are updated, or skipped when
+    ``update`` is False. Every batch runs in one transaction that is
+    committed at the end, so a bad review leaves the table unchanged.
+    Rendering the HTML of new or changed reviews dominates the import;
+    with ``render`` False it is left to backfill_review_html.py and the
+    pages render on the fly until then. Must run inside an app context.
+    """
+    batch_size = max(int(batch_size), 1)
+    counts = {'read': 0, 'added': 0, 'updated': 0, 'skipped': 0, 'rendered': 0}
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    started = time.perf_counter()
+    rows = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for data in iter_json_array(f):
+                rows.append(review_row(data, now))
+                counts['read'] += 1
+                if len(rows) >= batch_size:
+                    _write_batch(rows, update, render, counts)
+                    rows = []
+                    if progress:
+                        progress(f"Imported {counts['read']} reviews ({time.perf_counter() - started:.1f}s)")
+        _write_batch(rows, update, render, counts)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    counts['seconds'] = round(time.perf_counter() - started, 2)
+    return counts
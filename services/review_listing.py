@@ -0,0 +1,88 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+import base64
+import binascii
+import json
+
+from models.review import Review
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Fields /api/reviews can return, and the columns each one needs
+FIELD_COLUMNS = {
+    'title': ('title',),
+    'slug': ('slug',),
+    'location': ('location',),
+    'summary': ('summary',),
+    'author': ('author',),
+    'image': ('image',),
+    'created_at': ('created_at',),
+    'url': ('slug',),
+}
+DEFAULT_FIELDS = tuple(FIELD_COLUMNS)
+
+
+class ReviewQueryError(ValueError):
+    """Raised for field, limit or cursor parameters that cannot be applied."""
+    pass
+
+
+def encode_cursor(created_key, review_id: int) -> str:
+    """Cursor after a row, from its ``created_key`` exactly as the database compares it."""
+    if isinstance(created_key, datetime):
+        created_key = created_key.isoformat()
+    raw = json.dumps([created_key, review_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_key, review_id = json.loads(raw)
+        datetime.fromisoformat(created_key)
+        return created_key, int(review_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise ReviewQueryError("Invalid cursor")
+
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """Requested fields from a comma-separated list; all of them when none are given."""
+    if not fields:
+        return list(DEFAULT_FIELDS)
+    requested = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = [field for field in requested if field not in FIELD_COLUMNS]
+    if unknown:
+        raise ReviewQueryError(f"Unknown fields: {', '.join(unknown)}; use any of {', '.join(FIELD_COLUMNS)}")
+    return list(dict.fromkeys(requested))
+
+
+def list_reviews(fields: List[str], url_for_slug, limit: int = DEFAULT_PAGE_SIZE,
+                 cursor: Optional[str] = None) -> Dict:
+    """One page of published reviews, newest first, selecting only the columns the fields need.
+
+    ``url_for_slug`` builds the review page URL for the 'url' field.
+    """
+    limit = min(max(int(limit), 1), MAX_PAGE_SIZE)
+    columns = ['id', 'created_at'] + [column for field in fields for column in FIELD_COLUMNS[field]]
+    columns = list(dict.fromkeys(columns))
+    # One extra row tells whether another page follows
+    rows = Review.published_page(columns, limit + 1, decode_cursor(cursor) if cursor else None)
+    page = rows[:limit]
+
+    reviews = []
+    for row in page:
+        review = {}
+        for field in fields:
+            if field == 'url':
+                review['url'] = url_for_slug(row.slug)
+            elif field == 'created_at':
+                review['created_at'] = row.created_at.strftime('%Y-%m-%d') if row.created_at else None
+            else:
+                review[field] = getattr(row, field)
+        reviews.append(review)
+    last = page[-1] if page else None
+    return {
+        'reviews': reviews,
+        'next_cursor': encode_cursor(last.created_key, last.id) if last and len(rows) > limit else None
+    }
@@ -0,0 +1,189 @@
+from typing import Dict, List
+import html
+import re
+
+from sqlalchemy import text
+
+from models import db
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 50
+MAX_TERMS = 8
+SNIPPET_TOKENS = 24
+
+# Highlight markers placed around matches by the database; the snippet is
+# escaped before they become <mark> tags, so review text cannot inject HTML
+_MARK_START = '\x02'
+_MARK_END = '\x03'
+_MARKDOWN_SYNTAX = re.compile(r'\]\([^)]*\)|!?\[|[#*_>`\]]+')
+
+# SQLite: an external-content FTS5 table over the reviews table, kept in sync
+# by triggers so ORM saves and bulk SQL imports are both indexed
+SQLITE_SCHEMA = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS reviews_fts USING fts5(
+        title, location, summary, content,
+        content='reviews', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS reviews_fts_insert AFTER INSERT ON reviews BEGIN
+        INSERT INTO reviews_fts(rowid, title, location, summary, content)
+        VALUES (new.id, new.title, new.location, new.summary, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS reviews_fts_delete AFTER DELETE ON reviews BEGIN
+        INSERT INTO reviews_fts(reviews_fts, rowid, title, location, summary, content)
+        VALUES ('delete', old.id, old.title, old.location, old.summary, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS reviews_fts_update AFTER UPDATE OF title, location, summary, content ON reviews BEGIN
+        INSERT INTO reviews_fts(reviews_fts, rowid, title, location, summary, content)
+        VALUES ('delete', old.id, old.title, old.location, old.summary, old.content);
+        INSERT INTO reviews_fts(rowid, title, location, summary, content)
+        VALUES (new.id, new.title, new.location, new.summary, new.content);
+    END""",
+]
+
+# Title matches count most, then location and summary, then the body
+SQLITE_RANK = "bm25(reviews_fts, 10.0, 5.0, 3.0, 1.0)"
+
+SQLITE_SEARCH = f"""
+    SELECT r.title, r.slug, r.location, r.summary, r.image, r.created_at,
+           snippet(reviews_fts, -1, :mark_start, :mark_end, '…', :tokens) AS snippet
+    FROM reviews_fts JOIN reviews r ON r.id = reviews_fts.rowid
+    WHERE reviews_fts MATCH :query AND r.is_published = 1
+    ORDER BY {SQLITE_RANK}
+    LIMIT :limit OFFSET :offset
+"""
+
+# Written as IN (...) so SQLite runs the MATCH once rather than once per review
+SQLITE_COUNT = """
+    SELECT count(*) FROM reviews
+    WHERE is_published = 1 AND id IN (SELECT rowid FROM reviews_fts WHERE reviews_fts MATCH :query)
+"""
+
+# PostgreSQL: a GIN index on the weighted document expression. Queries must
+# repeat the expression exactly for the planner to use the index, and since
+# it is computed from the row there is nothing to keep in sync.
+POSTGRES_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(summary, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'D')"
+)
+
+POSTGRES_SCHEMA = [
+    f"CREATE INDEX IF NOT EXISTS ix_reviews_search ON reviews USING GIN (({POSTGRES_DOCUMENT}))",
+]
+
+POSTGRES_SEARCH = f"""
+    SELECT title, slug, location, summary, image, created_at,
+           ts_headline('english', coalesce(summary, '') || ' ' || coalesce(content, ''),
+                       to_tsquery('english', :query), :headline) AS snippet
+    FROM reviews
+    WHERE ({POSTGRES_DOCUMENT}) @@ to_tsquery('english', :query) AND is_published
+    ORDER BY ts_rank_cd({POSTGRES_DOCUMENT}, to_tsquery('english', :query)) DESC, id DESC
+    LIMIT :limit OFFSET :offset
+"""
+
+POSTGRES_COUNT = f"""
+    SELECT count(*) FROM reviews
+    WHERE ({POSTGRES_DOCUMENT}) @@ to_tsquery('english', :query) AND is_published
+"""
+
+
+class ReviewSearchError(ValueError):
+    """Raised for search terms or paging parameters that cannot be applied."""
+    pass
+
+
+def _is_postgres() -> bool:
+    return db.engine.dialect.name == 'postgresql'
+
+
+def search_terms(q: str) -> List[str]:
+    """Words of the query, lowercased; punctuation and search operators are dropped."""
+    return re.findall(r'\w+', (q or '').lower())[:MAX_TERMS]
+
+
+def match_query(terms: List[str], postgres: bool = False) -> str:
+    """Every term must match; the last one also matches as a prefix, for search-as-you-type."""
+    if postgres:
+        return ' & '.join(terms[:-1] + [f"{terms[-1]}:*"])
+    return ' '.join([f'"{term}"' for term in terms[:-1]] + [f'"{terms[-1]}"*'])
+
+
+def highlight(snippet: str) -> str:
+    """Escape a snippet and turn the database's match markers into <mark> tags."""
+    snippet = _MARKDOWN_SYNTAX.sub(' ', snippet or '')
+    snippet = ' '.join(html.escape(snippet).split())
+    if snippet.count(_MARK_START) != snippet.count(_MARK_END):
+        # A marker fell inside stripped link syntax; drop the highlighting rather than leave a tag open
+        return snippet.replace(_MARK_START, '').replace(_MARK_END, '')
+    return snippet.replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>')
+
+
+def ensure_search_index() -> bool:
+    """Create the full-text index if it is missing; returns True when it was just built.
+
+    Must run inside an app context.
+    """
+    with db.engine.begin() as connection:
+        if _is_postgres():
+            exists = connection.execute(text("SELECT to_regclass('ix_reviews_search')")).scalar() is not None
+            for statement in POSTGRES_SCHEMA:
+                connection.execute(text(statement))
+            return not exists
+        exists = connection.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'reviews_fts'"
+        )).first() is not None
+        for statement in SQLITE_SCHEMA:
+            connection.execute(text(statement))
+        if not exists:
+            connection.execute(text("INSERT INTO reviews_fts(reviews_fts) VALUES ('rebuild')"))
+        return not exists
+
+
+def search_reviews(q: str, limit: int = DEFAULT_PAGE_SIZE, page: int = 1) -> Dict:
+    """Published reviews matching ``q``, best match first, with highlighted snippets.
+
+    ``page`` counts from 1.
+    """
+    terms = search_terms(q)
+    if not terms:
+        raise ReviewSearchError("Enter a word to search for")
+    limit = min(max(int(limit), 1), MAX_PAGE_SIZE)
+    page = int(page)
+    if page < 1:
+        raise ReviewSearchError("Page must be 1 or more")
+
+    postgres = _is_postgres()
+    params = {'query': match_query(terms, postgres), 'limit': limit, 'offset': (page - 1) * limit}
+    if postgres:
+        params['headline'] = f"StartSel={_MARK_START}, StopSel={_MARK_END}, MaxWords={SNIPPET_TOKENS}, MinWords=12"
+        rows = db.session.execute(text(POSTGRES_SEARCH), params).mappings().all()
+        total = db.session.execute(text(POSTGRES_COUNT), {'query': params['query']}).scalar()
+    else:
+        params.update({'mark_start': _MARK_START, 'mark_end': _MARK_END, 'tokens': SNIPPET_TOKENS})
+        rows = db.session.execute(text(SQLITE_SEARCH), params).mappings().all()
+        total = db.session.execute(text(SQLITE_COUNT), {'query': params['query']}).scalar()
+
+    results = []
+    for row in rows:
+        created_at = row['created_at']
+        if isinstance(created_at, str):
+            created_at = created_at[:10]
+        elif created_at is not None:
+            created_at = created_at.strftime('%Y-%m-%d')
+        results.append({
+            'title': row['title'],
+            'slug': row['slug'],
+            'location': row['location'],
+            'summary': row['summary'],
+            'image': row['image'],
+            'created_at': created_at,
+            'snippet': highlight(row['snippet'])
+        })
+    return {
+        'results': results,
+        'total': total,
+        'page': page,
+        'next_page': page + 1 if page * limit < total else None
+    }
@@ -0,0 +1,263 @@
+from typing import Dict, List, Optional
+import json
+import os
+import re
+
+import numpy as np
+
+from services.airport_geo import DATA_DIR, AirportGeo, airport_geo, flight_hours
+from services.points_optimizer import points_optimizer
+from services.transfer_graph import AIRLINE, BANK, TransferGraph, transfer_graph
+
+DESTINATIONS_PATH = os.path.join(DATA_DIR, 'destinations.json')
+
+MONTHS = ['january', 'february', 'march', 'april', 'may', 'june', 'july',
+          'august', 'september', 'october', 'november', 'december']
+MONTH_RE = re.compile(r'\b(' + '|'.join(name[:3] for name in MONTHS) + r')[a-z]*\b', re.IGNORECASE)
+
+CABINS = ('economy', 'premium_economy', 'business', 'first')
+# Hotel tier paired with each cabin: economy trips get the economy hotel, the rest the luxury one
+CABIN_HOTEL_TIERS = np.array([0, 1, 1, 1])
+
+# Approximate round-trip saver award prices by great-circle distance band, economy cabin
+DISTANCE_BANDS_KM = np.array([1500, 3000, 5000, 7500, 10000, 13000])
+ECONOMY_AWARD_POINTS = np.array([20000, 30000, 45000, 60000, 70000, 80000, 100000])
+CABIN_AWARD_MULTIPLIERS = np.array([1.0, 1.6, 2.5, 3.5])
+
+# Approximate round-trip cash fares (USD) for the same bands, used to estimate value per point
+ECONOMY_CASH_FARES = np.array([300, 450, 650, 900, 1100, 1300, 1600])
+CABIN_CASH_MULTIPLIERS = np.array([1.0, 2.0, 4.5, 7.0])
+
+# Weights of the candidate score: seasonal appeal, trip style match, value per point
+SEASON_WEIGHT = 0.45
+STYLE_WEIGHT = 0.35
+VALUE_WEIGHT = 0.20
+# Bonus when a premium cabin bundle also fits, since every plan needs a luxury option
+LUXURY_BONUS = 0.1
+
+
+def parse_travel_months(text: Optional[str]) -> List[int]:
+    """Month indexes (0-11) named in text such as "June-August 2025"; all months if none are named."""
+    found = [MONTHS.index(next(m for m in MONTHS if m.startswith(match.lower())))
+             for match in MONTH_RE.findall(text or '')]
+    if not found:
+        return list(range(12))
+    if len(found) == 2 and re.search(r'[-–—]|\bto\b|\bthrough\b', text, re.IGNORECASE):
+        start, end = found[0], found[-1]
+        return [(start + offset) % 12 for offset in range((end - start) % 12 + 1)]
+    return sorted(set(found))
+
+
+class ScenarioSweep:
+    """Score every (origin, destination, month, cabin) combination against a points portfolio.
+
+    Award and hotel costs are estimates from distance bands and seasonal
+    demand, evaluated for all combinations in one batched NumPy pass. The best
+    candidates are then confirmed with the points optimizer so the planner only
+    sees destinations the balances can actually fund.
+    """
+
+    def __init__(self, destinations: List[Dict], geo: AirportGeo = airport_geo, graph: TransferGraph = transfer_graph):
+        self.geo = geo
+        self.graph = graph
+        self.destinations = [d for d in destinations if d['airport'] in geo.index]
+        self.dest_rows = geo.indexes(d['airport'] for d in self.destinations)
+        # Seasonality 1-5 scaled to 0-1, shape (destinations, 12)
+        self.season = (np.array([d['seasonality'] for d in self.destinations], dtype=float) - 1) / 4
+        self.hotel_programs = [[d['hotels'][tier]['program'] for tier in ('economy', 'luxury')]
+                               for d in self.destinations]
+        self.hotel_nightly = np.array([[d['hotels'][tier]['points_per_night'] for tier in ('economy', 'luxury')]
+                                       for d in self.destinations], dtype=float)
+        self.hotel_cpp = np.array([[graph.resolve(name).value_cpp for name in programs]
+                                   for programs in self.hotel_programs])
+        # Premium cabins are paired with the luxury tier, so it must not be the cheaper stay
+        hotel_value = self.hotel_nightly * self.hotel_cpp
+        inverted = [d['city'] for d, (economy, luxury) in zip(self.destinations, hotel_value) if economy > luxury]
+        if inverted:
+            raise ValueError(f"Economy hotel is worth more per night than the luxury one for: {', '.join(inverted)}")
+        self.trip_types = sorted({trip_type for d in self.destinations for trip_type in d['trip_types']})
+        self.type_matrix = np.array([[trip_type in d['trip_types'] for trip_type in self.trip_types]
+                                     for d in self.destinations], dtype=float)
+
+    @classmethod
+    def from_file(cls, path: str = DESTINATIONS_PATH) -> 'ScenarioSweep':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def within(self, origins: List[str], max_hours: float) -> List[Dict]:
+        """Destinations with an estimated flight time of at most ``max_hours`` from any origin."""
+        reachable = set(self.geo.reachable(origins, max_hours, [d['airport'] for d in self.destinations]))
+        return [d for d in self.destinations if d['airport'] in reachable]
+
+    def _capacities(self, balances: Dict[str, int]):
+        """Best single airline program and reachable points per hotel program for the balances."""
+        table = self.graph.funding_table(balances)
+        airline_reach = {name: points for name, points in table.reachable.items()
+                         if self.graph.programs[name].kind == AIRLINE}
+        airline_program = max(airline_reach, key=airline_reach.get) if airline_reach else None
+        airline_cap = airline_reach.get(airline_program, 0)
+        hotel_caps = np.array([[table.reachable_points(name) for name in programs]
+                               for programs in self.hotel_programs], dtype=float)
+        # Upper bound on points spendable across flight and hotel together (each balance counted once)
+        total_cap = 0
+        for name, points in table.balances.items():
+            routes = self.graph.routes.get(name, {})
+            best_ratio = max([route.ratio for route in routes.values()], default=1.0)
+            total_cap += points * best_ratio if self.graph.programs[name].kind == BANK else points
+        return airline_program, airline_cap, hotel_caps, total_cap
+
+    def sweep(self, origins: List[str], balances: Dict[str, int], months: Optional[List[int]] = None,
+              trip_types: Optional[List[str]] = None, nights: int = 7,
+              max_flight_hours: Optional[float] = None) -> Dict:
+        """Evaluate every combination and return the estimate arrays and feasibility mask.
+
+        Arrays are indexed (origin, destination, month, cabin).
+        """
+        origin_rows = self.geo.indexes(origins)
+        origin_codes = [self.geo.codes[i] for i in origin_rows]
+        months = months if months else list(range(12))
+        month_index = np.array(months)
+
+        distance = self.geo.distance_km[np.ix_(origin_rows, self.dest_rows)].astype(float)
+        hours = flight_hours(distance)
+        band = np.searchsorted(DISTANCE_BANDS_KM, distance)
+
+        season = self.season[:, month_index]                      # (D, M)
+        demand = 0.9 + 0.4 * season                               # busier months price higher
+        flight_points = (ECONOMY_AWARD_POINTS[band][:, :, None, None] * demand[None, :, :, None]
+                         * CABIN_AWARD_MULTIPLIERS[None, None, None, :])
+        flight_points = np.round(flight_points / 500) * 500       # (O, D, M, C)
+        flight_cash = (ECONOMY_CASH_FARES[band][:, :, None, None] * demand[None, :, :, None]
+                       * CABIN_CASH_MULTIPLIERS[None, None, None, :])
+
+        nightly = self.hotel_nightly[:, CABIN_HOTEL_TIERS]        # (D, C)
+        hotel_points = np.round(nights * nightly[:, None, :] * demand[:, :, None] / 1000) * 1000   # (D, M, C)
+        hotel_value = hotel_points * self.hotel_cpp[:, CABIN_HOTEL_TIERS][:, None, :] / 100
+
+        airline_program, airline_cap, hotel_caps, total_cap = self._capacities(balances)
+        hotel_cap = hotel_caps[:, CABIN_HOTEL_TIERS]              # (D, C)
+        total_points = flight_points + hotel_points[None]
+        feasible = ((flight_points <= airline_cap)
+                    & (hotel_points[None] <= hotel_cap[None, :, None, :])
+                    & (total_points <= total_cap)
+                    & (distance[:, :, None, None] > 300))
+        if max_flight_hours:
+            feasible &= (hours <= max_flight_hours)[:, :, None, None]
+
+        selected = [t.lower() for t in (trip_types or []) if t and t.lower() in self.trip_types]
+        if selected:
+            columns = [self.trip_types.index(t) for t in selected]
+            style = self.type_matrix[:, columns].mean(axis=1)    # (D,)
+        else:
+            style = np.full(len(self.destinations), 0.5)
+
+        cents_per_point = (flight_cash + hotel_value[None]) * 100 / np.maximum(total_points, 1)
+        score = (SEASON_WEIGHT * season[None, :, :, None]
+                 + STYLE_WEIGHT * style[None, :, None, None]
+                 + VALUE_WEIGHT * np.clip(cents_per_point / 3, 0, 1))
+
+        return {
+            'origins': origin_codes,
+            'months': months,
+            'distance_km': distance,
+            'hours': hours,
+            'flight_points': flight_points,
+            'hotel_points': hotel_points,
+            'total_points': total_points,
+            'cents_per_point': cents_per_point,
+            'score': np.where(feasible, score, -np.inf),
+            'feasible': feasible,
+            'airline_program': airline_program
+        }
+
+    def top_candidates(self, origins: List[str], balances: Dict[str, int], months: Optional[List[int]] = None,
+                       trip_types: Optional[List[str]] = None, nights: int = 7,
+                       max_flight_hours: Optional[float] = None, limit: int = 6) -> List[Dict]:
+        """The ``limit`` best distinct destinations whose economy bundle the balances can fund."""
+        result = self.sweep(origins, balances, months, trip_types, nights, max_flight_hours)
+        if not result['origins'] or result['airline_program'] is None:
+            return []
+        score = result['score']
+        economy = score[..., 0]                                   # (O, D, M)
+        premium = score[..., 1:].max(axis=-1)
+        # Best economy origin and month per destination
+        flat = economy.transpose(1, 0, 2).reshape(len(self.destinations), -1)
+        best = flat.argmax(axis=1)
+        best_score = flat[np.arange(len(best)), best]
+        origin_idx, month_pos = np.unravel_index(best, economy.shape[::2])
+        ranked = np.argsort(-(best_score + LUXURY_BONUS * np.isfinite(
+            premium.transpose(1, 0, 2).reshape(len(self.destinations), -1).max(axis=1))))
+
+        candidates = []
+        for d in ranked:
+            if not np.isfinite(best_score[d]) or len(candidates) >= limit:
+                break
+            o, m = origin_idx[d], month_pos[d]
+            candidate = self._confirm(result, balances, o, d, m)
+            if candidate:
+                candidates.append(candidate)
+        return candidates
+
+    def _confirm(self, result: Dict, balances: Dict[str, int], o: int, d: int, m: int) -> Optional[Dict]:
+        """Check an estimated bundle with the points optimizer and describe it."""
+        destination = self.destinations[d]
+        airline_program = result['airline_program']
+        flight_points = int(result['flight_points'][o, d, m, 0])
+        hotel_program = self.hotel_programs[d][0]
+        hotel_points = int(result['hotel_points'][d, m, 0])
+        if points_optimizer.fund(balances, [(airline_program, flight_points), (hotel_program, hotel_points)]) is None:
+            return None
+
+        luxury_cabin = None
+        for c in range(len(CABINS) - 1, 0, -1):
+            if result['feasible'][o, d, m, c] and points_optimizer.fund(balances, [
+                (airline_program, int(result['flight_points'][o, d, m, c])),
+                (self.hotel_programs[d][1], int(result['hotel_points'][d, m, c]))
+            ]) is not None:
+                luxury_cabin = CABINS[c]
+                break
+
+        return {
+            'city': destination['city'],
+            'country': destination['country'],
+            'airport': destination['airport'],
+            'origin': result['origins'][o],
+            'month': MONTHS[result['months'][m]].capitalize(),
+            'flight_hours': round(float(result['hours'][o, d]), 1),
+            'airline_program': airline_program,
+            'flight_points': flight_points,
+            'hotel_program': hotel_program,
+            'hotel_points': hotel_points,
+            'luxury_cabin': luxury_cabin,
+            'luxury_hotel_program': self.hotel_programs[d][1],
+            'cents_per_point': round(float(result['cents_per_point'][o, d, m, 0]), 2),
+            'score': round(float(result['score'][o, d, m, 0]), 3)
+        }
+
+
+def format_reachable(destinations: List[Dict], geo: AirportGeo = airport_geo) -> str:
+    """Reachable destinations grouped by region, one prompt line per region."""
+    regions = {}
+    for destination in destinations:
+        region = geo.get(destination['airport'])['region']
+        regions.setdefault(region, []).append(f"{destination['city']} ({destination['airport']})")
+    return "\n".join(f"- {region.replace('_', ' ').title()}: {', '.join(cities)}"
+                     for region, cities in sorted(regions.items()))
+
+
+def format_candidates(candidates: List[Dict]) -> str:
+    """One prompt line per pre-ranked candidate."""
+    lines = []
+    for candidate in candidates:
+        luxury = (f"; {candidate['luxury_cabin'].replace('_', ' ')} with {candidate['luxury_hotel_program']} also fits"
+                  if candidate['luxury_cabin'] else "; no premium cabin fits")
+        lines.append(
+            f"- {candidate['city']}, {candidate['country']} ({candidate['airport']}) from {candidate['origin']} "
+            f"in {candidate['month']}: ~{candidate['flight_hours']:g}h flight, economy ~{candidate['flight_points']:,} "
+            f"{candidate['airline_program']} + ~{candidate['hotel_points']:,} {candidate['hotel_program']}{luxury}"
+        )
+    return "\n".join(lines)
+
+
+# Loaded once per worker; the dataset is small
+scenario_sweep = ScenarioSweep.from_file()
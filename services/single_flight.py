@@ -0,0 +1,72 @@
+from typing import Any, Callable, Dict, Tuple
+import threading
+
+
+class _Call:
+    """A single in-flight execution that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key onto one execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    still running block until it finishes and receive the same result or
+    exception. Under gevent the threading primitives are monkey-patched, so
+    waiting callers yield to other greenlets instead of blocking the worker.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.executions = 0
+        self.shared = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run ``fn`` once for all concurrent callers of ``key``.
+
+        Returns the result and whether it was shared from another caller's run.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.shared += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+    def stats(self) -> Dict:
+        """Return counters for this process."""
+        with self._lock:
+            in_flight = len(self._calls)
+        return {
+            'executions': self.executions,
+            'shared': self.shared,
+            'in_flight': in_flight
+        }
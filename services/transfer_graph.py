@@ -0,0 +1,409 @@
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+import math
+import re
+
+BANK = 'bank'
+AIRLINE = 'airline'
+HOTEL = 'hotel'
+
+# Value assumed for programs without a published cpp figure when ranking
+# funding options; prompts leave the value out rather than state this guess
+DEFAULT_CPP = 1.0
+
+# Banks move points in blocks of this many source points
+TRANSFER_INCREMENT = 1000
+
+
+class Program:
+    """A loyalty currency: a bank's transferable points or an airline/hotel program."""
+
+    def __init__(self, name: str, kind: str, cpp: Optional[float] = None, aliases: Iterable[str] = ()):
+        self.name = name
+        self.kind = kind
+        self.cpp = cpp
+        self.aliases = tuple(aliases)
+
+    @property
+    def value_cpp(self) -> float:
+        return self.cpp if self.cpp is not None else DEFAULT_CPP
+
+    def __repr__(self):
+        return f"<Program {self.name}>"
+
+
+# Names match the options offered on the points form; aliases cover how the model and users write them
+PROGRAMS = [
+    Program('Chase Ultimate Rewards', BANK, 2.05, ['Chase', 'Ultimate Rewards']),
+    Program('American Express Membership Rewards', BANK, 2.0,
+            ['Amex', 'Amex Membership Rewards', 'American Express', 'Membership Rewards']),
+    Program('Capital One Miles', BANK, 1.85, ['Capital One', 'Capital One Venture']),
+    Program('Citi ThankYou Points', BANK, None, ['Citi', 'Citi ThankYou', 'ThankYou Points']),
+
+    Program('United MileagePlus', AIRLINE, 1.35, ['United', 'MileagePlus']),
+    Program('American AAdvantage', AIRLINE, 1.65, ['American', 'American Airlines', 'AAdvantage']),
+    Program('Delta SkyMiles', AIRLINE, 1.2, ['Delta', 'SkyMiles']),
+    Program('Southwest Rapid Rewards', AIRLINE, 1.35, ['Southwest', 'Rapid Rewards']),
+    Program('Alaska Mileage Plan', AIRLINE, 1.45, ['Alaska', 'Alaska Airlines', 'Mileage Plan']),
+    Program('Air Canada Aeroplan', AIRLINE, 1.5, ['Air Canada', 'Aeroplan']),
+    Program('Air France/KLM Flying Blue', AIRLINE, 1.3, ['Air France', 'KLM', 'Air France/KLM', 'Flying Blue']),
+    Program('British Airways Executive Club', AIRLINE, None, ['British Airways', 'Avios', 'BA']),
+    Program('Virgin Atlantic Flying Club', AIRLINE, None, ['Virgin Atlantic', 'Flying Club']),
+    Program('Emirates Skywards', AIRLINE, None, ['Emirates', 'Skywards']),
+    Program('Singapore Airlines KrisFlyer', AIRLINE, None, ['Singapore Airlines', 'Singapore', 'KrisFlyer']),
+    Program('Iberia Plus', AIRLINE, None, ['Iberia']),
+    Program('Aer Lingus AerClub', AIRLINE, None, ['Aer Lingus', 'AerClub']),
+    Program('JetBlue TrueBlue', AIRLINE, 1.3, ['JetBlue', 'TrueBlue']),
+    Program('ANA Mileage Club', AIRLINE, None, ['ANA', 'All Nippon Airways']),
+    Program('Cathay Pacific Asia Miles', AIRLINE, None, ['Cathay Pacific', 'Cathay', 'Asia Miles']),
+    Program('Etihad Guest', AIRLINE, None, ['Etihad']),
+    Program('Hawaiian Airlines HawaiianMiles', AIRLINE, None, ['Hawaiian', 'Hawaiian Airlines', 'HawaiianMiles']),
+    Program('Turkish Airlines Miles&Smiles', AIRLINE, None, ['Turkish Airlines', 'Turkish', 'Miles&Smiles']),
+    Program('Virgin Red', AIRLINE, None, []),
+    Program('TAP Air Portugal Miles&Go', AIRLINE, None, ['TAP Air Portugal', 'TAP', 'Miles&Go']),
+    Program('Qatar Airways Privilege Club', AIRLINE, None, ['Qatar Airways', 'Qatar', 'Privilege Club']),
+    Program('EVA Air Infinity MileageLands', AIRLINE, None, ['EVA Air', 'EVA', 'Infinity MileageLands']),
+
+    Program('Marriott Bonvoy', HOTEL, 0.8, ['Marriott', 'Bonvoy']),
+    Program('Hilton Honors', HOTEL, 0.6, ['Hilton']),
+    Program('World of Hyatt', HOTEL, 1.7, ['Hyatt']),
+    Program('IHG One Rewards', HOTEL, None, ['IHG']),
+    Program('Wyndham Rewards', HOTEL, None, ['Wyndham']),
+    Program('Choice Privileges', HOTEL, None, ['Choice', 'Choice Hotels']),
+]
+
+# (source, target, target points received per source point): the verified partnerships only
+TRANSFERS = [
+    ('Chase Ultimate Rewards', 'United MileagePlus', 1.0),
+    ('Chase Ultimate Rewards', 'Southwest Rapid Rewards', 1.0),
+    ('Chase Ultimate Rewards', 'Air Canada Aeroplan', 1.0),
+    ('Chase Ultimate Rewards', 'British Airways Executive Club', 1.0),
+    ('Chase Ultimate Rewards', 'Air France/KLM Flying Blue', 1.0),
+    ('Chase Ultimate Rewards', 'Virgin Atlantic Flying Club', 1.0),
+    ('Chase Ultimate Rewards', 'Emirates Skywards', 1.0),
+    ('Chase Ultimate Rewards', 'Singapore Airlines KrisFlyer', 1.0),
+    ('Chase Ultimate Rewards', 'Iberia Plus', 1.0),
+    ('Chase Ultimate Rewards', 'Aer Lingus AerClub', 1.0),
+    ('Chase Ultimate Rewards', 'World of Hyatt', 1.0),
+    ('Chase Ultimate Rewards', 'IHG One Rewards', 1.0),
+    ('Chase Ultimate Rewards', 'Marriott Bonvoy', 1.0),
+
+    ('American Express Membership Rewards', 'Delta SkyMiles', 1.0),
+    ('American Express Membership Rewards', 'Air Canada Aeroplan', 1.0),
+    ('American Express Membership Rewards', 'British Airways Executive Club', 1.0),
+    ('American Express Membership Rewards', 'Air France/KLM Flying Blue', 1.0),
+    ('American Express Membership Rewards', 'Emirates Skywards', 0.8),
+    ('American Express Membership Rewards', 'JetBlue TrueBlue', 0.8),
+    ('American Express Membership Rewards', 'Singapore Airlines KrisFlyer', 1.0),
+    ('American Express Membership Rewards', 'Virgin Atlantic Flying Club', 1.0),
+    ('American Express Membership Rewards', 'ANA Mileage Club', 1.0),
+    ('American Express Membership Rewards', 'Cathay Pacific Asia Miles', 1.0),
+    ('American Express Membership Rewards', 'Etihad Guest', 1.0),
+    ('American Express Membership Rewards', 'Hawaiian Airlines HawaiianMiles', 1.0),
+    ('American Express Membership Rewards', 'Hilton Honors', 2.0),
+    ('American Express Membership Rewards', 'Marriott Bonvoy', 1.0),
+    ('American Express Membership Rewards', 'Choice Privileges', 1.0),
+
+    ('Capital One Miles', 'Air Canada Aeroplan', 1.0),
+    ('Capital One Miles', 'Air France/KLM Flying Blue', 1.0),
+    ('Capital One Miles', 'British Airways Executive Club', 1.0),
+    ('Capital One Miles', 'Emirates Skywards', 0.75),
+    ('Capital One Miles', 'Singapore Airlines KrisFlyer', 1.0),
+    ('Capital One Miles', 'Turkish Airlines Miles&Smiles', 1.0),
+    ('Capital One Miles', 'Virgin Red', 1.0),
+    ('Capital One Miles', 'TAP Air Portugal Miles&Go', 1.0),
+    ('Capital One Miles', 'Wyndham Rewards', 1.0),
+    ('Capital One Miles', 'Choice Privileges', 1.0),
+
+    ('Citi ThankYou Points', 'Air France/KLM Flying Blue', 1.0),
+    ('Citi ThankYou Points', 'Emirates Skywards', 0.8),
+    ('Citi ThankYou Points', 'Singapore Airlines KrisFlyer', 1.0),
+    ('Citi ThankYou Points', 'Virgin Atlantic Flying Club', 1.0),
+    ('Citi ThankYou Points', 'Turkish Airlines Miles&Smiles', 1.0),
+    ('Citi ThankYou Points', 'Qatar Airways Privilege Club', 1.0),
+    ('Citi ThankYou Points', 'Etihad Guest', 1.0),
+    ('Citi ThankYou Points', 'EVA Air Infinity MileageLands', 1.0),
+    ('Citi ThankYou Points', 'Choice Privileges', 2.0),
+]
+
+
+@lru_cache(maxsize=1024)
+def _normalize_name(name: str) -> str:
+    return re.sub(r'[^a-z0-9]', '', str(name).lower())
+
+
+def format_ratio(ratio: float) -> str:
+    """Render a transfer ratio the way banks publish it ("1:1", "1:2", "1:0.8")."""
+    return f"1:{ratio:g}"
+
+
+class Route:
+    """The best conversion path from one source program to a target program."""
+
+    __slots__ = ('source', 'target', 'ratio', 'path')
+
+    def __init__(self, source: str, target: str, ratio: float, path: Tuple[str, ...]):
+        self.source = source
+        self.target = target
+        self.ratio = ratio
+        self.path = path
+
+    def to_dict(self) -> Dict:
+        return {'source': self.source, 'target': self.target, 'ratio': self.ratio, 'path': list(self.path)}
+
+
+class FundingSource:
+    """One way to fund a target program: its own balance or a transfer from a source."""
+
+    __slots__ = ('program', 'available', 'ratio', 'path', 'receivable', 'cost_cpp', 'direct')
+
+    def __init__(self, program: str, available: int, ratio: float, path: Tuple[str, ...],
+                 cost_cpp: float, direct: bool):
+        self.program = program
+        self.available = available
+        self.ratio = ratio
+        self.path = path
+        self.direct = direct
+        # Value given up (cents) for each target point obtained this way
+        self.cost_cpp = cost_cpp
+        transferable = available if direct else available - available % TRANSFER_INCREMENT
+        self.receivable = int(transferable * ratio)
+
+    def to_dict(self) -> Dict:
+        return {
+            'program': self.program,
+            'direct': self.direct,
+            'available': self.available,
+            'ratio': self.ratio,
+            'path': list(self.path),
+            'receivable': self.receivable,
+            'cost_cpp': round(self.cost_cpp, 4)
+        }
+
+
+class FundingTable:
+    """Funding options for every reachable program, precomputed for one balance set.
+
+    Sources for each target are ordered the way the planner should spend them:
+    the program's own points first, then transfers from the source that gives up
+    the least value per point received.
+    """
+
+    def __init__(self, graph: 'TransferGraph', balances: Dict[str, int]):
+        self.graph = graph
+        self.balances = {}
+        self.unrecognized = {}
+        for name, points in balances.items():
+            program = graph.resolve(name)
+            if program is None:
+                self.unrecognized[name] = points
+            else:
+                self.balances[program.name] = self.balances.get(program.name, 0) + points
+
+        self.sources: Dict[str, List[FundingSource]] = {}
+        for name, points in self.balances.items():
+            if points <= 0:
+                continue
+            program = graph.programs[name]
+            if program.kind != BANK:
+                self.sources.setdefault(name, []).append(
+                    FundingSource(name, points, 1.0, (name,), program.value_cpp, True)
+                )
+            for route in graph.routes.get(name, {}).values():
+                self.sources.setdefault(route.target, []).append(
+                    FundingSource(name, points, route.ratio, route.path, program.value_cpp / route.ratio, False)
+                )
+        for options in self.sources.values():
+            options.sort(key=lambda source: (not source.direct, source.cost_cpp, source.program))
+
+        self.reachable = {
+            target: sum(source.receivable for source in options)
+            for target, options in self.sources.items()
+        }
+
+    def reachable_points(self, target: str) -> int:
+        """Most points the balances can put into ``target`` (direct plus every transfer)."""
+        program = self.graph.resolve(target)
+        return self.reachable.get(program.name, 0) if program else 0
+
+    def effective_value(self, target: str) -> float:
+        """Dollar value of the reachable points at the target program's cpp (DEFAULT_CPP if it has none)."""
+        program = self.graph.resolve(target)
+        if program is None:
+            return 0.0
+        return round(self.reachable.get(program.name, 0) * program.value_cpp / 100, 2)
+
+    def best_source(self, target: str) -> Optional[FundingSource]:
+        """The cheapest way to fund ``target``, or None if it cannot be reached."""
+        program = self.graph.resolve(target)
+        options = self.sources.get(program.name) if program else None
+        return options[0] if options else None
+
+    def can_afford(self, target: str, points_needed: int) -> Optional[Dict]:
+        """Return the cheapest funding plan for ``points_needed`` in ``target``, or None.
+
+        The plan spends the target's own balance first, then transfers from the
+        cheapest sources in whole transfer increments.
+        """
+        program = self.graph.resolve(target)
+        if program is None or self.reachable.get(program.name, 0) < points_needed:
+            return None
+
+        remaining = points_needed
+        steps = []
+        cost_cents = 0.0
+        for source in self.sources[program.name]:
+            if remaining <= 0:
+                break
+            if source.direct:
+                used = min(source.available, remaining)
+                received = used
+            else:
+                blocks = math.ceil(remaining / source.ratio / TRANSFER_INCREMENT)
+                used = min(blocks * TRANSFER_INCREMENT, source.available - source.available % TRANSFER_INCREMENT)
+                received = int(used * source.ratio)
+            if used <= 0:
+                continue
+            remaining -= received
+            cost_cents += used * self.graph.programs[source.program].value_cpp
+            steps.append({
+                'program': source.program,
+                'direct': source.direct,
+                'points': used,
+                'ratio': source.ratio,
+                'received': received
+            })
+
+        return {
+            'target': program.name,
+            'points_needed': points_needed,
+            'steps': steps,
+            'value_used': round(cost_cents / 100, 2)
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            'balances': dict(self.balances),
+            'unrecognized': dict(self.unrecognized),
+            'programs': {
+                target: {
+                    'reachable_points': self.reachable[target],
+                    'cpp': self.graph.programs[target].cpp,
+                    'effective_value': self.effective_value(target),
+                    'sources': [source.to_dict() for source in options]
+                }
+                for target, options in sorted(self.sources.items())
+            }
+        }
+
+
+class TransferGraph:
+    """Weighted graph of bank → airline/hotel transfer partnerships.
+
+    Best routes from every source are computed once at construction; funding
+    tables for a balance set are memoized, so repeat lookups are dictionary reads.
+    """
+
+    def __init__(self, programs: List[Program], transfers: List[Tuple[str, str, float]], max_hops: int = 2):
+        self.programs = {program.name: program for program in programs}
+        self._aliases = {}
+        for program in programs:
+            for alias in (program.name,) + program.aliases:
+                self._aliases[_normalize_name(alias)] = program
+
+        self.edges: Dict[str, List[Tuple[str, float]]] = {}
+        for source, target, ratio in transfers:
+            if source not in self.programs or target not in self.programs:
+                raise ValueError(f"Unknown program in transfer {source} -> {target}")
+            self.edges.setdefault(source, []).append((target, ratio))
+
+        self.routes = {source: self._best_routes(source, max_hops) for source in self.edges}
+
+    def resolve(self, name: str) -> Optional[Program]:
+        """Look up a program by its name or a common alias, ignoring case and punctuation."""
+        if not name or not isinstance(name, str):
+            return None
+        return self._aliases.get(_normalize_name(name))
+
+    def _best_routes(self, source: str, max_hops: int) -> Dict[str, Route]:
+        """Highest-ratio path from ``source`` to every program it can reach."""
+        best = {source: Route(source, source, 1.0, (source,))}
+        frontier = [source]
+        for _ in range(max_hops):
+            next_frontier = []
+            for node in frontier:
+                for target, ratio in self.edges.get(node, []):
+                    candidate = best[node].ratio * ratio
+                    if target not in best or candidate > best[target].ratio:
+                        best[target] = Route(source, target, candidate, best[node].path + (target,))
+                        next_frontier.append(target)
+            frontier = next_frontier
+        del best[source]
+        return best
+
+    def partners(self, source: str) -> List[Route]:
+        """Routes out of a source program, strongest ratio first."""
+        program = self.resolve(source)
+        if program is None:
+            return []
+        return sorted(self.routes.get(program.name, {}).values(), key=lambda route: (-route.ratio, route.target))
+
+    def funding_table(self, balances: Dict[str, int]) -> FundingTable:
+        """Precomputed funding options for ``balances`` (memoized per balance set)."""
+        return self._funding_table(tuple(sorted((name, int(points or 0)) for name, points in balances.items())))
+
+    @lru_cache(maxsize=256)
+    def _funding_table(self, balances: Tuple[Tuple[str, int], ...]) -> FundingTable:
+        return FundingTable(self, dict(balances))
+
+    def format_for_prompt(self, balances: Dict[str, int]) -> str:
+        """Describe the transfers and pooled totals available to ``balances`` for the system prompt."""
+        table = self.funding_table(balances)
+        lines = []
+
+        for name, points in sorted(table.balances.items()):
+            program = self.programs[name]
+            if program.kind != BANK or points <= 0:
+                continue
+            lines.append(f"{name} ({points:,} points{self._cpp_note(program)}):")
+            by_ratio = {}
+            for route in self.partners(name):
+                by_ratio.setdefault(route.ratio, []).append(self._label(route.target))
+            for ratio, targets in by_ratio.items():
+                reachable = int((points - points % TRANSFER_INCREMENT) * ratio)
+                lines.append(f"- {format_ratio(ratio)} (up to {reachable:,} points): {', '.join(targets)}")
+
+        if not lines:
+            lines.append("No transferable credit card points: use direct program balances only.")
+
+        pooled = []
+        for name, points in sorted(table.balances.items()):
+            program = self.programs[name]
+            if program.kind == BANK or points <= 0:
+                continue
+            transfers = [source for source in table.sources[name] if not source.direct]
+            via = ''.join(
+                f" + {source.receivable:,} from {source.program} ({format_ratio(source.ratio)})"
+                for source in transfers
+            )
+            value = f" ({program.cpp:g} cpp, ~${table.effective_value(name):,.0f})" if program.cpp is not None else ""
+            pooled.append(f"- {name}: {points:,} direct{via} = up to {table.reachable[name]:,} points{value}")
+        if pooled:
+            lines.append("")
+            lines.append("PROGRAM TOTALS (direct + transfers):")
+            lines.extend(pooled)
+
+        return "\n".join(lines)
+
+    @staticmethod
+    def _cpp_note(program: Program) -> str:
+        # DEFAULT_CPP is only a ranking assumption, so it is never shown as a valuation
+        return f", {program.cpp:g} cpp" if program.cpp is not None else ""
+
+    def _label(self, name: str) -> str:
+        cpp = self.programs[name].cpp
+        return f"{name} {cpp:g} cpp" if cpp is not None else name
+
+
+# Shared by every trip request; built once per process
+transfer_graph = TransferGraph(PROGRAMS, TRANSFERS)
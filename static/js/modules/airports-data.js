@@ -1,106 +0,0 @@
-/**
- * Airport Data Module
- * Contains airport data for autocomplete functionality
- * List of major international airports
- */
-const airports = [
-    // United States (Top 50 by passenger traffic)
-    { code: 'ATL', name: 'Hartsfield-Jackson Atlanta International Airport', city: 'Atlanta' },
-    { code: 'AUS', name: 'Austin-Bergstrom International Airport', city: 'Austin' },
-    { code: 'BNA', name: 'Nashville International Airport', city: 'Nashville' },
-    { code: 'BOS', name: 'Boston Logan International Airport', city: 'Boston' },
-    { code: 'BWI', name: 'Baltimore/Washington International Airport', city: 'Baltimore' },
-    { code: 'BUF', name: 'Buffalo Niagara International Airport', city: 'Buffalo' },
-    { code: 'CLE', name: 'Cleveland Hopkins International Airport', city: 'Cleveland' },
-    { code: 'CLT', name: 'Charlotte Douglas International Airport', city: 'Charlotte' },
-    { code: 'CMH', name: 'John Glenn Columbus International Airport', city: 'Columbus' },
-    { code: 'CVG', name: 'Cincinnati/Northern Kentucky International Airport', city: 'Cincinnati' },
-    { code: 'DCA', name: 'Ronald Reagan Washington National Airport', city: 'Washington' },
-    { code: 'DEN', name: 'Denver International Airport', city: 'Denver' },
-    { code: 'DFW', name: 'Dallas/Fort Worth International Airport', city: 'Dallas' },
-    { code: 'DTW', name: 'Detroit Metropolitan Airport', city: 'Detroit' },
-    { code: 'EWR', name: 'Newark Liberty International Airport', city: 'Newark' },
-    { code: 'FLL', name: 'Fort Lauderdale-Hollywood International Airport', city: 'Fort Lauderdale' },
-    { code: 'HNL', name: 'Daniel K. Inouye International Airport', city: 'Honolulu' },
-    { code: 'IAD', name: 'Washington Dulles International Airport', city: 'Washington' },
-    { code: 'IAH', name: 'George Bush Intercontinental Airport', city: 'Houston' },
-    { code: 'IND', name: 'Indianapolis International Airport', city: 'Indianapolis' },
-    { code: 'JAX', name: 'Jacksonville International Airport', city: 'Jacksonville' },
-    { code: 'JFK', name: 'John F. Kennedy International Airport', city: 'New York' },
-    { code: 'LAS', name: 'Harry Reid International Airport', city: 'Las Vegas' },
-    { code: 'LAX', name: 'Los Angeles International Airport', city: 'Los Angeles' },
-    { code: 'LGA', name: 'LaGuardia Airport', city: 'New York' },
-    { code: 'MCI', name: 'Kansas City International Airport', city: 'Kansas City' },
-    { code: 'MCO', name: 'Orlando International Airport', city: 'Orlando' },
-    { code: 'MDW', name: 'Chicago Midway International Airport', city: 'Chicago' },
-    { code: 'MIA', name: 'Miami International Airport', city: 'Miami' },
-    { code: 'MKE', name: 'Milwaukee Mitchell International Airport', city: 'Milwaukee' },
-    { code: 'MSP', name: 'Minneapolis-Saint Paul International Airport', city: 'Minneapolis' },
-    { code: 'MSY', name: 'Louis Armstrong New Orleans International Airport', city: 'New Orleans' },
-    { code: 'OAK', name: 'Oakland International Airport', city: 'Oakland' },
-    { code: 'ORD', name: "O'Hare International Airport", city: 'Chicago' },
-    { code: 'PBI', name: 'Palm Beach International Airport', city: 'West Palm Beach' },
-    { code: 'PDX', name: 'Portland International Airport', city: 'Portland' },
-    { code: 'PHL', name: 'Philadelphia International Airport', city: 'Philadelphia' },
-    { code: 'PHX', name: 'Phoenix Sky Harbor International Airport', city: 'Phoenix' },
-    { code: 'PIT', name: 'Pittsburgh International Airport', city: 'Pittsburgh' },
-    { code: 'RDU', name: 'Raleigh-Durham International Airport', city: 'Raleigh' },
-    { code: 'RSW', name: 'Southwest Florida International Airport', city: 'Fort Myers' },
-    { code: 'SAN', name: 'San Diego International Airport', city: 'San Diego' },
-    { code: 'SEA', name: 'Seattle-Tacoma International Airport', city: 'Seattle' },
-    { code: 'SFO', name: 'San Francisco International Airport', city: 'San Francisco' },
-    { code: 'SJC', name: 'Norman Y. Mineta San Jose International Airport', city: 'San Jose' },
-    { code: 'SLC', name: 'Salt Lake City International Airport', city: 'Salt Lake City' },
-    { code: 'SMF', name: 'Sacramento International Airport', city: 'Sacramento' },
-    { code: 'SNA', name: 'John Wayne Airport', city: 'Santa Ana' },
-    { code: 'STL', name: 'St. Louis Lambert International Airport', city: 'St. Louis' },
-    { code: 'TPA', name: 'Tampa International Airport', city: 'Tampa' },
-
-    // Asia
-    { code: 'BKK', name: 'Suvarnabhumi Airport', city: 'Bangkok' },
-    { code: 'BOM', name: 'Chhatrapati Shivaji International Airport', city: 'Mumbai' },
-    { code: 'CAN', name: 'Guangzhou Baiyun International Airport', city: 'Guangzhou' },
-    { code: 'CGK', name: 'Soekarno-Hatta International Airport', city: 'Jakarta' },
-    { code: 'DEL', name: 'Indira Gandhi International Airport', city: 'Delhi' },
-    { code: 'HKG', name: 'Hong Kong International Airport', city: 'Hong Kong' },
-    { code: 'HND', name: 'Tokyo Haneda Airport', city: 'Tokyo' },
-    { code: 'ICN', name: 'Seoul Incheon International Airport', city: 'Seoul' },
-    { code: 'KUL', name: 'Kuala Lumpur International Airport', city: 'Kuala Lumpur' },
-    { code: 'NRT', name: 'Tokyo Narita International Airport', city: 'Tokyo' },
-    { code: 'PVG', name: 'Shanghai Pudong International Airport', city: 'Shanghai' },
-    { code: 'SIN', name: 'Singapore Changi Airport', city: 'Singapore' },
-
-    // Middle East
-    { code: 'AUH', name: 'Abu Dhabi International Airport', city: 'Abu Dhabi' },
-    { code: 'DOH', name: 'Hamad International Airport', city: 'Doha' },
-    { code: 'DXB', name: 'Dubai International Airport', city: 'Dubai' },
-    { code: 'IST', name: 'Istanbul Airport', city: 'Istanbul' },
-
-    // Europe
-    { code: 'AMS', name: 'Amsterdam Airport Schiphol', city: 'Amsterdam' },
-    { code: 'ARN', name: 'Stockholm Arlanda Airport', city: 'Stockholm' },
-    { code: 'BCN', name: 'Barcelona–El Prat Airport', city: 'Barcelona' },
-    { code: 'CDG', name: 'Charles de Gaulle Airport', city: 'Paris' },
-    { code: 'CPH', name: 'Copenhagen Airport', city: 'Copenhagen' },
-    { code: 'DUB', name: 'Dublin Airport', city: 'Dublin' },
-    { code: 'FCO', name: 'Leonardo da Vinci International Airport', city: 'Rome' },
-    { code: 'FRA', name: 'Frankfurt Airport', city: 'Frankfurt' },
-    { code: 'LGW', name: 'London Gatwick Airport', city: 'London' },
-    { code: 'LHR', name: 'London Heathrow Airport', city: 'London' },
-    { code: 'MAD', name: 'Adolfo Suárez Madrid–Barajas Airport', city: 'Madrid' },
-    { code: 'MUC', name: 'Munich Airport', city: 'Munich' },
-    { code: 'MXP', name: 'Milan Malpensa Airport', city: 'Milan' },
-    { code: 'VIE', name: 'Vienna International Airport', city: 'Vienna' },
-    { code: 'ZRH', name: 'Zurich Airport', city: 'Zurich' },
-
-    // Oceania
-    { code: 'ADL', name: 'Adelaide Airport', city: 'Adelaide' },
-    { code: 'AKL', name: 'Auckland Airport', city: 'Auckland' },
-    { code: 'BNE', name: 'Brisbane Airport', city: 'Brisbane' },
-    { code: 'MEL', name: 'Melbourne Airport', city: 'Melbourne' },
-    { code: 'PER', name: 'Perth Airport', city: 'Perth' },
-    { code: 'SYD', name: 'Sydney Airport', city: 'Sydney' }
-];
-
-// Export the module
-window.airports = airports;
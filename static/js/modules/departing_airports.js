@@ -6,6 +6,8 @@ const DepartingAirports = {
     initialized: false,
     doneTypingInterval: 300,
     typingTimers: {},
+    searchLimit: 10,
+    requestControllers: {},
 
     init() {
         if (this.initialized) {
@@ -14,11 +16,6 @@ const DepartingAirports = {
         }
         console.log('Initializing DepartingAirports module');
 
-        if (typeof airports === 'undefined') {
-            console.error('Airports data not loaded!');
-            return;
-        }
-
         this.setupAirportInputs();
         this.initialized = true;
         console.log('DepartingAirports module initialized');
@@ -47,26 +44,45 @@ const DepartingAirports = {
 
     handleAirportInput(input, suggestionsContainer, index) {
         clearTimeout(this.typingTimers[index]);
-        const query = input.value.toUpperCase();
+        const query = input.value.trim();
         console.log(`Airport search query for input ${index}:`, query);
 
-        this.typingTimers[index] = setTimeout(() => {
+        this.typingTimers[index] = setTimeout(async () => {
             if (query.length >= 2) {
-                const matchingAirports = this.searchAirports(query);
-                this.displayAirportSuggestions(matchingAirports, input, suggestionsContainer);
+                const matchingAirports = await this.searchAirports(query, index);
+                if (matchingAirports) {
+                    this.displayAirportSuggestions(matchingAirports, input, suggestionsContainer);
+                }
             } else {
                 suggestionsContainer.style.display = 'none';
             }
         }, this.doneTypingInterval);
     },
 
-    searchAirports(query) {
+    async searchAirports(query, index) {
         console.log('Searching airports for:', query);
-        return airports.filter(airport => 
-            airport.code.includes(query) || 
-            airport.city.toUpperCase().includes(query) ||
-            airport.name.toUpperCase().includes(query)
-        ).slice(0, 10);
+        // Drop the previous request for this input so a slow response cannot overwrite a newer one
+        if (this.requestControllers[index]) {
+            this.requestControllers[index].abort();
+        }
+        const controller = new AbortController();
+        this.requestControllers[index] = controller;
+
+        try {
+            const params = new URLSearchParams({ q: query, limit: this.searchLimit });
+            const response = await fetch(`/api/airports/search?${params}`, { signal: controller.signal });
+            if (!response.ok) {
+                throw new Error(`Airport search failed with status ${response.status}`);
+            }
+            const data = await response.json();
+            return data.airports || [];
+        } catch (error) {
+            if (error.name === 'AbortError') {
+                return null;
+            }
+            console.error('Error searching airports:', error);
+            return [];
+        }
     },
 
     displayAirportSuggestions(matchingAirports, input, suggestionsContainer) {
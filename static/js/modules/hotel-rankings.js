@@ -3,7 +3,7 @@ class HotelRankingsModule {
         this.usaGrid = document.querySelector('.usa-hotels-grid');
         this.mexicoGrid = document.querySelector('.mexico-hotels-grid');
         this.worldGrid = document.querySelector('.world-hotels-grid');
-        this.hotels = [];
+        this.sectionSize = 10;
         this.init();
     }
 
@@ -37,29 +37,32 @@ class HotelRankingsModule {
     }
 
     loadHotels() {
-        fetch('/api/hotel-rankings')
+        // Each section asks the server for just its top 10
+        const sections = [
+            { grid: this.usaGrid, params: [['country', 'USA']] },
+            { grid: this.mexicoGrid, params: [['country', 'Mexico']] },
+            { grid: this.worldGrid, params: [['exclude_country', 'USA'], ['exclude_country', 'Mexico']] }
+        ];
+        sections.forEach(section => {
+            this.fetchHotels([...section.params, ['sort', 'rating'], ['limit', this.sectionSize]])
+                .then(hotels => this.renderHotels(section.grid, hotels))
+                .catch(error => console.error('Error loading hotels:', error));
+        });
+    }
+
+    fetchHotels(params) {
+        return fetch(`/api/hotel-rankings?${new URLSearchParams(params)}`)
             .then(response => response.json())
             .then(data => {
-                this.hotels = data;
-                this.renderHotels();
-            })
-            .catch(error => console.error('Error loading hotels:', error));
+                if (!data.success) {
+                    throw new Error(data.error || 'Failed to load hotels');
+                }
+                return data.hotels;
+            });
     }
 
-    renderHotels(hotels = this.hotels) {
-        const usaHotels = hotels.filter(h => h.country === 'USA')
-            .sort((a, b) => b.rating - a.rating)
-            .slice(0, 10);
-        const mexicoHotels = hotels.filter(h => h.country === 'Mexico')
-            .sort((a, b) => b.rating - a.rating)
-            .slice(0, 10);
-        const worldHotels = hotels.filter(h => !['USA', 'Mexico'].includes(h.country))
-            .sort((a, b) => b.rating - a.rating)
-            .slice(0, 10);
-
-        this.usaGrid.innerHTML = usaHotels.map(hotel => this.createHotelCard(hotel)).join('');
-        this.mexicoGrid.innerHTML = mexicoHotels.map(hotel => this.createHotelCard(hotel)).join('');
-        this.worldGrid.innerHTML = worldHotels.map(hotel => this.createHotelCard(hotel)).join('');
+    renderHotels(grid, hotels) {
+        grid.innerHTML = hotels.map(hotel => this.createHotelCard(hotel)).join('');
     }
 
     getHotelWebsite(hotel) {
@@ -2,14 +2,18 @@ class TravelGuidesModule {
     constructor() {
         this.guidesContainer = document.querySelector('.travel-guides-grid');
         this.reviewsContainer = document.querySelector('.reviews-grid');
+        this.loadMoreButton = document.querySelector('.load-more-reviews');
         this.guides = [];
         this.reviews = [];
+        this.nextCursor = null;
+        this.loadingReviews = false;
         this.init();
     }
 
     init() {
         this.loadGuides();
         this.loadReviews();
+        this.watchLoadMore();
     }
 
     loadGuides() {
@@ -24,21 +28,61 @@ class TravelGuidesModule {
     }
     
     loadReviews() {
-        // Load reviews from the backend
-        fetch('/api/reviews')
+        // Load the first page of reviews; later pages follow next_cursor as the reader asks for them
+        this.reviews = [];
+        this.nextCursor = null;
+        this.loadReviewPage(null);
+    }
+
+    loadReviewPage(cursor) {
+        if (this.loadingReviews) return;
+        this.loadingReviews = true;
+        const params = new URLSearchParams({ fields: 'title,slug,location,summary,author,image,created_at,url' });
+        if (cursor) params.set('cursor', cursor);
+        fetch(`/api/reviews?${params}`)
             .then(response => response.json())
             .then(data => {
-                this.reviews = data.reviews || [];
-                
-                // Add URL property to each review for linking to the review page
-                this.reviews = this.reviews.map(review => ({
-                    ...review,
-                    url: `/reviews/${review.slug}`
-                }));
-                
-                this.renderReviews();
+                const page = data.reviews || [];
+                this.reviews = this.reviews.concat(page);
+                // A cursor that does not advance would otherwise request the same page again
+                this.nextCursor = data.next_cursor && data.next_cursor !== cursor ? data.next_cursor : null;
+                if (cursor) {
+                    this.appendReviews(page);
+                } else {
+                    this.renderReviews();
+                }
             })
-            .catch(error => console.error('Error loading reviews:', error));
+            .catch(error => console.error('Error loading reviews:', error))
+            .finally(() => {
+                this.loadingReviews = false;
+                this.updateLoadMore();
+            });
+    }
+
+    loadMoreReviews() {
+        if (this.nextCursor) {
+            this.loadReviewPage(this.nextCursor);
+        }
+    }
+
+    watchLoadMore() {
+        if (!this.loadMoreButton) return;
+        this.loadMoreButton.addEventListener('click', () => this.loadMoreReviews());
+        // Fetch the next page as the button scrolls into view; the button still works without this
+        if ('IntersectionObserver' in window) {
+            const observer = new IntersectionObserver(entries => {
+                if (entries.some(entry => entry.isIntersecting)) {
+                    this.loadMoreReviews();
+                }
+            }, { rootMargin: '200px' });
+            observer.observe(this.loadMoreButton);
+        }
+    }
+
+    updateLoadMore() {
+        if (!this.loadMoreButton) return;
+        this.loadMoreButton.hidden = !this.nextCursor;
+        this.loadMoreButton.disabled = this.loadingReviews;
     }
 
     renderGuides() {
@@ -66,6 +110,11 @@ class TravelGuidesModule {
         this.reviewsContainer.innerHTML = this.reviews.map(review => this.createReviewCard(review)).join('');
     }
 
+    appendReviews(reviews) {
+        if (!this.reviewsContainer) return;
+        this.reviewsContainer.insertAdjacentHTML('beforeend', reviews.map(review => this.createReviewCard(review)).join(''));
+    }
+
     createGuideCard(guide) {
         const imagePath = guide.image;
         const thumbnailPath = imagePath.replace('.jpg', '-thumb.jpg');
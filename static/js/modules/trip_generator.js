@@ -80,13 +80,15 @@ const TripGenerator = {
             this.setGeneratingState(true);
             this.clearResults();
             
-            // Send request
-            const data = await this.sendTripRequest(tripData);
+            // Send request, streaming the plan in as it is written when the browser supports it
+            const data = this.supportsStreaming()
+                ? await this.streamTripRequest(tripData)
+                : await this.sendTripRequest(tripData);
             await this.handleTripResponse(data);
             
         } catch (error) {
             console.error('Error generating trip:', error);
-            this.displayError(error.message || 'An unexpected error occurred. Please try again - it usually works on the second try!');
+            this.displayError(error.message || 'An unexpected error occurred. Please try again in a few moments.');
         } finally {
             this.setGeneratingState(false);
         }
@@ -117,15 +119,15 @@ const TripGenerator = {
                 // For non-200 responses, try to get error details
                 try {
                     const errorData = await response.json();
-                    throw new Error(errorData.error || 'A temporary error occurred. Please try your request again - it usually works on the second try!');
+                    throw new Error(errorData.error || 'A temporary error occurred. Please try your request again in a few moments.');
                 } catch (jsonError) {
                     // If we can't parse JSON, use the cloned response to get text
                     const text = await responseClone.text();
                     // Check if it's an HTML response (indicating a server error)
                     if (text.includes('<!DOCTYPE html>')) {
-                        throw new Error('A temporary server hiccup occurred. Please try again - it usually works on the second try!');
+                        throw new Error('A temporary server hiccup occurred. Please try again in a few moments.');
                     }
-                    throw new Error('A temporary error occurred. Please try your request again - it usually works on the second try!');
+                    throw new Error('A temporary error occurred. Please try your request again in a few moments.');
                 }
             }
 
@@ -133,16 +135,16 @@ const TripGenerator = {
             try {
                 const data = await response.json();
                 if (!data.success) {
-                    throw new Error(data.error || 'A temporary error occurred. Please try your request again - it usually works on the second try!');
+                    throw new Error(data.error || 'A temporary error occurred. Please try your request again in a few moments.');
                 }
                 return data;
             } catch (jsonError) {
                 console.error('JSON parsing error:', jsonError);
-                throw new Error('A temporary error occurred while processing the response. Please try again - it usually works on the second try!');
+                throw new Error('A temporary error occurred while processing the response. Please try again in a few moments.');
             }
         } catch (error) {
             if (error.name === 'AbortError') {
-                throw new Error('The request took longer than expected. Please try again - it usually works on the second try!');
+                throw new Error('The request took longer than expected. Please try again in a few moments.');
             }
             throw error;
         } finally {
@@ -150,6 +152,154 @@ const TripGenerator = {
         }
     },
 
+    supportsStreaming() {
+        return typeof window.ReadableStream !== 'undefined' &&
+            typeof window.TextDecoder !== 'undefined' &&
+            'body' in Response.prototype;
+    },
+
+    async streamTripRequest(tripData) {
+        const controller = new AbortController();
+        const hasMultipleRequests = tripData.preferences && tripData.preferences.split('\n').length > 1;
+        const timeout = hasMultipleRequests ? 180000 : 120000;
+        const timeoutId = setTimeout(() => controller.abort(), timeout);
+
+        try {
+            const response = await fetch('/generate_trip/stream', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'Accept': 'text/event-stream'
+                },
+                body: JSON.stringify(tripData),
+                signal: controller.signal
+            });
+
+            // Errors raised before streaming starts come back as regular JSON responses
+            if (!response.ok || !response.body) {
+                let errorMessage = 'A temporary error occurred. Please try your request again in a few moments.';
+                try {
+                    const errorData = await response.json();
+                    errorMessage = errorData.error || errorMessage;
+                } catch (jsonError) {
+                    console.error('Error parsing stream error response:', jsonError);
+                }
+                throw new Error(errorMessage);
+            }
+
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            let planText = '';
+            let plan = null;
+            const streamedDestinations = [];
+            let validation = null;
+            let finished = false;
+
+            while (!finished) {
+                const { value, done } = await reader.read();
+                if (done) {
+                    break;
+                }
+                buffer += decoder.decode(value, { stream: true });
+
+                // Events are separated by a blank line; keep any trailing partial event in the buffer
+                const events = buffer.split('\n\n');
+                buffer = events.pop();
+
+                for (const rawEvent of events) {
+                    const event = this.parseStreamEvent(rawEvent);
+                    if (!event) {
+                        continue;
+                    }
+                    if (event.type === 'token') {
+                        planText += event.data.text;
+                        this.renderStreamPreview(planText, streamedDestinations);
+                    } else if (event.type === 'destination') {
+                        // Each destination arrives parsed once the next one starts
+                        streamedDestinations.push(event.data);
+                        this.renderStreamPreview(planText, streamedDestinations);
+                    } else if (event.type === 'error') {
+                        throw new Error(event.data.error || 'A temporary error occurred. Please try again in a few moments.');
+                    } else if (event.type === 'done') {
+                        // The server validates and repairs the streamed text before it finishes
+                        if (event.data.result) {
+                            planText = event.data.result;
+                        }
+                        plan = event.data.plan || null;
+                        validation = event.data.validation || null;
+                        finished = true;
+                    }
+                }
+            }
+
+            if (!finished) {
+                throw new Error('The connection was interrupted before the trip ideas finished. Please try again in a few moments.');
+            }
+
+            return {
+                success: true,
+                result: planText.trim(),
+                plan: plan,
+                validation: validation
+            };
+        } catch (error) {
+            if (error.name === 'AbortError') {
+                throw new Error('The request took longer than expected. Please try again in a few moments.');
+            }
+            throw error;
+        } finally {
+            clearTimeout(timeoutId);
+        }
+    },
+
+    parseStreamEvent(rawEvent) {
+        let type = 'message';
+        const dataLines = [];
+        rawEvent.split('\n').forEach(line => {
+            if (line.startsWith('event:')) {
+                type = line.slice(6).trim();
+            } else if (line.startsWith('data:')) {
+                dataLines.push(line.slice(5).trim());
+            }
+        });
+        if (dataLines.length === 0) {
+            return null;
+        }
+        try {
+            return { type: type, data: JSON.parse(dataLines.join('\n')) };
+        } catch (error) {
+            console.error('Error parsing stream event:', error);
+            return null;
+        }
+    },
+
+    renderStreamPreview(planText, destinations) {
+        let preview = this.resultsContainer.querySelector('.trip-stream-preview');
+        if (!preview) {
+            this.resultsContainer.innerHTML = `
+                <div class="trip-results-container">
+                    <div class="trip-stream-destinations"></div>
+                    <div class="destination-section">
+                        <pre class="trip-stream-preview" style="white-space: pre-wrap; font-family: inherit; margin: 0;"></pre>
+                    </div>
+                </div>
+            `;
+            preview = this.resultsContainer.querySelector('.trip-stream-preview');
+        }
+        const streamed = this.resultsContainer.querySelector('.trip-stream-destinations');
+        if (Number(streamed.dataset.count || 0) !== destinations.length) {
+            // Completed destinations are shown as cards; the final plan replaces them once validated
+            streamed.innerHTML = this.renderDestinations(destinations);
+            streamed.dataset.count = destinations.length;
+        }
+        // Only the destination still being written is shown as raw text
+        const headers = [...planText.matchAll(/^[^\S\n]*(?:\*\*|<b>)?DESTINATION\s+\d+/gim)];
+        const current = destinations.length === 0 ? 0 : (headers[destinations.length]?.index ?? planText.length);
+        // textContent keeps the raw model output from being interpreted as HTML
+        preview.textContent = planText.slice(current).replace(/<br\s*\/?>/gi, '').replace(/<\/?b>/gi, '');
+    },
+
     clearResults() {
         this.resultsContainer.innerHTML = '';
     },
@@ -281,102 +431,18 @@ const TripGenerator = {
         document.head.appendChild(style);
         console.log('Handling trip response:', data);
 
-        if (!data || !data.success || !data.result) {
-            throw new Error('No trip recommendations were received. Please try again - it usually works on the second try!');
+        if (!data || !data.success || !data.plan) {
+            throw new Error('No trip recommendations were received. Please try again in a few moments.');
         }
 
-        // Split the response into destinations and filter out empty ones
-        const destinations = data.result
-            .split(/DESTINATION \d+ -/)
-            .filter(d => d.trim())
-            .map(d => d.trim());
-        
-        // Create the HTML for each destination
+        // Build the destinations from the structured plan the server parsed and validated
         let resultsHtml = '<div class="trip-results-container" style="width:100%; max-width:100%;">';
-        
-        destinations.forEach((destination, index) => {
-            // Extract destination header and summary sections
-            const lines = destination.split('\n').map(l => l.trim()).filter(l => l);
-            const destName = lines[0].replace(':', '').trim();
-            
-            // Skip if we don't have enough content
-            if (lines.length < 5) {
-                console.error('Incomplete destination data:', destination);
-                return;
-            }
-            
-            // Find destination summary and recommendations sections
-            const summaryStartIndex = lines.findIndex(l => l === 'DESTINATION SUMMARY:' || l === 'Overview:');
-            const recommendationsStartIndex = lines.findIndex(l => l === 'Why We Recommend This Destination:');
-            const optionsStartIndex = lines.findIndex(l => l.includes('OPTION A - ECONOMY EXPERIENCE') || l === 'Economy Experience:');
-            
-            let destinationSummary = '';
-            let recommendations = '';
-            let content = destination;
-            
-            if (summaryStartIndex !== -1 && recommendationsStartIndex !== -1) {
-                // Extract summary
-                destinationSummary = lines
-                    .slice(summaryStartIndex + 1, recommendationsStartIndex)
-                    .filter(l => l)
-                    .join('<br>');
-                
-                // Extract recommendations
-                recommendations = lines
-                    .slice(recommendationsStartIndex + 1, optionsStartIndex)
-                    .filter(l => l)
-                    .join('<br>');
-                
-                // Get the rest of the content
-                content = lines.slice(optionsStartIndex).join('\n');
-            }
-            
-            // Process economy and luxury sections
-            const sections = this.processSectionContent(content, index + 1);
-            
-            // Only create the destination section if we have valid data
-            if (sections.economyContent && sections.luxuryContent && destName !== 'Unknown Destination') {
-                resultsHtml += `
-                    <section class="destination-section">
-                        <div class="destination-header${window.innerWidth <= 768 ? '' : ' active'}">
-                            <h3>Destination ${index + 1} - ${destName}</h3>
-                            <span class="toggle-icon" style="${window.innerWidth <= 768 ? '' : 'transform: rotate(180deg)'}">▼</span>
-                        </div>
-                        <div class="destination-content${window.innerWidth <= 768 ? '' : ' show'} mobile-full-width">
-                            <div class="destination-summary mb-4">
-                                <div class="summary-section mb-4">
-                                    <h4 class="summary-title">Overview</h4>
-                                    <div class="summary-content">
-                                        ${destinationSummary}
-                                    </div>
-                                </div>
-                                <div class="recommendations-section">
-                                    <h4 class="summary-title">Why We Recommend This Destination</h4>
-                                    <div class="recommendations-content">
-                                        ${this.formatRecommendations(recommendations)}
-                                    </div>
-                                </div>
-                            </div>
-                            <div class="row">
-                                <div class="col-md-6">
-                                    <h2 class="option-header">Economy Experience</h2>
-                                    ${this.formatOptionSection(sections.economyContent)}
-                                </div>
-                                <div class="col-md-6">
-                                    <h2 class="option-header">Luxury Experience</h2>
-                                    ${this.formatOptionSection(sections.luxuryContent)}
-                                </div>
-                            </div>
-                        </div>
-                    </section>
-                `;
-            }
-        });
+        resultsHtml += this.renderDestinations(data.plan.destinations || []);
         
         if (!resultsHtml.includes('destination-section')) {
             resultsHtml += `
                 <div class="alert alert-danger">
-                    Unable to generate valid trip suggestions. Please try again - it usually works on the second try!
+                    Unable to generate valid trip suggestions. Please try again in a few moments.
                 </div>
             `;
         }
@@ -669,87 +735,86 @@ Please organize this by day (Day 1, Day 2, etc) and consider the local weather a
         this.attachToggleListeners();
     },
 
-    processSectionContent(destination, sectionNumber) {
-        const economyExperienceRegex = /OPTION A - ECONOMY EXPERIENCE([\s\S]*?)(?=OPTION B - LUXURY EXPERIENCE|$)/;
-        const luxuryExperienceRegex = /OPTION B - LUXURY EXPERIENCE([\s\S]*)/;
-        
-        const economyMatch = destination.match(economyExperienceRegex);
-        const luxuryMatch = destination.match(luxuryExperienceRegex);
-        
-        let economyContent = null;
-        let luxuryContent = null;
-        
-        if (economyMatch && economyMatch[1]) {
-            economyContent = this.parseExperienceSection(economyMatch[1].trim(), 'economy');
-        }
-        
-        if (luxuryMatch && luxuryMatch[1]) {
-            luxuryContent = this.parseExperienceSection(luxuryMatch[1].trim(), 'luxury');
-        }
-        
-        return {
-            economyContent,
-            luxuryContent
-        };
+    renderDestinations(destinations) {
+        let html = '';
+        destinations.forEach((destination, index) => {
+            const options = destination.options || [];
+            const economy = options.find(option => option.tier === 'economy') || options.find(option => option.key === 'A');
+            const luxury = options.find(option => option.tier === 'luxury') || options.find(option => option.key === 'B');
+
+            // Only create the destination section if we have both options
+            if (!economy || !luxury || !destination.name) {
+                console.error('Incomplete destination data:', destination);
+                return;
+            }
+
+            html += `
+                <section class="destination-section">
+                    <div class="destination-header${window.innerWidth <= 768 ? '' : ' active'}">
+                        <h3>Destination ${index + 1} - ${destination.name}</h3>
+                        <span class="toggle-icon" style="${window.innerWidth <= 768 ? '' : 'transform: rotate(180deg)'}">▼</span>
+                    </div>
+                    <div class="destination-content${window.innerWidth <= 768 ? '' : ' show'} mobile-full-width">
+                        <div class="destination-summary mb-4">
+                            <div class="summary-section mb-4">
+                                <h4 class="summary-title">Overview</h4>
+                                <div class="summary-content">
+                                    ${destination.summary || ''}
+                                </div>
+                            </div>
+                            <div class="recommendations-section">
+                                <h4 class="summary-title">Why We Recommend This Destination</h4>
+                                <div class="recommendations-content">
+                                    ${this.formatRecommendations(destination)}
+                                </div>
+                            </div>
+                        </div>
+                        <div class="row">
+                            <div class="col-md-6">
+                                <h2 class="option-header">Economy Experience</h2>
+                                ${this.formatOptionSection(this.optionDetails(economy))}
+                            </div>
+                            <div class="col-md-6">
+                                <h2 class="option-header">Luxury Experience</h2>
+                                ${this.formatOptionSection(this.optionDetails(luxury))}
+                            </div>
+                        </div>
+                    </div>
+                </section>
+            `;
+        });
+        return html;
     },
-    
-    parseExperienceSection(sectionText, type) {
-        // Parse all the details from the text
-        const result = {
-            type: type
+
+    optionDetails(option) {
+        // Flatten a structured plan option into the fields formatOptionSection lists
+        const flight = option.flight || {};
+        const hotel = option.hotel || {};
+        const value = option.value || {};
+        return {
+            type: option.tier,
+            route: flight.route,
+            airline: flight.airline,
+            points_program: flight.points_program,
+            points_used: flight.points_used_text,
+            fare_class: flight.fare_class,
+            property: hotel.property,
+            hotel_points_program: hotel.points_program,
+            total_points_needed: hotel.total_points_text,
+            property_details: hotel.details,
+            total_points_used: value.total_points_text,
+            airline_points: this.formatProgramPoints(value.airline_points, value.airline_program),
+            hotel_points: this.formatProgramPoints(value.hotel_points, value.hotel_program),
+            dollar_value_saved: value.dollar_value_text
         };
-        
-        // Extract flight details
-        const routeMatch = sectionText.match(/Route:([^\n]+)/);
-        if (routeMatch) result.route = routeMatch[1].trim();
-        
-        const airlineMatch = sectionText.match(/Airline:([^\n]+)/);
-        if (airlineMatch) result.airline = airlineMatch[1].trim();
-        
-        // Extract flight points program - look in the Flight Details section
-        const flightSectionMatch = sectionText.match(/Flight Details[\s\S]*?Points Program:([^\n]+)/);
-        if (flightSectionMatch) result.points_program = flightSectionMatch[1].trim();
-        
-        const pointsUsedMatch = sectionText.match(/Points Used:([^\n]+)/);
-        if (pointsUsedMatch) result.points_used = pointsUsedMatch[1].trim();
-        
-        const fareClassMatch = sectionText.match(/Fare Class:([^\n]+)/);
-        if (fareClassMatch) result.fare_class = fareClassMatch[1].trim();
-        
-        // Extract hotel details
-        const propertyMatch = sectionText.match(/Property:([^\n]+)/);
-        if (propertyMatch) result.property = propertyMatch[1].trim();
-        
-        // Find the hotel points program by looking for Points Program after Hotel Option
-        const hotelSectionMatch = sectionText.match(/Hotel Option[\s\S]*?Points Program:([^\n]+)/);
-        if (hotelSectionMatch) result.hotel_points_program = hotelSectionMatch[1].trim();
-        
-        const totalPointsNeededMatch = sectionText.match(/Total Points Needed:([^\n]+)/);
-        if (totalPointsNeededMatch) result.total_points_needed = totalPointsNeededMatch[1].trim();
-        
-        const propertyDetailsMatch = sectionText.match(/Property Details:([^\n]+)/);
-        if (propertyDetailsMatch) result.property_details = propertyDetailsMatch[1].trim();
-        
-        // Extract value analysis
-        const totalPointsUsedMatch = sectionText.match(/Total Points Used:([^\n]+)/);
-        if (totalPointsUsedMatch) result.total_points_used = totalPointsUsedMatch[1].trim();
-        
-        // Extract points needed for flight - look in Value Analysis section
-        const valueAnalysisSection = sectionText.match(/Value Analysis[\s\S]*/);
-        if (valueAnalysisSection) {
-            const flightPointsMatch = valueAnalysisSection[0].match(/(?:Airline|Flight):([^\n]+)/);
-            if (flightPointsMatch) result.airline_points = flightPointsMatch[1].trim();
-        }
-        
-        const hotelPointsMatch = sectionText.match(/Hotel:([^\n]+)/);
-        if (hotelPointsMatch) result.hotel_points = hotelPointsMatch[1].trim();
-        
-        const dollarValueSavedMatch = sectionText.match(/Dollar Value Saved:([^\n]+)/);
-        if (dollarValueSavedMatch) result.dollar_value_saved = dollarValueSavedMatch[1].trim();
-        
-        return result;
     },
 
+    formatProgramPoints(points, program) {
+        if (points === null || points === undefined) return null;
+        const text = `${points.toLocaleString()} points`;
+        return program ? `${text} (${program})` : text;
+    },
+    
     attachToggleListeners() {
         // Fix for destination toggles
         document.querySelectorAll('.destination-header').forEach(header => {
@@ -815,57 +880,23 @@ Please organize this by day (Day 1, Day 2, etc) and consider the local weather a
         }
     },
 
-    formatRecommendations(recommendations) {
-        if (!recommendations) return '';
+    formatRecommendations(destination) {
+        // The requirements checklist is not shown; the seasonal and points notes are
+        const groups = [
+            ['Weather Conditions', destination.seasonal_analysis?.weather],
+            ['Local Highlights', destination.seasonal_analysis?.highlights],
+            ['Award Availability', destination.points_optimization?.award_availability],
+            ['Value Opportunities', destination.points_optimization?.value_opportunities]
+        ];
         
-        // Skip the "Requirements Match" section completely
-        let lines = recommendations.split('<br>');
         let formattedContent = '';
-        let skipSection = false;
-        let inSection = false;
-        
-        for (let i = 0; i < lines.length; i++) {
-            const line = lines[i].trim();
-            
-            // Skip the "Requirements Match" section and its content
-            if (line.includes('Requirements Match:')) {
-                skipSection = true;
-                continue;
-            }
-            
-            // When we reach a new section, stop skipping
-            if (skipSection && (line.includes('Seasonal Analysis:') || 
-                               line.includes('Weather Conditions:') || 
-                               line.includes('Local Highlights:') || 
-                               line.includes('Points Optimization:') ||
-                               line.includes('Award Availability:') ||
-                               line.includes('Value Opportunities:'))) {
-                skipSection = false;
-            }
-            
-            // If we're in skip mode, continue to next line
-            if (skipSection) continue;
-            
-            // Remove the section numbers (e.g., "2. Seasonal Analysis:", "3. Points Optimization:")
-            const cleanedLine = line.replace(/^\d+\.\s+/, '');
-            
-            if (cleanedLine.endsWith(':')) {
-                if (cleanedLine === 'Seasonal Analysis:' || cleanedLine === 'Points Optimization:') {
-                    // Skip these section headers completely
-                    continue;
-                }
-                formattedContent += `<h5 class="recommendation-category">${cleanedLine}</h5>`;
-                inSection = true;
-            } else if (cleanedLine.startsWith('- ') || cleanedLine.startsWith('• ') || cleanedLine.startsWith('✓ ')) {
-                formattedContent += `<div class="recommendation-item">${cleanedLine.substring(2)}</div>`;
-            } else if (cleanedLine && inSection) {
-                // Add all non-header content as recommendation items with bullets
-                formattedContent += `<div class="recommendation-item">${cleanedLine}</div>`;
-            } else if (cleanedLine) {
-                // For content not under a section header, don't add bullets
-                formattedContent += `<div>${cleanedLine}</div>`;
-            }
-        }
+        groups.forEach(([title, items]) => {
+            if (!items || items.length === 0) return;
+            formattedContent += `<h5 class="recommendation-category">${title}:</h5>`;
+            items.forEach(item => {
+                formattedContent += `<div class="recommendation-item">${item}</div>`;
+            });
+        });
         
         return formattedContent;
     },
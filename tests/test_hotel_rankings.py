@@ -0,0 +1,127 @@
+import pytest
+from flask import Flask
+
+from models import db
+from models.hotel import Hotel
+from services.hotel_rankings import (HotelQueryError, SORTS, decode_cursor, encode_cursor, load_hotels_csv,
+                                     parse_hotels, query_hotels)
+
+CSV = '''"Hotel
+Name",City,Country,Category,Price Range,"Distance from
+Airport",Have I Stayed? (Y/N),My Rating,Notes
+Alpha,Lisbon,Portugal,Boutique,$$,20 min,Y,9.5,Great
+Bravo,Lisbon,Portugal,Luxury,$$$-$$$$,25 min,N,9.5,
+Charlie,Porto,Portugal,Business,$,15 min,N,8,
+Delta,Paris,France,Luxury,$$$$,40 min,Y,9.5,
+Echo,Paris,France,Boutique,$$,35 min,N,7,
+Foxtrot,Tokyo,Japan,Business,$$$,30 min,Y,8,
+Golf,Tokyo,Japan,Boutique,$$,50 min,N,9,
+'''
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        path = tmp_path / 'hotels.csv'
+        path.write_text(CSV, encoding='utf-8')
+        load_hotels_csv(str(path))
+        yield app
+        db.session.remove()
+
+
+def _all_pages(sort, limit, **kwargs):
+    names, cursor = [], None
+    for _ in range(20):
+        page = query_hotels(sort=sort, limit=limit, cursor=cursor, **kwargs)
+        names.extend(hotel['name'] for hotel in page['hotels'])
+        cursor = page['next_cursor']
+        if not cursor:
+            return names
+    pytest.fail("Pagination did not finish")
+
+
+def test_parses_headers_with_line_breaks():
+    hotels = parse_hotels(CSV + 'Alpha,Lisbon,Portugal,Boutique,$$$,20 min,N,6,Repeated\n')
+
+    assert len(hotels) == 7
+    alpha = next(hotel for hotel in hotels if hotel['name'] == 'Alpha')
+    assert (alpha['airport_distance'], alpha['rating'], alpha['has_stayed']) == ('20 min', 6.0, False)
+    bravo = next(hotel for hotel in hotels if hotel['name'] == 'Bravo')
+    assert bravo['price_level'] == 3.5
+
+
+def test_reports_an_invalid_rating():
+    with pytest.raises(ValueError, match="Row 3 has an invalid rating 'great'"):
+        parse_hotels(CSV.replace('Bravo,Lisbon,Portugal,Luxury,$$$-$$$$,25 min,N,9.5',
+                                 'Bravo,Lisbon,Portugal,Luxury,$$$-$$$$,25 min,N,great'))
+
+
+@pytest.mark.parametrize('sort', SORTS)
+def test_pages_match_a_single_query(app, sort):
+    everything = [hotel['name'] for hotel in query_hotels(sort=sort, limit=100)['hotels']]
+
+    assert _all_pages(sort, limit=2) == everything
+    assert sorted(everything) == sorted(hotel.name for hotel in Hotel.query.all())
+
+
+def test_rating_sort_breaks_ties_by_name(app):
+    assert _all_pages('rating', limit=1)[:3] == ['Alpha', 'Bravo', 'Delta']
+
+
+def test_filters_apply_to_every_page_and_the_total(app):
+    page = query_hotels(filters={'country': ['portugal', 'JAPAN']}, stayed=False, sort='name', limit=2)
+
+    assert page['total'] == 3
+    assert _all_pages('name', limit=2, filters={'country': ['portugal', 'JAPAN']}, stayed=False) == [
+        'Bravo', 'Charlie', 'Golf']
+
+
+def test_reload_updates_rows_and_prunes_missing_hotels(app, tmp_path):
+    path = tmp_path / 'hotels.csv'
+    lines = CSV.splitlines(keepends=True)
+    path.write_text(''.join(lines[:5]).replace('Great', 'Even better'), encoding='utf-8')
+
+    assert load_hotels_csv(str(path), prune=True) == {'upserted': 2, 'removed': 5}
+    assert [(hotel.name, hotel.notes) for hotel in Hotel.query.order_by(Hotel.name)] == [
+        ('Alpha', 'Even better'), ('Bravo', '')]
+
+
+def test_unknown_sort_is_rejected(app):
+    with pytest.raises(HotelQueryError, match="Unknown sort"):
+        query_hotels(sort='stars')
+
+
+def test_cursor_for_another_sort_is_rejected(app):
+    cursor = query_hotels(sort='rating', limit=1)['next_cursor']
+
+    with pytest.raises(HotelQueryError, match="does not match the requested sort"):
+        query_hotels(sort='name', cursor=cursor)
+
+
+@pytest.mark.parametrize('key', [
+    ['9.5', 'Alpha', 1],
+    [9.5, 'Alpha', '1'],
+    [True, 'Alpha', 1],
+    [9.5, None, 1],
+    [9.5, ['Alpha'], 1],
+    [9.5, 'Alpha', 1.5],
+])
+def test_cursor_values_must_match_the_sort_columns(app, key):
+    with pytest.raises(HotelQueryError, match="Invalid cursor"):
+        query_hotels(sort='rating', cursor=encode_cursor('rating', key))
+
+
+@pytest.mark.parametrize('cursor', ['not a cursor!', 'bm90IGpzb24', encode_cursor('rating', [9.5, 'Alpha'])])
+def test_malformed_cursors_are_rejected(app, cursor):
+    with pytest.raises(HotelQueryError):
+        decode_cursor(cursor, 'rating')
+
+
+def test_non_finite_cursor_values_are_rejected(app):
+    assert decode_cursor(encode_cursor('price', [2, 9.5, 3]), 'price') == [2, 9.5, 3]
+    with pytest.raises(HotelQueryError, match="Invalid cursor"):
+        decode_cursor(encode_cursor('price', [float('nan'), 9.5, 3]), 'price')
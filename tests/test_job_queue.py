@@ -0,0 +1,96 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from services.job_queue import FAILED, INTERRUPTED_ERROR, QUEUED, RUNNING, SUCCEEDED, QueueFullError, TripJobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return TripJobQueue(path=str(tmp_path / 'trip_jobs.db'), max_workers=2, max_pending=2, lease=3)
+
+
+def _wait(queue, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job['status'] not in (QUEUED, RUNNING):
+            return job
+        time.sleep(0.02)
+    pytest.fail(f"Job {job_id} did not finish")
+
+
+def _insert_orphan(queue, renewed_ago):
+    """A running job whose worker stopped renewing its lease ``renewed_ago`` seconds ago."""
+    queue.get('missing')  # creates the schema
+    stale = time.time() - renewed_ago
+    conn = sqlite3.connect(queue.path)
+    conn.execute(
+        "INSERT INTO trip_jobs (id, status, owner_pid, submitted_at, started_at, owner, heartbeat_at) "
+        "VALUES ('orphan', ?, 1, ?, ?, 'gone', ?)", (RUNNING, stale, stale, stale)
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_runs_jobs_and_stores_their_result(queue):
+    job = _wait(queue, queue.submit(lambda: {'plan': 'text'}))
+
+    assert job['status'] == SUCCEEDED
+    assert job['result'] == {'plan': 'text'}
+    assert queue.metrics()['succeeded'] == 1
+
+
+def test_failed_jobs_keep_the_described_error(queue):
+    def fail():
+        raise RuntimeError("boom")
+
+    job = _wait(queue, queue.submit(fail, describe_error=lambda e: (502, f"Upstream error: {e}")))
+
+    assert job['status'] == FAILED
+    assert (job['error_status'], job['error']) == (502, "Upstream error: boom")
+
+
+def test_rejects_jobs_past_max_pending(queue):
+    release = threading.Event()
+    jobs = [queue.submit(lambda: release.wait(5) and {}) for _ in range(2)]
+    try:
+        with pytest.raises(QueueFullError):
+            queue.submit(lambda: {})
+    finally:
+        release.set()
+    assert all(_wait(queue, job_id)['status'] == SUCCEEDED for job_id in jobs)
+
+
+def test_job_with_an_expired_lease_is_reported_interrupted(queue):
+    _insert_orphan(queue, renewed_ago=queue.lease + 1)
+
+    job = queue.get('orphan')
+
+    assert (job['status'], job['error_status'], job['error']) == (FAILED, 503, INTERRUPTED_ERROR)
+    assert queue.get('orphan')['finished_at'] is not None
+
+
+def test_expired_jobs_do_not_count_against_max_pending(queue):
+    _insert_orphan(queue, renewed_ago=queue.lease + 1)
+    release = threading.Event()
+    job_id = queue.submit(lambda: release.wait(5) and {})
+    try:
+        queue.submit(lambda: {})
+    finally:
+        release.set()
+    _wait(queue, job_id)
+
+
+def test_renewed_lease_keeps_a_long_job_running(queue):
+    release = threading.Event()
+    job_id = queue.submit(lambda: release.wait(10) and {'done': True})
+    try:
+        # Outlive the lease; the owning process keeps renewing it
+        time.sleep(queue.lease + 1)
+        assert queue.get(job_id)['status'] == RUNNING
+    finally:
+        release.set()
+    assert _wait(queue, job_id)['result'] == {'done': True}
@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+
+from services.ai_service import TripValidationError, parse_points_balance
+from services.plan_cache import PlanCache, make_cache_key
+
+TRIP = {
+    'airports': ['JFK', 'EWR'],
+    'trip_types': ['beach', 'city'],
+    'travel_months': 'June',
+    'trip_length': '7 days',
+    'max_flight_length': '8',
+    'preferences': 'Quiet hotels',
+}
+BALANCES = {'Chase Ultimate Rewards': 100000, 'World of Hyatt': 20000}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PlanCache(path=str(tmp_path / 'plan_cache.db'), ttl=60, max_entries=2)
+
+
+def test_cosmetic_differences_share_a_key():
+    variant = {**TRIP, 'airports': 'ewr, jfk', 'trip_types': ['City', 'beach', 'city'],
+               'travel_months': ' june ', 'preferences': 'quiet   HOTELS'}
+
+    assert make_cache_key(variant, {'world of hyatt': 20000, 'chase ultimate rewards': 100000}) == \
+        make_cache_key(TRIP, BALANCES)
+
+
+def test_balances_change_the_key():
+    assert make_cache_key(TRIP, {**BALANCES, 'World of Hyatt': 30000}) != make_cache_key(TRIP, BALANCES)
+
+
+@pytest.mark.parametrize('balance, points', [(None, 0), ('', 0), ('50000', 50000), (50000, 50000)])
+def test_parses_submitted_balances(balance, points):
+    assert parse_points_balance('World of Hyatt', balance) == points
+
+
+@pytest.mark.parametrize('balance', ['50,000', '1e5', -1, 12.5, True, [50000]])
+def test_rejects_balances_that_are_not_whole_points(balance):
+    with pytest.raises(TripValidationError, match='Points balance for World of Hyatt must be a whole number'):
+        parse_points_balance('World of Hyatt', balance)
+
+
+def test_stores_plans_and_counts_hits_and_misses(cache):
+    key = make_cache_key(TRIP, BALANCES)
+    assert cache.get(key) is None
+
+    cache.set(key, {'content': 'plan'})
+
+    assert cache.get(key) == {'content': 'plan'}
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['stores'], stats['entries']) == (1, 1, 1, 1)
+
+
+def test_evicts_the_least_recently_used_plan(cache):
+    cache.set('a', {'content': 'a'})
+    cache.set('b', {'content': 'b'})
+    time.sleep(0.01)
+    cache.get('a')
+    cache.set('c', {'content': 'c'})
+
+    assert cache.get('b') is None
+    assert cache.get('a') == {'content': 'a'}
+    assert cache.stats()['evictions'] == 1
+
+
+def test_expired_plans_are_not_served(tmp_path):
+    cache = PlanCache(path=str(tmp_path / 'plan_cache.db'), ttl=0)
+    cache.set('key', {'content': 'plan'})
+
+    assert cache.get('key') is None
+
+
+def test_only_one_worker_holds_a_lease(cache):
+    token = cache.acquire_lease('key')
+
+    assert token is not None
+    assert cache.acquire_lease('key') is None
+    cache.release_lease('key', token)
+    assert cache.acquire_lease('key') is not None
+
+
+def test_expired_lease_can_be_taken_over(cache):
+    assert cache.acquire_lease('key', ttl=0) is not None
+    assert cache.acquire_lease('key') is not None
+
+
+def test_waiter_receives_the_leaseholders_plan(cache):
+    token = cache.acquire_lease('key')
+
+    def generate():
+        time.sleep(0.1)
+        cache.set('key', {'content': 'plan'})
+        cache.release_lease('key', token)
+
+    threading.Thread(target=generate).start()
+
+    assert cache.wait_for('key', timeout=5, poll_interval=0.01) == {'content': 'plan'}
+    stats = cache.stats()
+    assert (stats['lease_waits'], stats['lease_wait_hits']) == (1, 1)
+
+
+def test_waiter_gives_up_when_the_lease_is_released_without_a_plan(cache):
+    token = cache.acquire_lease('key')
+    cache.release_lease('key', token)
+
+    assert cache.wait_for('key', timeout=5, poll_interval=0.01) is None
@@ -0,0 +1,63 @@
+import pytest
+
+from services.llm_providers import FAKE_DESTINATIONS, _format_destination
+from services.plan_parser import PlanStreamParser, parse_dollars, parse_points, parse_travel_plan
+
+PLAN = 'Here are two destinations for you.\n\n' + '\n\n'.join(
+    _format_destination(position, FAKE_DESTINATIONS[position - 1], 'JFK', 5) for position in (1, 2))
+
+
+def _stream(text, size):
+    parser = PlanStreamParser()
+    completed = []
+    for start in range(0, len(text), size):
+        completed += parser.feed(text[start:start + size])
+    return parser, completed + parser.close()
+
+
+@pytest.mark.parametrize('size', [1, 7, 64, len(PLAN)])
+def test_streamed_chunks_parse_like_the_whole_text(size):
+    parser, completed = _stream(PLAN, size)
+
+    assert parser.plan == parse_travel_plan(PLAN)
+    assert completed == parser.plan['destinations']
+
+
+def test_destination_completes_when_the_next_one_starts():
+    first, second = PLAN.split('DESTINATION 2', 1)
+    parser = PlanStreamParser()
+
+    assert parser.feed(first) == []
+    completed = parser.feed('DESTINATION 2' + second)
+    assert [d['index'] for d in completed] == [1]
+    assert [d['index'] for d in parser.close()] == [2]
+    assert parser.close() == []
+
+
+def test_parses_options_and_value_analysis():
+    destination = parse_travel_plan(PLAN)['destinations'][0]
+
+    assert destination['name'] == 'Lisbon, Portugal'
+    economy, luxury = destination['options']
+    assert economy['flight']['points_used'] == 60000
+    assert economy['flight']['points_program'] == 'United MileagePlus'
+    assert economy['hotel']['total_points'] == 75000
+    assert economy['value']['total_points'] == 135000
+    assert economy['value']['hotel_program'] == 'World of Hyatt'
+    assert luxury['flight']['fare_class'] == 'Business'
+
+
+@pytest.mark.parametrize('text, points', [
+    ('60,000 points RT', 60000),
+    ('75k', 75000),
+    ('1.5M points', 1500000),
+    ('no points', None),
+    (None, None),
+])
+def test_parse_points(text, points):
+    assert parse_points(text) == points
+
+
+def test_parse_dollars():
+    assert parse_dollars('Approx. $2,025') == 2025.0
+    assert parse_dollars('') is None
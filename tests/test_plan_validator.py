@@ -0,0 +1,86 @@
+import pytest
+
+from services.llm_providers import FAKE_DESTINATIONS, _format_destination
+from services.plan_validator import PlanValidator
+
+
+def _section(position, destination=None):
+    return _format_destination(position, destination or FAKE_DESTINATIONS[position - 1], 'JFK', 5)
+
+
+def _plan():
+    return '\n\n'.join(_section(position) for position in (1, 2))
+
+
+@pytest.fixture
+def validator():
+    return PlanValidator()
+
+
+def test_well_formed_plan_is_valid(validator):
+    result = validator.review(_plan())
+
+    assert result['validation'] == {'status': 'valid', 'repairs': [], 'regenerated': [], 'issues': []}
+    assert [d['name'] for d in result['plan']['destinations']] == ['Lisbon, Portugal', 'Tokyo, Japan']
+
+
+def test_repairs_headers_markdown_and_totals_locally(validator):
+    text = 'Here are your destinations!\n\n' + _plan()
+    text = text.replace('DESTINATION 2 - Tokyo', '**Destination #2: Tokyo**')
+    text = text.replace('<b>Total Points Used</b>: 135,000', '<b>Total Points Used</b>: 999')
+
+    result = validator.review(text)
+
+    validation = result['validation']
+    assert validation['status'] == 'repaired'
+    assert validation['issues'] == []
+    assert {repair['code'] for repair in validation['repairs']} == {
+        'preamble', 'markdown', 'destination_header', 'value_total_points_used'}
+    assert result['text'].startswith('DESTINATION 1 - Lisbon, Portugal:')
+    assert 'DESTINATION 2 - Tokyo, Japan:' in result['text']
+    assert result['plan']['destinations'][0]['options'][0]['value']['total_points'] == 135000
+
+
+def test_drops_extra_destinations(validator):
+    text = _plan() + '\n\n' + _section(3)
+
+    result = validator.review(text)
+
+    assert [repair['code'] for repair in result['validation']['repairs']] == ['extra_destination']
+    assert len(result['plan']['destinations']) == 2
+
+
+def test_unaffordable_options_stay_invalid_without_regeneration(validator):
+    result = validator.review(_plan(), balances={'Chase Ultimate Rewards': 1000})
+
+    validation = result['validation']
+    assert validation['status'] == 'invalid'
+    assert {issue['code'] for issue in validation['issues']} == {'exceeds_balances'}
+    assert validator.stats()['unresolved'] == 1
+
+
+def test_regenerates_only_the_broken_destination(validator):
+    broken = _section(2).split('OPTION B')[0].rstrip()
+    calls = []
+
+    def regenerate(position, name, problems, others):
+        calls.append((position, name, [problem['code'] for problem in problems], others))
+        return _section(position, FAKE_DESTINATIONS[3])
+
+    result = validator.review(_section(1) + '\n\n' + broken, regenerate=regenerate)
+
+    assert calls == [(2, 'Tokyo, Japan', ['missing_option'], ['Lisbon, Portugal'])]
+    assert result['validation']['status'] == 'repaired'
+    assert result['validation']['regenerated'] == [2]
+    assert [d['name'] for d in result['plan']['destinations']] == ['Lisbon, Portugal', 'Paris, France']
+
+
+def test_keeps_the_original_when_regeneration_fails(validator):
+    def regenerate(position, name, problems, others):
+        raise RuntimeError("provider unavailable")
+
+    result = validator.review(_section(1), regenerate=regenerate)
+
+    assert result['validation']['status'] == 'invalid'
+    assert [issue['code'] for issue in result['validation']['issues']] == ['missing_destination']
+    assert validator.stats()['regenerations_failed'] == 1
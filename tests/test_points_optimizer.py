@@ -0,0 +1,95 @@
+import pytest
+
+from services import points_optimizer as optimizer_module
+from services.points_optimizer import OptimizationError, PointsOptimizer
+
+FLIGHTS = [{'program': 'United MileagePlus', 'points': 60000}, {'program': 'Flying Blue', 'points': 50000}]
+HOTELS = [{'program': 'World of Hyatt', 'points': 25000, 'property': 'Hyatt Regency'},
+          {'program': 'Marriott Bonvoy', 'points': 20000, 'property': 'Courtyard'}]
+
+
+@pytest.fixture
+def optimizer():
+    return PointsOptimizer()
+
+
+def _received(allocation):
+    received = {}
+    for step in allocation['steps']:
+        received[step['target']] = received.get(step['target'], 0) + step['received']
+    return received
+
+
+def test_spends_a_programs_own_points_before_transferring(optimizer):
+    allocation = optimizer.fund({'Chase Ultimate Rewards': 100000, 'World of Hyatt': 5000},
+                                [('World of Hyatt', 30000)])
+
+    assert [(step['source'], step['points']) for step in allocation['steps']] == [
+        ('World of Hyatt', 5000), ('Chase Ultimate Rewards', 25000)]
+    assert allocation['points_spent'] == 30000
+    assert allocation['remaining_balances'] == {'Chase Ultimate Rewards': 75000, 'World of Hyatt': 0}
+
+
+def test_returns_none_when_balances_fall_short(optimizer):
+    assert optimizer.fund({'Chase Ultimate Rewards': 10000}, [('World of Hyatt', 30000)]) is None
+
+
+def test_falls_back_to_greedy_funding_past_the_node_limit(optimizer, monkeypatch):
+    monkeypatch.setattr(optimizer_module, 'MAX_BRANCH_NODES', 0)
+    needs = [('Flying Blue', 50000), ('World of Hyatt', 30000)]
+
+    allocation = optimizer.fund({'Chase Ultimate Rewards': 100000, 'Amex Membership Rewards': 100000}, needs)
+
+    assert allocation is not None
+    assert _received(allocation) == {'Air France/KLM Flying Blue': 50000, 'World of Hyatt': 30000}
+
+
+def test_optimize_picks_the_cheapest_bundle(optimizer):
+    result = optimizer.optimize({'Chase Ultimate Rewards': 200000}, [FLIGHTS, HOTELS])
+
+    assert result['feasible'] is True
+    assert result['bundles_evaluated'] == 4
+    assert result['bundle'] == [FLIGHTS[1], HOTELS[1]]
+    assert result['score'] == result['points_spent'] == 70000
+
+
+def test_value_score_is_in_dollars_like_value_used(optimizer):
+    result = optimizer.optimize({'Chase Ultimate Rewards': 200000}, [FLIGHTS, HOTELS], objective='value')
+
+    assert result['score'] == result['value_used']
+    assert result['value_used'] < result['points_spent']
+
+
+def test_reports_an_infeasible_portfolio(optimizer):
+    result = optimizer.optimize({'Chase Ultimate Rewards': 1000}, [FLIGHTS, HOTELS])
+
+    assert result == {'feasible': False, 'objective': 'points', 'bundles_evaluated': 4}
+
+
+@pytest.mark.parametrize('points', [float('nan'), float('inf'), -1000, True, '60000', None])
+def test_rejects_invalid_candidate_points(optimizer, points):
+    with pytest.raises(OptimizationError, match='non-negative points cost'):
+        optimizer.optimize({'Chase Ultimate Rewards': 100000}, [[{'program': 'World of Hyatt', 'points': points}]])
+
+
+@pytest.mark.parametrize('balance', [float('nan'), float('inf'), -5, '50,000'])
+def test_rejects_invalid_balances(optimizer, balance):
+    with pytest.raises(OptimizationError, match='Invalid points balance'):
+        optimizer.optimize({'Chase Ultimate Rewards': balance}, [HOTELS])
+
+
+def test_accepts_whole_number_balance_strings(optimizer):
+    result = optimizer.optimize({'Chase Ultimate Rewards': '50000'}, [HOTELS])
+
+    assert result['feasible'] is True
+
+
+@pytest.mark.parametrize('kwargs, message', [
+    ({'candidate_groups': [[{'program': 'Nowhere Miles', 'points': 1000}]]}, 'Unknown points program'),
+    ({'candidate_groups': [HOTELS], 'objective': 'miles'}, 'Objective must be one of'),
+    ({'candidate_groups': [[]]}, 'At least one award candidate'),
+    ({'candidate_groups': [{'program': 'World of Hyatt'}]}, 'must be sent as lists'),
+])
+def test_rejects_malformed_requests(optimizer, kwargs, message):
+    with pytest.raises(OptimizationError, match=message):
+        optimizer.optimize({'Chase Ultimate Rewards': 100000}, **kwargs)
@@ -0,0 +1,116 @@
+import io
+import json
+import time
+
+import pytest
+from flask import Flask
+
+from models import db
+from models.review import Review
+from services.review_import import ReviewImportError, import_reviews_file, iter_json_array
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+def _review(slug, **fields):
+    return {'title': slug.title(), 'slug': slug, 'location': 'Mexico', 'summary': 'Summary',
+            'content': f'# {slug}\n\nContent', **fields}
+
+
+def _import(tmp_path, reviews, **kwargs):
+    path = tmp_path / 'reviews.json'
+    path.write_text(json.dumps(reviews), encoding='utf-8')
+    return import_reviews_file(str(path), progress=None, **kwargs)
+
+
+def _updated_at(slug):
+    db.session.expire_all()
+    return Review.get_by_slug(slug).updated_at
+
+
+def test_streams_array_items_across_reads():
+    reviews = [_review(f'review-{i}', summary='x' * 50) for i in range(5)]
+
+    assert list(iter_json_array(io.StringIO(json.dumps(reviews, indent=2)), read_size=7)) == reviews
+
+
+@pytest.mark.parametrize('text, message', [
+    ('{"title": "x"}', 'Expected a JSON array'),
+    ('[{"title": "x"}', 'not closed'),
+    ('[{"title": "x"} {"title": "y"}]', "Expected ','"),
+    ('[1]', 'must be a review object'),
+    ('[{"title": }]', 'Invalid JSON'),
+])
+def test_rejects_malformed_exports(text, message):
+    with pytest.raises(ReviewImportError, match=message):
+        list(iter_json_array(io.StringIO(text)))
+
+
+def test_adds_reviews_in_batches_and_renders_them(app, tmp_path):
+    counts = _import(tmp_path, [_review(f'review-{i}') for i in range(5)], batch_size=2)
+
+    assert {key: counts[key] for key in ('read', 'added', 'updated', 'rendered')} == {
+        'read': 5, 'added': 5, 'updated': 0, 'rendered': 5}
+    assert '<h1>review-3</h1>' in Review.get_by_slug('review-3').rendered_html
+
+
+def test_unchanged_reimport_keeps_updated_at(app, tmp_path):
+    reviews = [_review('cancun'), _review('tulum')]
+    _import(tmp_path, reviews)
+    before = _updated_at('cancun')
+    time.sleep(0.01)
+
+    counts = _import(tmp_path, reviews)
+
+    assert (counts['added'], counts['updated'], counts['rendered']) == (0, 2, 0)
+    assert _updated_at('cancun') == before
+
+
+def test_changed_review_gets_a_new_updated_at_and_html(app, tmp_path):
+    _import(tmp_path, [_review('cancun'), _review('tulum')])
+    before = _updated_at('tulum')
+    time.sleep(0.01)
+
+    counts = _import(tmp_path, [_review('cancun'), _review('tulum', content='# Tulum\n\nUpdated')])
+
+    assert counts['rendered'] == 1
+    assert _updated_at('tulum') > before
+    assert _updated_at('cancun') < _updated_at('tulum')
+    assert 'Updated' in Review.get_by_slug('tulum').rendered_html
+
+
+def test_summary_change_updates_updated_at_without_rendering(app, tmp_path):
+    _import(tmp_path, [_review('cancun')])
+    before = _updated_at('cancun')
+    time.sleep(0.01)
+
+    counts = _import(tmp_path, [_review('cancun', summary='A new summary')])
+
+    assert counts['rendered'] == 0
+    assert _updated_at('cancun') > before
+
+
+def test_skips_existing_reviews_without_update(app, tmp_path):
+    _import(tmp_path, [_review('cancun')])
+
+    counts = _import(tmp_path, [_review('cancun', summary='Ignored'), _review('tulum')], update=False)
+
+    assert (counts['added'], counts['skipped']) == (1, 1)
+    assert Review.get_by_slug('cancun').summary == 'Summary'
+
+
+def test_invalid_review_leaves_the_table_unchanged(app, tmp_path):
+    reviews = [_review('cancun'), _review('tulum', summary='')]
+
+    with pytest.raises(ReviewImportError, match="missing summary"):
+        _import(tmp_path, reviews, batch_size=1)
+    assert Review.query.count() == 0
@@ -0,0 +1,88 @@
+from datetime import datetime
+
+import pytest
+from flask import Flask
+from sqlalchemy import event, text
+
+from models import db
+from models.review import Review, SQLITE_KEYSET_INDEX
+from services.review_listing import list_reviews
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+def _add_review(slug, created_at=None, published=True):
+    review = Review(title=slug, location='Mexico', summary='Summary', content='Content')
+    review.slug = slug
+    review.is_published = published
+    if created_at is not None:
+        review.created_at = created_at
+    db.session.add(review)
+
+
+def _all_pages(limit):
+    slugs, cursor = [], None
+    for _ in range(100):
+        page = list_reviews(['slug'], lambda slug: slug, limit=limit, cursor=cursor)
+        slugs.extend(review['slug'] for review in page['reviews'])
+        cursor = page['next_cursor']
+        if not cursor:
+            return slugs
+    pytest.fail("Pagination did not finish")
+
+
+def test_pages_reviews_sharing_a_timestamp(app):
+    # func.now() stores whole seconds, so reviews saved together tie on created_at
+    for i in range(45):
+        _add_review(f'review-{i}', published=i % 5 != 0)
+    db.session.commit()
+
+    slugs = _all_pages(limit=7)
+
+    assert len(slugs) == 36
+    assert len(set(slugs)) == 36
+    assert slugs == [f'review-{i}' for i in reversed(range(45)) if i % 5 != 0]
+
+
+def test_pages_mixed_timestamp_formats_newest_first(app):
+    _add_review('python-set', created_at=datetime(2025, 1, 2, 9, 30, 0, 250000))
+    _add_review('same-second', created_at=datetime(2025, 1, 2, 9, 30, 0))
+    _add_review('older', created_at=datetime(2024, 6, 1))
+    db.session.commit()
+    # A row written by SQL with the default, second-precision format
+    db.session.execute(text(
+        "UPDATE reviews SET created_at = '2025-01-02 09:30:00' WHERE slug = 'same-second'"
+    ))
+    db.session.commit()
+
+    assert _all_pages(limit=1) == ['python-set', 'same-second', 'older']
+
+
+def test_keyset_page_uses_the_created_key_index(app):
+    _add_review('only')
+    db.session.commit()
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        Review.published_page(limit=10, after=('2025-01-02 09:30:00.000000', 5))
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+
+    statement, parameters = statements[-1]
+    plan = ' '.join(row[-1] for row in db.session.connection().exec_driver_sql(
+        f'EXPLAIN QUERY PLAN {statement}', parameters))
+    assert SQLITE_KEYSET_INDEX in plan
+    assert 'TEMP B-TREE' not in plan
@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+
+from services.single_flight import SingleFlight
+
+
+def _run_concurrently(flight, key, fn, callers):
+    """Start ``callers`` threads on ``key`` once the first is inside ``fn``; returns their outcomes."""
+    outcomes = []
+
+    def call():
+        try:
+            outcomes.append(flight.do(key, fn))
+        except Exception as e:
+            outcomes.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    threads[0].start()
+    return threads, outcomes
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    runs = []
+
+    def generate():
+        runs.append(1)
+        started.set()
+        release.wait(5)
+        return {'content': 'plan'}
+
+    threads, outcomes = _run_concurrently(flight, 'key', generate, callers=4)
+    assert started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    while flight.shared < 3:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert runs == [1]
+    assert sorted(shared for _, shared in outcomes) == [False, True, True, True]
+    assert all(result == {'content': 'plan'} for result, _ in outcomes)
+    assert flight.stats() == {'executions': 1, 'shared': 3, 'in_flight': 0}
+
+
+def test_waiters_receive_the_leaders_error():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fail():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("model unavailable")
+
+    threads, outcomes = _run_concurrently(flight, 'key', fail, callers=2)
+    assert started.wait(5)
+    threads[1].start()
+    while flight.shared < 1:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert [str(outcome) for outcome in outcomes] == ["model unavailable"] * 2
+
+
+def test_later_calls_run_again():
+    flight = SingleFlight()
+
+    assert flight.do('key', lambda: 1) == (1, False)
+    assert flight.do('key', lambda: 2) == (2, False)
+    assert flight.do('other', lambda: 3) == (3, False)
+    assert flight.stats()['executions'] == 3
+
+
+def test_failure_does_not_block_the_next_call():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        flight.do('key', fail)
+    assert flight.do('key', lambda: 'ok') == ('ok', False)